@@ -0,0 +1,19 @@
+from phi.agent import Agent, RunResponse
+from phi.model.openai import OpenAIChat
+from phi.tools.yfinance import YFinanceTools
+from phi.utils.tracing import JsonTraceExporter
+
+agent = Agent(
+    model=OpenAIChat(id="gpt-4o"),
+    tools=[YFinanceTools(stock_price=True)],
+    # Record a span for each stage of the run and print them as JSON lines
+    tracing=True,
+    trace_exporter=JsonTraceExporter(),
+)
+
+response: RunResponse = agent.run("What is the stock price of NVDA")
+
+# Print the latency breakdown of the run
+print("---" * 5, "Spans", "---" * 5)
+for span in response.spans or []:
+    print(f"{span.name:<24} {span.duration * 1000 if span.duration else 0:>10.2f} ms")
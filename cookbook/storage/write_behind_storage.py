@@ -0,0 +1,20 @@
+"""Run `pip install duckduckgo-search sqlalchemy openai` to install dependencies."""
+
+from phi.agent import Agent
+from phi.tools.duckduckgo import DuckDuckGo
+from phi.storage.agent.postgres import PgAgentStorage
+from phi.storage.agent.write_behind import WriteBehindAgentStorage
+
+db_url = "postgresql+psycopg://ai:ai@localhost:5532/ai"
+
+# Sessions are read from memory and written to Postgres in the background, once per second
+storage = WriteBehindAgentStorage(PgAgentStorage(table_name="agent_sessions", db_url=db_url), flush_interval=1.0)
+
+agent = Agent(
+    storage=storage,
+    tools=[DuckDuckGo()],
+    add_history_to_messages=True,
+)
+agent.print_response("How many people live in Canada?")
+agent.print_response("What is their national anthem called?")
+print(storage.info())
@@ -0,0 +1,21 @@
+from phi.agent import Agent
+from phi.knowledge.pdf import PDFUrlKnowledgeBase
+from phi.vectordb.cached import CachedVectorDb
+from phi.vectordb.pgvector import PgVector
+
+db_url = "postgresql+psycopg://ai:ai@localhost:5532/ai"
+
+# Repeated questions are answered from the cache, without embedding the query or searching the table again.
+# Loading documents through the knowledge base invalidates the cached results.
+vector_db = CachedVectorDb(PgVector(table_name="recipes", db_url=db_url), ttl=300)
+
+knowledge_base = PDFUrlKnowledgeBase(
+    urls=["https://phi-public.s3.amazonaws.com/recipes/ThaiRecipes.pdf"],
+    vector_db=vector_db,
+)
+knowledge_base.load(recreate=False)  # Comment out after first run
+
+agent = Agent(knowledge_base=knowledge_base, use_tools=True, show_tool_calls=True)
+agent.print_response("How to make Thai curry?", markdown=True)
+agent.print_response("How to make Thai curry?", markdown=True)
+print(vector_db.cache_info())
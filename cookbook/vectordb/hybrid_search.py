@@ -0,0 +1,22 @@
+from phi.agent import Agent
+from phi.knowledge.pdf import PDFUrlKnowledgeBase
+from phi.vectordb.hybrid import HybridVectorDb, KeywordIndex
+from phi.vectordb.numpydb import NumpyDb
+
+# NumpyDb has no full-text search, so documents are also added to a local BM25 index.
+# Each search runs a vector and a keyword search concurrently and fuses their results with reciprocal rank fusion.
+# Vector dbs with full-text search, such as PgVector, are searched using it instead.
+vector_db = HybridVectorDb(
+    NumpyDb(collection="recipes", path="tmp/numpydb"),
+    keyword_index=KeywordIndex(db_file="tmp/numpydb/recipes_keywords.db"),
+    vector_weight=0.5,
+)
+
+knowledge_base = PDFUrlKnowledgeBase(
+    urls=["https://phi-public.s3.amazonaws.com/recipes/ThaiRecipes.pdf"],
+    vector_db=vector_db,
+)
+knowledge_base.load(recreate=False)  # Comment out after first run
+
+agent = Agent(knowledge_base=knowledge_base, use_tools=True, show_tool_calls=True)
+agent.print_response("How to make Tom Kha Gai?", markdown=True)
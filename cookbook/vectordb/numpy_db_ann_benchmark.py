@@ -0,0 +1,90 @@
+"""Recall and latency of the NumpyDb IVF-PQ index compared to exact search, on synthetic clustered embeddings.
+
+Run: python cookbook/vectordb/numpy_db_ann_benchmark.py
+"""
+
+import shutil
+from time import perf_counter
+from typing import List
+
+import numpy as np
+
+from phi.document import Document
+from phi.embedder.base import Embedder
+from phi.vectordb.numpydb import NumpyDb
+from phi.vectordb.numpydb.index import IvfPq
+
+NUM_VECTORS = 200_000
+DIMENSIONS = 128
+NUM_QUERIES = 200
+LIMIT = 10
+PATH = "tmp/numpydb_benchmark"
+
+
+class RandomEmbedder(Embedder):
+    """Embeddings are provided with the documents, so the embedder is only used to set the dimensions"""
+
+    dimensions: int = DIMENSIONS
+
+    def get_embedding(self, text: str) -> List[float]:
+        return np.random.standard_normal(DIMENSIONS).tolist()
+
+
+# Like real embeddings, the synthetic vectors are clustered and mostly vary along a few directions
+rng = np.random.default_rng(42)
+centers = rng.standard_normal((1000, DIMENSIONS)).astype(np.float32)
+projection = rng.standard_normal((16, DIMENSIONS)).astype(np.float32) / 4
+
+
+def clustered_vectors(num_vectors: int) -> np.ndarray:
+    labels = rng.integers(0, len(centers), size=num_vectors)
+    latent = rng.standard_normal((num_vectors, 16)).astype(np.float32)
+    noise = 0.05 * rng.standard_normal((num_vectors, DIMENSIONS)).astype(np.float32)
+    return centers[labels] + latent @ projection + noise
+
+
+vectors = clustered_vectors(NUM_VECTORS)
+queries = clustered_vectors(NUM_QUERIES)
+
+shutil.rmtree(PATH, ignore_errors=True)
+db = NumpyDb(
+    collection="benchmark",
+    path=PATH,
+    embedder=RandomEmbedder(),
+    index=IvfPq(pq_segments=16, min_rows=NUM_VECTORS),
+    max_segments=1000,
+)
+db.create()
+start = perf_counter()
+for i in range(0, NUM_VECTORS, 10_000):
+    db.insert(
+        [
+            Document(content=f"document {j}", id=str(j), embedding=vectors[j].tolist())
+            for j in range(i, min(i + 10_000, NUM_VECTORS))
+        ]
+    )
+print(f"Inserted {db.get_count()} vectors and trained the index in {perf_counter() - start:.1f}s")
+
+
+def run(probes: int, exact: bool = False):
+    results, latencies = [], []
+    for query in queries:
+        start = perf_counter()
+        documents = db.search_by_embedding(query.tolist(), limit=LIMIT, probes=probes, exact=exact)
+        latencies.append(perf_counter() - start)
+        results.append([document.id for document in documents])
+    return results, np.array(latencies) * 1000
+
+
+exact_results, exact_latencies = run(probes=0, exact=True)
+print(f"{'search':>12} {'recall@10':>10} {'p50 ms':>8} {'p99 ms':>8}")
+print(
+    f"{'exact':>12} {1.0:>10.3f} {np.percentile(exact_latencies, 50):>8.2f} {np.percentile(exact_latencies, 99):>8.2f}"
+)
+for probes in (1, 4, 16, 64):
+    results, latencies = run(probes=probes)
+    recall = np.mean([len(set(r) & set(e)) / LIMIT for r, e in zip(results, exact_results)])
+    print(
+        f"{f'probes={probes}':>12} {recall:>10.3f} "
+        f"{np.percentile(latencies, 50):>8.2f} {np.percentile(latencies, 99):>8.2f}"
+    )
@@ -0,0 +1,25 @@
+from phi.agent import Agent
+from phi.knowledge.pdf import PDFUrlKnowledgeBase
+from phi.vectordb.pgvector import PgVector, HNSW
+
+db_url = "postgresql+psycopg://ai:ai@localhost:5532/ai"
+
+vector_db = PgVector(table_name="recipes", db_url=db_url, vector_index=HNSW())
+knowledge_base = PDFUrlKnowledgeBase(
+    urls=["https://phi-public.s3.amazonaws.com/recipes/ThaiRecipes.pdf"],
+    vector_db=vector_db,
+)
+knowledge_base.load(recreate=False)  # Comment out after first run
+vector_db.optimize()
+
+# Pick the smallest hnsw.ef_search that returns 95% of the exact top 5 results for these queries.
+# Searches of this vector db then use it, and a search can still override it: vector_db.search(query, ef_search=200)
+tuning = vector_db.tune_search_params(
+    queries=["Thai green curry", "Tom Yum soup", "Pad Thai noodles", "Mango sticky rice"],
+    limit=5,
+    recall_target=0.95,
+)
+print(tuning["results"])
+
+agent = Agent(knowledge_base=knowledge_base, use_tools=True, show_tool_calls=True)
+agent.print_response("How to make Thai curry?", markdown=True)
@@ -0,0 +1,355 @@
+"""Offline benchmarks for the agent runtime.
+
+The benchmarks use MockModel and MockEmbedder, SQLite agent storage and NumpyDb, so they need no API keys
+or network access and measure the overhead of phidata itself.
+
+Usage:
+    python -m evals.performance.benchmarks
+    python -m evals.performance.benchmarks --quick --baseline evals/performance/results/previous.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from phi.agent import Agent
+from phi.document import Document
+from phi.knowledge.document import DocumentKnowledgeBase
+from phi.model.message import Message
+from phi.storage.agent.sqlite import SqlAgentStorage
+from phi.utils.log import logger
+from phi.vectordb.numpydb import NumpyDb
+
+from evals.performance.mock import MockEmbedder, MockModel
+
+RESULTS_DIR = Path(__file__).parent.joinpath("results")
+
+
+@dataclass
+class BenchmarkResult:
+    """Timings of one benchmark, in seconds, with the parameters it ran with"""
+
+    name: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    timings: List[float] = field(default_factory=list)
+    # Other measurements, e.g. throughput or memory
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        _dict: Dict[str, Any] = {"name": self.name, "params": self.params, "iterations": len(self.timings)}
+        if len(self.timings) > 0:
+            timings_ms = sorted(t * 1000 for t in self.timings)
+            _dict.update(
+                mean_ms=statistics.mean(timings_ms),
+                p50_ms=timings_ms[len(timings_ms) // 2],
+                p95_ms=timings_ms[min(int(len(timings_ms) * 0.95), len(timings_ms) - 1)],
+                min_ms=timings_ms[0],
+                max_ms=timings_ms[-1],
+            )
+        _dict.update(self.extra)
+        return _dict
+
+
+def timed(function: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def get_agent(db_file: Optional[Path] = None, **kwargs: Any) -> Agent:
+    """Returns an Agent that runs offline, with SQLite storage if db_file is given"""
+    kwargs.setdefault("model", MockModel())
+    return Agent(
+        storage=SqlAgentStorage(table_name="agent_sessions", db_file=str(db_file)) if db_file is not None else None,
+        add_history_to_messages=True,
+        telemetry=False,
+        monitoring=False,
+        **kwargs,
+    )
+
+
+def bench_agent_run(work_dir: Path, session_lengths: List[int], use_async: bool = False) -> List[BenchmarkResult]:
+    """Latency of a turn as the session grows. Each result has the turns up to its session length."""
+    agent = get_agent(db_file=work_dir.joinpath(f"run_{'async' if use_async else 'sync'}.db"))
+    name = "agent.arun" if use_async else "agent.run"
+    results: List[BenchmarkResult] = []
+    turn = 0
+    for session_length in session_lengths:
+        result = BenchmarkResult(name=name, params={"session_length": session_length, "storage": "sqlite"})
+        while turn < session_length:
+            turn += 1
+            if use_async:
+                result.timings.append(timed(lambda: asyncio.run(agent.arun(f"Message {turn}"))))
+            else:
+                result.timings.append(timed(lambda: agent.run(f"Message {turn}")))
+        results.append(result)
+    return results
+
+
+def bench_streaming(num_chunks: int, iterations: int) -> List[BenchmarkResult]:
+    """Overhead the agent adds to each streamed chunk, from the difference between a short and a long stream"""
+    min_chunks = 10
+    timings: Dict[int, List[float]] = {}
+    for chunks in (min_chunks, num_chunks):
+        agent = get_agent(model=MockModel(num_chunks=chunks, content="x" * chunks))
+        timings[chunks] = [timed(lambda: list(agent.run("Stream", stream=True))) for _ in range(iterations)]
+
+    # The same stream from the model alone
+    model = MockModel(num_chunks=num_chunks, content="x" * num_chunks)
+    model_timings = [
+        timed(lambda: list(model.response_stream(messages=[Message(role="user", content="Stream")])))
+        for _ in range(iterations)
+    ]
+
+    per_chunk = (statistics.median(timings[num_chunks]) - statistics.median(timings[min_chunks])) / (
+        num_chunks - min_chunks
+    )
+    return [
+        BenchmarkResult(
+            name="agent.run.stream",
+            params={"num_chunks": num_chunks},
+            timings=timings[num_chunks],
+            extra={
+                "per_chunk_us": per_chunk * 1e6,
+                "model_per_chunk_us": statistics.median(model_timings) / num_chunks * 1e6,
+            },
+        )
+    ]
+
+
+def noop_tool(value: int) -> str:
+    """Returns the value as a string.
+
+    Args:
+        value (int): The value to return.
+    """
+    return str(value)
+
+
+def bench_tool_calls(num_tool_calls: int, iterations: int) -> List[BenchmarkResult]:
+    """Cost of dispatching tool calls, from the difference between runs with and without tool calls"""
+    baseline_agent = get_agent(tools=[noop_tool])
+    baseline = [timed(lambda: baseline_agent.run("No tools")) for _ in range(iterations)]
+
+    results: List[BenchmarkResult] = []
+    for concurrent in (False, True):
+        model = MockModel(
+            tool_calls=[{"name": "noop_tool", "arguments": {"value": i}} for i in range(num_tool_calls)],
+            concurrent_tool_calls=concurrent,
+        )
+        agent = get_agent(model=model, tools=[noop_tool])
+        timings = [timed(lambda: agent.run("Call the tools")) for _ in range(iterations)]
+        per_call = (statistics.median(timings) - statistics.median(baseline)) / num_tool_calls
+        results.append(
+            BenchmarkResult(
+                name="agent.run.tool_calls",
+                params={"num_tool_calls": num_tool_calls, "concurrent": concurrent},
+                timings=timings,
+                extra={"per_call_us": per_call * 1e6},
+            )
+        )
+    return results
+
+
+def get_documents(num_documents: int) -> List[Document]:
+    return [
+        Document(
+            name=f"doc_{i}",
+            content=f"Document {i} about topic {i % 50}. " + " ".join(f"word{(i * j) % 997}" for j in range(60)),
+        )
+        for i in range(num_documents)
+    ]
+
+
+def bench_knowledge(work_dir: Path, num_documents: int, num_queries: int) -> List[BenchmarkResult]:
+    """Throughput of AgentKnowledge.load and the latency of searches against the loaded documents"""
+    results: List[BenchmarkResult] = []
+    knowledge_base: Optional[DocumentKnowledgeBase] = None
+    for pipelined in (False, True):
+        embedder = MockEmbedder()
+        knowledge_base = DocumentKnowledgeBase(
+            documents=get_documents(num_documents),
+            vector_db=NumpyDb(
+                collection="benchmark", path=str(work_dir.joinpath(f"numpydb_{pipelined}")), embedder=embedder
+            ),
+            pipelined_load=pipelined,
+        )
+        load_time = timed(lambda: knowledge_base.load(recreate=True))  # type: ignore
+        results.append(
+            BenchmarkResult(
+                name="knowledge.load",
+                params={"num_documents": num_documents, "vector_db": "numpydb", "pipelined": pipelined},
+                timings=[load_time],
+                extra={"documents_per_second": num_documents / load_time, "embed_requests": embedder.num_requests},
+            )
+        )
+
+    search_result = BenchmarkResult(
+        name="knowledge.search", params={"num_documents": num_documents, "vector_db": "numpydb", "limit": 5}
+    )
+    for i in range(num_queries):
+        search_result.timings.append(timed(lambda: knowledge_base.search(query=f"topic {i % 50} word{i}")))  # type: ignore
+    results.append(search_result)
+    return results
+
+
+def bench_retrieval(
+    work_dir: Path, num_documents: int, num_queries: int, dimensions: int = 1536
+) -> List[BenchmarkResult]:
+    """Latency of retrieving references for an Agent, with full Documents and with the lean search results"""
+    knowledge_base = DocumentKnowledgeBase(
+        documents=get_documents(num_documents),
+        vector_db=NumpyDb(
+            collection="retrieval",
+            path=str(work_dir.joinpath("numpydb_retrieval")),
+            embedder=MockEmbedder(dimensions=dimensions),
+        ),
+        num_documents=10,
+    )
+    knowledge_base.load(recreate=True)
+    agent = get_agent(knowledge=knowledge_base)
+
+    def get_documents_as_dicts(query: str) -> List[Dict[str, Any]]:
+        # The retrieval path before search results: full Documents, converted to dicts
+        return [document.to_dict() for document in knowledge_base.search(query=query)]
+
+    results: List[BenchmarkResult] = []
+    for lean in (False, True):
+        result = BenchmarkResult(
+            name="agent.retrieval",
+            params={"num_documents": num_documents, "dimensions": dimensions, "limit": 10, "lean": lean},
+        )
+        for i in range(num_queries):
+            query = f"topic {i % 50} word{i}"
+            if lean:
+                result.timings.append(timed(lambda: agent.get_relevant_docs_from_knowledge(query=query)))
+            else:
+                result.timings.append(timed(lambda: get_documents_as_dicts(query)))
+        results.append(result)
+    return results
+
+
+def bench_memory_growth(work_dir: Path, num_turns: int, sample_every: int) -> List[BenchmarkResult]:
+    """Memory allocated by a long session, sampled with tracemalloc"""
+    agent = get_agent(db_file=work_dir.joinpath("memory.db"))
+    samples: List[Dict[str, int]] = []
+    tracemalloc.start()
+    try:
+        start_bytes, _ = tracemalloc.get_traced_memory()
+        for turn in range(1, num_turns + 1):
+            agent.run(f"Message {turn}")
+            if turn % sample_every == 0:
+                current_bytes, _ = tracemalloc.get_traced_memory()
+                samples.append({"turn": turn, "bytes": current_bytes - start_bytes})
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    bytes_per_turn = 0.0
+    if len(samples) > 1:
+        bytes_per_turn = (samples[-1]["bytes"] - samples[0]["bytes"]) / (samples[-1]["turn"] - samples[0]["turn"])
+    return [
+        BenchmarkResult(
+            name="agent.memory",
+            params={"num_turns": num_turns, "storage": "sqlite"},
+            extra={"bytes_per_turn": bytes_per_turn, "peak_bytes": peak_bytes - start_bytes, "samples": samples},
+        )
+    ]
+
+
+def run_benchmarks(quick: bool = False) -> Dict[str, Any]:
+    """Runs all benchmarks and returns the results as a dict that can be written as JSON"""
+    iterations = 5 if quick else 20
+    results: List[BenchmarkResult] = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        work_dir = Path(tmp_dir)
+        session_lengths = [1, 10, 25] if quick else [1, 10, 50, 100]
+        results.extend(bench_agent_run(work_dir, session_lengths))
+        results.extend(bench_agent_run(work_dir, session_lengths, use_async=True))
+        results.extend(bench_streaming(num_chunks=200 if quick else 1000, iterations=iterations))
+        results.extend(bench_tool_calls(num_tool_calls=5, iterations=iterations))
+        results.extend(
+            bench_knowledge(work_dir, num_documents=500 if quick else 5000, num_queries=20 if quick else 200)
+        )
+        results.extend(
+            bench_retrieval(work_dir, num_documents=500 if quick else 5000, num_queries=20 if quick else 200)
+        )
+        results.extend(bench_memory_growth(work_dir, num_turns=20 if quick else 100, sample_every=5 if quick else 10))
+
+    try:
+        from importlib.metadata import version
+
+        phidata_version = version("phidata")
+    except Exception:
+        phidata_version = "unknown"
+    return {
+        "phidata_version": phidata_version,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "created_at": int(time.time()),
+        "quick": quick,
+        "results": [result.to_dict() for result in results],
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.2) -> List[str]:
+    """Returns the benchmarks whose median latency is more than `threshold` higher than in the baseline"""
+
+    def get_key(result: Dict[str, Any]) -> str:
+        return f"{result['name']} {json.dumps(result['params'], sort_keys=True)}"
+
+    baseline_results = {get_key(result): result for result in baseline.get("results", [])}
+    regressions: List[str] = []
+    for result in report.get("results", []):
+        previous = baseline_results.get(get_key(result))
+        if previous is None or "p50_ms" not in result or "p50_ms" not in previous or previous["p50_ms"] <= 0:
+            continue
+        change = result["p50_ms"] / previous["p50_ms"] - 1
+        if change > threshold:
+            regressions.append(
+                f"{get_key(result)}: p50 {previous['p50_ms']:.3f} ms -> {result['p50_ms']:.3f} ms (+{change:.0%})"
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the offline agent runtime benchmarks")
+    parser.add_argument("--quick", action="store_true", help="Run fewer iterations with smaller inputs")
+    parser.add_argument("--output", type=Path, help="JSON file to write the results to")
+    parser.add_argument("--baseline", type=Path, help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Relative p50 increase reported as a regression")
+    args = parser.parse_args()
+    # Keep the output to the results, Agents reset the log level of the logger
+    for handler in logger.handlers:
+        handler.setLevel(logging.WARNING)
+
+    report = run_benchmarks(quick=args.quick)
+    output: Path = args.output or RESULTS_DIR.joinpath(f"benchmarks-{report['created_at']}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+
+    for result in report["results"]:
+        timing = f"p50 {result['p50_ms']:9.3f} ms  p95 {result['p95_ms']:9.3f} ms" if "p50_ms" in result else ""
+        print(f"{result['name']:<24} {json.dumps(result['params'], sort_keys=True):<60} {timing}")
+    print(f"Results written to {output}")
+
+    if args.baseline is not None:
+        regressions = compare(report, json.loads(args.baseline.read_text()), threshold=args.threshold)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if len(regressions) > 0:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
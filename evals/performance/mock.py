@@ -0,0 +1,191 @@
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from phi.embedder.base import Embedder
+from phi.model.base import Model
+from phi.model.message import Message
+from phi.model.response import ModelResponse
+from phi.tools.function import FunctionCall
+from phi.utils.tools import get_function_call_for_tool_call
+
+
+class MockModel(Model):
+    """Deterministic Model that runs offline, for benchmarking the agent runtime.
+
+    The model waits `latency` seconds before responding and `chunk_interval` seconds between streamed chunks.
+    If `tool_calls` are set, the first response to a user message calls these tools, and the model responds
+    with `content` once the tool results are added.
+    """
+
+    id: str = "mock"
+    name: str = "MockModel"
+    provider: str = "Mock"
+
+    # Content of each response
+    content: str = "This is a deterministic response from the mock model."
+    # Number of chunks the content is streamed in
+    num_chunks: int = 10
+    # Seconds before the first chunk of a response
+    latency: float = 0.0
+    # Seconds between streamed chunks
+    chunk_interval: float = 0.0
+    # Tools to call in response to a user message, as {"name": ..., "arguments": {...}}
+    tool_calls: List[Dict[str, Any]] = []
+
+    def _get_chunks(self) -> List[str]:
+        num_chunks = max(self.num_chunks, 1)
+        chunk_size = max(len(self.content) // num_chunks, 1)
+        chunks = [self.content[i : i + chunk_size] for i in range(0, chunk_size * (num_chunks - 1), chunk_size)]
+        chunks.append(self.content[chunk_size * (num_chunks - 1) :])
+        return chunks
+
+    def _get_assistant_message(self, messages: List[Message]) -> Message:
+        if len(self.tool_calls) > 0 and self.functions and len(messages) > 0 and messages[-1].role != "tool":
+            return Message(
+                role="assistant",
+                tool_calls=[
+                    {
+                        "id": f"call_{i}",
+                        "type": "function",
+                        "function": {
+                            "name": tool_call["name"],
+                            "arguments": json.dumps(tool_call.get("arguments", {})),
+                        },
+                    }
+                    for i, tool_call in enumerate(self.tool_calls)
+                ],
+            )
+        return Message(role="assistant", content=self.content)
+
+    def _get_function_calls(self, assistant_message: Message) -> List[FunctionCall]:
+        function_calls: List[FunctionCall] = []
+        for tool_call in assistant_message.tool_calls or []:
+            function_call = get_function_call_for_tool_call(tool_call, self.functions)
+            if function_call is not None:
+                function_calls.append(function_call)
+        return function_calls
+
+    def _add_metrics(self, assistant_message: Message, elapsed: float) -> None:
+        assistant_message.metrics["time"] = elapsed
+        assistant_message.metrics["output_tokens"] = self.num_chunks
+        self.metrics["response_times"] = self.metrics.get("response_times", []) + [elapsed]
+
+    def response(self, messages: List[Message]) -> ModelResponse:
+        start = time.perf_counter()
+        if self.latency > 0:
+            time.sleep(self.latency)
+        assistant_message = self._get_assistant_message(messages)
+        self._add_metrics(assistant_message, time.perf_counter() - start)
+        messages.append(assistant_message)
+
+        if assistant_message.tool_calls is not None and self.run_tools:
+            function_call_results: List[Message] = []
+            for _ in self.run_function_calls(
+                function_calls=self._get_function_calls(assistant_message), function_call_results=function_call_results
+            ):
+                pass
+            messages.extend(function_call_results)
+            return self.response(messages=messages)
+        return ModelResponse(content=self.content)
+
+    async def aresponse(self, messages: List[Message]) -> ModelResponse:
+        start = time.perf_counter()
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        assistant_message = self._get_assistant_message(messages)
+        self._add_metrics(assistant_message, time.perf_counter() - start)
+        messages.append(assistant_message)
+
+        if assistant_message.tool_calls is not None and self.run_tools:
+            function_call_results: List[Message] = []
+            async for _ in self.arun_function_calls(
+                function_calls=self._get_function_calls(assistant_message), function_call_results=function_call_results
+            ):
+                pass
+            messages.extend(function_call_results)
+            return await self.aresponse(messages=messages)
+        return ModelResponse(content=self.content)
+
+    def response_stream(self, messages: List[Message]) -> Iterator[ModelResponse]:
+        start = time.perf_counter()
+        if self.latency > 0:
+            time.sleep(self.latency)
+        assistant_message = self._get_assistant_message(messages)
+        if assistant_message.content is not None:
+            for i, chunk in enumerate(self._get_chunks()):
+                if i > 0 and self.chunk_interval > 0:
+                    time.sleep(self.chunk_interval)
+                yield ModelResponse(content=chunk)
+        self._add_metrics(assistant_message, time.perf_counter() - start)
+        messages.append(assistant_message)
+
+        if assistant_message.tool_calls is not None and self.run_tools:
+            function_call_results: List[Message] = []
+            yield from self.run_function_calls(
+                function_calls=self._get_function_calls(assistant_message), function_call_results=function_call_results
+            )
+            messages.extend(function_call_results)
+            yield from self.response_stream(messages=messages)
+
+    async def aresponse_stream(self, messages: List[Message]) -> AsyncIterator[ModelResponse]:  # type: ignore
+        start = time.perf_counter()
+        if self.latency > 0:
+            await asyncio.sleep(self.latency)
+        assistant_message = self._get_assistant_message(messages)
+        if assistant_message.content is not None:
+            for i, chunk in enumerate(self._get_chunks()):
+                if i > 0 and self.chunk_interval > 0:
+                    await asyncio.sleep(self.chunk_interval)
+                yield ModelResponse(content=chunk)
+        self._add_metrics(assistant_message, time.perf_counter() - start)
+        messages.append(assistant_message)
+
+        if assistant_message.tool_calls is not None and self.run_tools:
+            function_call_results: List[Message] = []
+            async for model_response in self.arun_function_calls(
+                function_calls=self._get_function_calls(assistant_message), function_call_results=function_call_results
+            ):
+                yield model_response
+            messages.extend(function_call_results)
+            async for model_response in self.aresponse_stream(messages=messages):
+                yield model_response
+
+
+class MockEmbedder(Embedder):
+    """Deterministic Embedder that runs offline: each text is embedded as a random unit vector seeded by its hash.
+
+    The embedder waits `latency` seconds for each request, so batching can be measured.
+    """
+
+    dimensions: int = 256
+    # Seconds for each embedding request
+    latency: float = 0.0
+    # Number of embedding requests made
+    num_requests: int = 0
+
+    def _embed(self, text: str) -> List[float]:
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.dimensions).astype(np.float32)
+        return (vector / np.linalg.norm(vector)).tolist()
+
+    def _request(self) -> None:
+        self.num_requests += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+    def get_embedding(self, text: str) -> List[float]:
+        self._request()
+        return self._embed(text)
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        self._request()
+        return self._embed(text), {"total_tokens": len(text.split())}
+
+    def embed_batch(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        self._request()
+        return [self._embed(text) for text in texts], {"total_tokens": sum(len(text.split()) for text in texts)}
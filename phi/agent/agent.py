@@ -1,12 +1,14 @@
 from __future__ import annotations
 
 import json
+import asyncio
 from os import getenv
 from uuid import uuid4
 from pathlib import Path
 from textwrap import dedent
 from datetime import datetime
 from collections import defaultdict, deque
+from functools import partial
 from typing import (
     Any,
     AsyncIterator,
@@ -27,10 +29,12 @@ from typing import (
 from pydantic import BaseModel, ConfigDict, field_validator, Field, ValidationError
 
 from phi.document import Document
+from phi.agent.post_run import post_run_queue
 from phi.agent.session import AgentSession
 from phi.reasoning.step import ReasoningStep, ReasoningSteps, NextAction
 from phi.run.response import RunEvent, RunResponse, RunResponseExtraData
 from phi.knowledge.agent import AgentKnowledge
+from phi.vectordb.search import SearchResult
 from phi.model import Model
 from phi.model.message import Message, MessageContext
 from phi.model.response import ModelResponse, ModelResponseEvent
@@ -42,6 +46,7 @@ from phi.utils.log import logger, set_log_level_to_debug, set_log_level_to_info
 from phi.utils.message import get_text_from_message
 from phi.utils.merge_dict import merge_dictionaries
 from phi.utils.timer import Timer
+from phi.utils.tracing import NOOP_SPAN, Trace, TraceExporter
 
 
 class Agent(BaseModel):
@@ -214,6 +219,14 @@ class Agent(BaseModel):
     # telemetry=True logs minimal telemetry for analytics
     # This helps us improve the Agent and provide better support
     telemetry: bool = getenv("PHI_TELEMETRY", "true").lower() == "true"
+    # tracing=True records timed spans for the stages of each run in RunResponse.spans
+    tracing: bool = getenv("PHI_TRACING", "false").lower() == "true"
+    # Exports the spans of each run, e.g. JsonTraceExporter or OpenTelemetryTraceExporter. Enables tracing.
+    trace_exporter: Optional[TraceExporter] = None
+    # post_run_in_background=True updates the memories and the session summary and saves the session to storage
+    # in the background after each run, so the response is returned without waiting for them.
+    # The next run of the session waits for them before reading the session.
+    post_run_in_background: bool = False
 
     # DO NOT SET THE FOLLOWING FIELDS MANUALLY
     # -*- Agent run details
@@ -223,6 +236,8 @@ class Agent(BaseModel):
     run_input: Optional[Union[str, List, Dict]] = None
     # Response from the Agent run: do not set manually
     run_response: RunResponse = Field(default_factory=RunResponse)
+    # Spans of the current run: do not set manually
+    _run_trace: Optional[Trace] = None
 
     model_config = ConfigDict(arbitrary_types_allowed=True, populate_by_name=True)
 
@@ -320,6 +335,55 @@ class Agent(BaseModel):
         # For other types, return as is
         return field_value
 
+    def shallow_copy(self, *, update: Optional[Dict[str, Any]] = None) -> "Agent":
+        """Create and return a copy of this Agent for a new request, optionally updating fields.
+
+        Unlike deep_copy(), the copy shares the storage, knowledge, tools and model clients with this Agent,
+        and only copies the state that changes during a run: the memory, the model and the lists and dicts
+        the Agent updates. Use it to create an Agent per request from a long-lived Agent.
+
+        Args:
+            update (Optional[Dict[str, Any]]): Optional dictionary of fields for the new Agent.
+
+        Returns:
+            Agent: A new Agent instance.
+        """
+        # Extract the fields to set for the new Agent
+        fields_for_new_agent = {}
+
+        for field_name in self.model_fields_set:
+            field_value = getattr(self, field_name)
+            if field_value is not None:
+                fields_for_new_agent[field_name] = self._shallow_copy_field(field_name, field_value)
+
+        # Update fields if provided
+        if update:
+            fields_for_new_agent.update(update)
+
+        # Create a new Agent
+        new_agent = self.__class__(**fields_for_new_agent)
+        logger.debug(f"Created new Agent: agent_id: {new_agent.agent_id} | session_id: {new_agent.session_id}")
+        return new_agent
+
+    def _shallow_copy_field(self, field_name: str, field_value: Any) -> Any:
+        """Helper method to copy the per-run state in a field, sharing everything else."""
+        from copy import copy
+
+        # For memory and models, use their shallow_copy methods
+        if isinstance(field_value, (AgentMemory, Model)):
+            return field_value.shallow_copy()
+
+        # Team members run with the Agent, so they are copied the same way
+        if field_name == "team" and isinstance(field_value, list):
+            return [member.shallow_copy() if isinstance(member, Agent) else member for member in field_value]
+
+        # Lists, dicts and sets are updated in place during a run
+        if isinstance(field_value, (list, dict, set)):
+            return copy(field_value)
+
+        # For other types, e.g. storage, knowledge and tools, return as is
+        return field_value
+
     def has_team(self) -> bool:
         return self.team is not None and len(self.team) > 0
 
@@ -599,6 +663,7 @@ class Agent(BaseModel):
                         self.memory.messages = [Message(**m) for m in session.memory["messages"]]
                     except Exception as e:
                         logger.warning(f"Failed to load messages from memory: {e}")
+                self.memory.log_offsets = session.memory.get("log_offsets")
                 if "summary" in session.memory:
                     try:
                         self.memory.summary = SessionSummary(**session.memory["summary"])
@@ -636,6 +701,31 @@ class Agent(BaseModel):
             self._agent_session = self.storage.upsert(session=self.get_agent_session())
         return self._agent_session
 
+    async def aread_from_storage(self) -> Optional[AgentSession]:
+        """Load the AgentSession from storage without blocking the event loop
+
+        Returns:
+            Optional[AgentSession]: The loaded AgentSession or None if not found.
+        """
+        if self.storage is not None and self.session_id is not None:
+            self._agent_session = await self.storage.aread(session_id=self.session_id)
+            if self._agent_session is not None:
+                self.from_agent_session(session=self._agent_session)
+        if self.memory.create_user_memories:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.load_user_memories)
+        return self._agent_session
+
+    async def awrite_to_storage(self) -> Optional[AgentSession]:
+        """Save the AgentSession to storage without blocking the event loop
+
+        Returns:
+            Optional[AgentSession]: The saved AgentSession or None if not saved.
+        """
+        if self.storage is not None:
+            self._agent_session = await self.storage.aupsert(session=self.get_agent_session())
+        return self._agent_session
+
     def add_introduction(self, introduction: str) -> None:
         """Add an introduction to the chat history"""
 
@@ -952,7 +1042,32 @@ class Agent(BaseModel):
         if self.knowledge is None:
             return None
 
-        relevant_docs: List[Document] = self.knowledge.search(query=query, num_documents=num_documents, **kwargs)
+        # The embeddings of the documents are not added to the context, so they are not fetched
+        relevant_docs: List[SearchResult] = self.knowledge.search_results(
+            query=query, num_documents=num_documents, **kwargs
+        )
+        if len(relevant_docs) == 0:
+            return None
+        return [doc.to_dict() for doc in relevant_docs]
+
+    async def aget_relevant_docs_from_knowledge(
+        self, query: str, num_documents: Optional[int] = None, **kwargs
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Return a list of references from the knowledge base, without blocking the event loop"""
+
+        if self.retriever is not None:
+            reference_kwargs = {"agent": self, "query": query, "num_documents": num_documents, **kwargs}
+            if asyncio.iscoroutinefunction(self.retriever):
+                return await self.retriever(**reference_kwargs)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, partial(self.retriever, **reference_kwargs))
+
+        if self.knowledge is None:
+            return None
+
+        relevant_docs: List[SearchResult] = await self.knowledge.async_search_results(
+            query=query, num_documents=num_documents, **kwargs
+        )
         if len(relevant_docs) == 0:
             return None
         return [doc.to_dict() for doc in relevant_docs]
@@ -1021,6 +1136,48 @@ class Agent(BaseModel):
             retrieval_timer.stop()
             logger.debug(f"Time to get context: {retrieval_timer.elapsed:.4f}s")
 
+        return self.build_user_message(message=message, images=images, context=context, **kwargs)
+
+    async def aget_user_message(
+        self,
+        message: Optional[Union[str, List, Dict, Message]],
+        images: Optional[Sequence[Union[str, Dict]]] = None,
+        **kwargs: Any,
+    ) -> Optional[Message]:
+        """Async version of get_user_message, which searches the knowledge base without blocking the event loop."""
+
+        # 1. If the user_prompt is provided, use that.
+        if self.user_prompt is not None:
+            return Message(
+                role=self.user_message_role,
+                content=self.add_images_to_message_content(message_content=self.user_prompt, images=images),
+                images=images,
+                **kwargs,
+            )
+
+        # Get references from the knowledge base related to the user message
+        context = None
+        if self.add_context and message and isinstance(message, str) and self.knowledge:
+            retrieval_timer = Timer()
+            retrieval_timer.start()
+            docs_from_knowledge = await self.aget_relevant_docs_from_knowledge(query=message, **kwargs)
+            context = MessageContext(query=message, docs=docs_from_knowledge, time=round(retrieval_timer.elapsed, 4))
+            retrieval_timer.stop()
+            logger.debug(f"Time to get context: {retrieval_timer.elapsed:.4f}s")
+
+        return self.build_user_message(message=message, images=images, context=context, **kwargs)
+
+    def build_user_message(
+        self,
+        message: Optional[Union[str, List, Dict, Message]],
+        images: Optional[Sequence[Union[str, Dict]]] = None,
+        context: Optional[MessageContext] = None,
+        **kwargs: Any,
+    ) -> Optional[Message]:
+        """Build the user message from the message and the context retrieved from the knowledge base.
+        Steps 2 to 6 of get_user_message.
+        """
+
         # 2. If the user_prompt_template is provided, build the user_message using the template.
         if self.user_prompt_template is not None:
             user_prompt_kwargs = {"agent": self, "message": message, "context": context}
@@ -1144,22 +1301,23 @@ class Agent(BaseModel):
         user_messages: List[Message] = []
         # 3.4.1 Build user message from message if provided
         if message is not None:
+            user_message: Optional[Message] = None
             # If message is provided as a Message, use it directly
             if isinstance(message, Message):
-                user_messages.append(message)
+                user_message = message
             # If message is provided as a str, build the user message
             elif isinstance(message, str):
                 # Get the user message
-                user_message: Optional[Message] = self.get_user_message(message=message, images=images, **kwargs)
-                # Add user message to the messages list
-                if user_message is not None:
-                    if user_message.context is not None:
-                        if self.run_response.extra_data is None:
-                            self.run_response.extra_data = RunResponseExtraData()
-                        if self.run_response.extra_data.context is None:
-                            self.run_response.extra_data.context = []
-                        self.run_response.extra_data.context.append(user_message.context)
-                    user_messages.append(user_message)
+                user_message = self.get_user_message(message=message, images=images, **kwargs)
+            # Add user message to the messages list
+            if user_message is not None:
+                if user_message.context is not None:
+                    if self.run_response.extra_data is None:
+                        self.run_response.extra_data = RunResponseExtraData()
+                    if self.run_response.extra_data.context is None:
+                        self.run_response.extra_data.context = []
+                    self.run_response.extra_data.context.append(user_message.context)
+                user_messages.append(user_message)
         # 3.4.2 Build user messages from messages list if provided
         elif messages is not None and len(messages) > 0:
             for _m in messages:
@@ -1177,6 +1335,23 @@ class Agent(BaseModel):
 
         return system_message, user_messages, messages_for_model
 
+    async def aget_messages_for_run(
+        self,
+        *,
+        message: Optional[Union[str, List, Dict, Message]] = None,
+        images: Optional[Sequence[Union[str, Dict]]] = None,
+        messages: Optional[Sequence[Union[Dict, Message]]] = None,
+        **kwargs: Any,
+    ) -> Tuple[Optional[Message], List[Message], List[Message]]:
+        """Async version of get_messages_for_run, which searches the knowledge base without blocking the event loop."""
+
+        # Build the user message first, so get_messages_for_run uses it directly
+        if isinstance(message, str):
+            user_message = await self.aget_user_message(message=message, images=images, **kwargs)
+            if user_message is not None:
+                message = user_message
+        return self.get_messages_for_run(message=message, images=images, messages=messages, **kwargs)
+
     def save_run_response_to_file(self, message: Optional[Union[str, List, Dict, Message]] = None) -> None:
         if self.save_response_to_file is not None and self.run_response is not None:
             message_str = None
@@ -1526,6 +1701,108 @@ class Agent(BaseModel):
                     aggregated_metrics[k].append(v)
         return aggregated_metrics
 
+    def _post_run(self, memory_inputs: List[str]) -> None:
+        """Updates the memories with the user messages of a run and the session summary, and saves the session.
+
+        Args:
+            memory_inputs (List[str]): The user messages of the run.
+        """
+        if self.memory.create_user_memories and self.memory.update_user_memories_after_run:
+            for memory_input in memory_inputs:
+                with self._trace_span("update_memory"):
+                    self.memory.update_memory(input=memory_input)
+        if self.memory.create_session_summary and self.memory.update_session_summary_after_run:
+            with self._trace_span("update_summary"):
+                self.memory.update_summary()
+        with self._trace_span("write_to_storage"):
+            self.write_to_storage()
+
+    def _submit_post_run(self, session_id: str, memory_inputs: List[str]) -> None:
+        """Runs the work of _post_run() in the background, on a snapshot of the session and memory taken now.
+
+        Switching the session or clearing the memory before the work runs does not change what is saved,
+        and the Agent's memory is not modified while the rest of the run reads it.
+
+        Args:
+            session_id (str): The session of the run.
+            memory_inputs (List[str]): The user messages of the run.
+        """
+        session = self.get_agent_session()
+        memory = self.memory.snapshot()
+        storage = self.storage
+
+        def post_run() -> None:
+            if memory.create_user_memories and memory.update_user_memories_after_run:
+                for memory_input in memory_inputs:
+                    memory.update_memory(input=memory_input)
+            if memory.create_session_summary and memory.update_session_summary_after_run:
+                memory.update_summary()
+            if storage is not None:
+                session.memory = memory.to_dict()
+                storage.upsert(session=session)
+            # The next run of the session waits for this work, so it uses the updated summary and memories
+            if self.session_id == session_id:
+                self.memory.summary = memory.summary
+                self.memory.memories = memory.memories
+
+        post_run_queue.submit(session_id, post_run)
+
+    async def _apost_run(self, memory_inputs: List[str]) -> None:
+        """Async version of _post_run()"""
+        if self.memory.create_user_memories and self.memory.update_user_memories_after_run:
+            for memory_input in memory_inputs:
+                with self._trace_span("update_memory"):
+                    await self.memory.aupdate_memory(input=memory_input)
+        if self.memory.create_session_summary and self.memory.update_session_summary_after_run:
+            with self._trace_span("update_summary"):
+                await self.memory.aupdate_summary()
+        with self._trace_span("write_to_storage"):
+            await self.awrite_to_storage()
+
+    def wait_for_post_run(self, timeout: Optional[float] = None) -> bool:
+        """Waits for the memory updates, summary and storage write of previous runs of this session,
+        when they run in the background. Returns False if the timeout expired first."""
+        if self.session_id is None:
+            return True
+        return post_run_queue.wait(self.session_id, timeout=timeout)
+
+    async def await_post_run(self, timeout: Optional[float] = None) -> bool:
+        """Waits for the post-run work of this session without blocking the event loop"""
+        if self.session_id is None or not post_run_queue.has_pending(self.session_id):
+            return True
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.wait_for_post_run, timeout=timeout))
+
+    def _start_run_trace(self) -> None:
+        """Starts the trace of a run, if tracing is enabled"""
+        self._run_trace = None
+        if self.tracing or self.trace_exporter is not None:
+            self._run_trace = Trace(
+                name="agent.run",
+                trace_id=self.run_id,
+                agent_id=self.agent_id,
+                session_id=self.session_id,
+                model=self.model.id if self.model is not None else None,
+            )
+
+    def _trace_span(self, name: str, **attributes: Any):
+        """Returns a span for a stage of the current run, which records nothing if tracing is disabled"""
+        if self._run_trace is None:
+            return NOOP_SPAN
+        return self._run_trace.span(name, **attributes)
+
+    def _end_run_trace(self) -> None:
+        """Adds the spans of the run to the run_response and exports them"""
+        if self._run_trace is None:
+            return
+        self.run_response.spans = self._run_trace.end()
+        self._run_trace = None
+        if self.trace_exporter is not None:
+            try:
+                self.trace_exporter.export(self.run_response.spans)
+            except Exception as e:
+                logger.warning(f"Could not export run spans: {e}")
+
     def _run(
         self,
         message: Optional[Union[str, List, Dict, Message]] = None,
@@ -1559,32 +1836,41 @@ class Agent(BaseModel):
 
         logger.debug(f"*********** Agent Run Start: {self.run_response.run_id} ***********")
 
+        # Wait for the work of previous runs of this session to finish before reading it
+        self.wait_for_post_run()
+
+        self._start_run_trace()
+
         # 1. Update the Model (set defaults, add tools, etc.)
-        self.update_model()
-        self.run_response.model = self.model.id if self.model is not None else None
+        with self._trace_span("update_model"):
+            self.update_model()
+            self.run_response.model = self.model.id if self.model is not None else None
 
         # 2. Read existing session from storage
-        self.read_from_storage()
+        with self._trace_span("read_from_storage"):
+            self.read_from_storage()
 
         # 3. Prepare messages for this run
-        system_message, user_messages, messages_for_model = self.get_messages_for_run(
-            message=message, images=images, messages=messages, **kwargs
-        )
+        with self._trace_span("get_messages_for_run"):
+            system_message, user_messages, messages_for_model = self.get_messages_for_run(
+                message=message, images=images, messages=messages, **kwargs
+            )
 
         # 4. Reason about the task if reasoning is enabled
         if self.reasoning:
-            reason_generator = self.reason(
-                system_message=system_message,
-                user_messages=user_messages,
-                messages_for_model=messages_for_model,
-                stream_intermediate_steps=stream_intermediate_steps,
-            )
+            with self._trace_span("reasoning"):
+                reason_generator = self.reason(
+                    system_message=system_message,
+                    user_messages=user_messages,
+                    messages_for_model=messages_for_model,
+                    stream_intermediate_steps=stream_intermediate_steps,
+                )
 
-            if stream_agent_response:
-                yield from reason_generator
-            else:
-                # Consume the generator without yielding
-                deque(reason_generator, maxlen=0)
+                if stream_agent_response:
+                    yield from reason_generator
+                else:
+                    # Consume the generator without yielding
+                    deque(reason_generator, maxlen=0)
 
         # Get the number of messages in messages_for_model that form the input for this run
         # We track these to skip when updating memory
@@ -1606,66 +1892,69 @@ class Agent(BaseModel):
         # 5. Generate a response from the Model (includes running function calls)
         model_response: ModelResponse
         self.model = cast(Model, self.model)
-        if stream_agent_response:
-            model_response = ModelResponse(content="")
-            for model_response_chunk in self.model.response_stream(messages=messages_for_model):
-                if model_response_chunk.event == ModelResponseEvent.assistant_response.value:
-                    if model_response_chunk.content is not None and model_response.content is not None:
-                        model_response.content += model_response_chunk.content
-                        self.run_response.content = model_response_chunk.content
-                        self.run_response.created_at = model_response_chunk.created_at
-                        yield self.run_response
-                elif model_response_chunk.event == ModelResponseEvent.tool_call_started.value:
-                    # Add tool call to the run_response
-                    tool_call_dict = model_response_chunk.tool_call
-                    if tool_call_dict is not None:
-                        if self.run_response.tools is None:
-                            self.run_response.tools = []
-                        self.run_response.tools.append(tool_call_dict)
-                    if stream_intermediate_steps:
-                        yield RunResponse(
-                            run_id=self.run_id,
-                            session_id=self.session_id,
-                            agent_id=self.agent_id,
-                            content=model_response_chunk.content,
-                            tools=self.run_response.tools,
-                            messages=self.run_response.messages,
-                            model=self.run_response.model,
-                            extra_data=self.run_response.extra_data,
-                            event=RunEvent.tool_call_started.value,
-                        )
-                elif model_response_chunk.event == ModelResponseEvent.tool_call_completed.value:
-                    # Update the existing tool call in the run_response
-                    tool_call_dict = model_response_chunk.tool_call
-                    if tool_call_dict is not None and self.run_response.tools:
-                        tool_call_id_to_update = tool_call_dict["tool_call_id"]
-                        # Use a dictionary comprehension to create a mapping of tool_call_id to index
-                        tool_call_index_map = {tc["tool_call_id"]: i for i, tc in enumerate(self.run_response.tools)}
-                        # Update the tool call if it exists
-                        if tool_call_id_to_update in tool_call_index_map:
-                            self.run_response.tools[tool_call_index_map[tool_call_id_to_update]] = tool_call_dict
-                    if stream_intermediate_steps:
-                        yield RunResponse(
-                            run_id=self.run_id,
-                            session_id=self.session_id,
-                            agent_id=self.agent_id,
-                            content=model_response_chunk.content,
-                            tools=self.run_response.tools,
-                            messages=self.run_response.messages,
-                            model=self.run_response.model,
-                            extra_data=self.run_response.extra_data,
-                            event=RunEvent.tool_call_completed.value,
-                        )
-        else:
-            model_response = self.model.response(messages=messages_for_model)
-            # Handle structured outputs
-            if self.response_model is not None and self.structured_outputs:
-                self.run_response.content = model_response.parsed
-                self.run_response.content_type = self.response_model.__name__
+        with self._trace_span("model_response", stream=stream_agent_response):
+            if stream_agent_response:
+                model_response = ModelResponse(content="")
+                for model_response_chunk in self.model.response_stream(messages=messages_for_model):
+                    if model_response_chunk.event == ModelResponseEvent.assistant_response.value:
+                        if model_response_chunk.content is not None and model_response.content is not None:
+                            model_response.content += model_response_chunk.content
+                            self.run_response.content = model_response_chunk.content
+                            self.run_response.created_at = model_response_chunk.created_at
+                            yield self.run_response
+                    elif model_response_chunk.event == ModelResponseEvent.tool_call_started.value:
+                        # Add tool call to the run_response
+                        tool_call_dict = model_response_chunk.tool_call
+                        if tool_call_dict is not None:
+                            if self.run_response.tools is None:
+                                self.run_response.tools = []
+                            self.run_response.tools.append(tool_call_dict)
+                        if stream_intermediate_steps:
+                            yield RunResponse(
+                                run_id=self.run_id,
+                                session_id=self.session_id,
+                                agent_id=self.agent_id,
+                                content=model_response_chunk.content,
+                                tools=self.run_response.tools,
+                                messages=self.run_response.messages,
+                                model=self.run_response.model,
+                                extra_data=self.run_response.extra_data,
+                                event=RunEvent.tool_call_started.value,
+                            )
+                    elif model_response_chunk.event == ModelResponseEvent.tool_call_completed.value:
+                        # Update the existing tool call in the run_response
+                        tool_call_dict = model_response_chunk.tool_call
+                        if tool_call_dict is not None and self.run_response.tools:
+                            tool_call_id_to_update = tool_call_dict["tool_call_id"]
+                            # Use a dictionary comprehension to create a mapping of tool_call_id to index
+                            tool_call_index_map = {
+                                tc["tool_call_id"]: i for i, tc in enumerate(self.run_response.tools)
+                            }
+                            # Update the tool call if it exists
+                            if tool_call_id_to_update in tool_call_index_map:
+                                self.run_response.tools[tool_call_index_map[tool_call_id_to_update]] = tool_call_dict
+                        if stream_intermediate_steps:
+                            yield RunResponse(
+                                run_id=self.run_id,
+                                session_id=self.session_id,
+                                agent_id=self.agent_id,
+                                content=model_response_chunk.content,
+                                tools=self.run_response.tools,
+                                messages=self.run_response.messages,
+                                model=self.run_response.model,
+                                extra_data=self.run_response.extra_data,
+                                event=RunEvent.tool_call_completed.value,
+                            )
             else:
-                self.run_response.content = model_response.content
-            self.run_response.messages = messages_for_model
-            self.run_response.created_at = model_response.created_at
+                model_response = self.model.response(messages=messages_for_model)
+                # Handle structured outputs
+                if self.response_model is not None and self.structured_outputs:
+                    self.run_response.content = model_response.parsed
+                    self.run_response.content_type = self.response_model.__name__
+                else:
+                    self.run_response.content = model_response.content
+                self.run_response.messages = messages_for_model
+                self.run_response.created_at = model_response.created_at
 
         # Build a list of messages that belong to this particular run
         run_messages = user_messages + messages_for_model[num_input_messages:]
@@ -1700,6 +1989,8 @@ class Agent(BaseModel):
 
         # Create an AgentRun object to add to memory
         agent_run = AgentRun(response=self.run_response)
+        # User messages to update the memories with
+        memory_inputs: List[str] = []
         if message is not None:
             user_message_for_memory: Optional[Message] = None
             if isinstance(message, str):
@@ -1708,9 +1999,7 @@ class Agent(BaseModel):
                 user_message_for_memory = message
             if user_message_for_memory is not None:
                 agent_run.message = user_message_for_memory
-                # Update the memories with the user message if needed
-                if self.memory.create_user_memories and self.memory.update_user_memories_after_run:
-                    self.memory.update_memory(input=user_message_for_memory.get_content_string())
+                memory_inputs.append(user_message_for_memory.get_content_string())
         elif messages is not None and len(messages) > 0:
             for _m in messages:
                 _um = None
@@ -1728,19 +2017,17 @@ class Agent(BaseModel):
                     if agent_run.messages is None:
                         agent_run.messages = []
                     agent_run.messages.append(_um)
-                    if self.memory.create_user_memories and self.memory.update_user_memories_after_run:
-                        self.memory.update_memory(input=_um.get_content_string())
+                    memory_inputs.append(_um.get_content_string())
                 else:
                     logger.warning("Unable to add message to memory")
         # Add AgentRun to memory
         self.memory.add_run(agent_run)
 
-        # Update the session summary if needed
-        if self.memory.create_session_summary and self.memory.update_session_summary_after_run:
-            self.memory.update_summary()
-
-        # 7. Save session to storage
-        self.write_to_storage()
+        # 7. Save session to storage, after updating the memories and the session summary
+        if self.post_run_in_background and self.session_id is not None:
+            self._submit_post_run(self.session_id, memory_inputs=memory_inputs)
+        else:
+            self._post_run(memory_inputs=memory_inputs)
 
         # 8. Save output to file if save_response_to_file is set
         self.save_run_response_to_file(message=message)
@@ -1757,7 +2044,9 @@ class Agent(BaseModel):
             self.run_input = [m.to_dict() if isinstance(m, Message) else m for m in messages]
 
         # Log Agent Run
-        self.log_agent_run()
+        with self._trace_span("log_agent_run"):
+            self.log_agent_run()
+        self._end_run_trace()
 
         logger.debug(f"*********** Agent Run End: {self.run_response.run_id} ***********")
         if stream_intermediate_steps:
@@ -1915,34 +2204,43 @@ class Agent(BaseModel):
 
         logger.debug(f"*********** Async Agent Run Start: {self.run_response.run_id} ***********")
 
+        # Wait for the work of previous runs of this session to finish before reading it
+        await self.await_post_run()
+
+        self._start_run_trace()
+
         # 1. Update the Model (set defaults, add tools, etc.)
-        self.update_model()
-        self.run_response.model = self.model.id if self.model is not None else None
+        with self._trace_span("update_model"):
+            self.update_model()
+            self.run_response.model = self.model.id if self.model is not None else None
 
         # 2. Read existing session from storage
-        self.read_from_storage()
+        with self._trace_span("read_from_storage"):
+            await self.aread_from_storage()
 
         # 3. Prepare messages for this run
-        system_message, user_messages, messages_for_model = self.get_messages_for_run(
-            message=message, images=images, messages=messages, **kwargs
-        )
+        with self._trace_span("get_messages_for_run"):
+            system_message, user_messages, messages_for_model = await self.aget_messages_for_run(
+                message=message, images=images, messages=messages, **kwargs
+            )
 
         # 4. Reason about the task if reasoning is enabled
         if self.reasoning:
-            areason_generator = self.areason(
-                system_message=system_message,
-                user_messages=user_messages,
-                messages_for_model=messages_for_model,
-                stream_intermediate_steps=stream_intermediate_steps,
-            )
+            with self._trace_span("reasoning"):
+                areason_generator = self.areason(
+                    system_message=system_message,
+                    user_messages=user_messages,
+                    messages_for_model=messages_for_model,
+                    stream_intermediate_steps=stream_intermediate_steps,
+                )
 
-            if stream_agent_response:
-                async for item in areason_generator:
-                    yield item
-            else:
-                # Consume the generator without yielding
-                async for _ in areason_generator:
-                    pass
+                if stream_agent_response:
+                    async for item in areason_generator:
+                        yield item
+                else:
+                    # Consume the generator without yielding
+                    async for _ in areason_generator:
+                        pass
 
         # Get the number of messages in messages_for_model that form the input for this run
         # We track these to skip when updating memory
@@ -1964,67 +2262,70 @@ class Agent(BaseModel):
         # 5. Generate a response from the Model (includes running function calls)
         model_response: ModelResponse
         self.model = cast(Model, self.model)
-        if stream and self.streamable:
-            model_response = ModelResponse(content="")
-            model_response_stream = self.model.aresponse_stream(messages=messages_for_model)
-            async for model_response_chunk in model_response_stream:  # type: ignore
-                if model_response_chunk.event == ModelResponseEvent.assistant_response.value:
-                    if model_response_chunk.content is not None and model_response.content is not None:
-                        model_response.content += model_response_chunk.content
-                        self.run_response.content = model_response_chunk.content
-                        self.run_response.created_at = model_response_chunk.created_at
-                        yield self.run_response
-                elif model_response_chunk.event == ModelResponseEvent.tool_call_started.value:
-                    # Add tool call to the run_response
-                    tool_call_dict = model_response_chunk.tool_call
-                    if tool_call_dict is not None:
-                        if self.run_response.tools is None:
-                            self.run_response.tools = []
-                        self.run_response.tools.append(tool_call_dict)
-                    if stream_intermediate_steps:
-                        yield RunResponse(
-                            run_id=self.run_id,
-                            session_id=self.session_id,
-                            agent_id=self.agent_id,
-                            content=model_response_chunk.content,
-                            tools=self.run_response.tools,
-                            messages=self.run_response.messages,
-                            model=self.run_response.model,
-                            extra_data=self.run_response.extra_data,
-                            event=RunEvent.tool_call_started.value,
-                        )
-                elif model_response_chunk.event == ModelResponseEvent.tool_call_completed.value:
-                    # Update the existing tool call in the run_response
-                    tool_call_dict = model_response_chunk.tool_call
-                    if tool_call_dict is not None and self.run_response.tools:
-                        tool_call_id = tool_call_dict["tool_call_id"]
-                        # Use a dictionary comprehension to create a mapping of tool_call_id to index
-                        tool_call_index_map = {tc["tool_call_id"]: i for i, tc in enumerate(self.run_response.tools)}
-                        # Update the tool call if it exists
-                        if tool_call_id in tool_call_index_map:
-                            self.run_response.tools[tool_call_index_map[tool_call_id]] = tool_call_dict
-                    if stream_intermediate_steps:
-                        yield RunResponse(
-                            run_id=self.run_id,
-                            session_id=self.session_id,
-                            agent_id=self.agent_id,
-                            content=model_response_chunk.content,
-                            tools=self.run_response.tools,
-                            messages=self.run_response.messages,
-                            model=self.run_response.model,
-                            extra_data=self.run_response.extra_data,
-                            event=RunEvent.tool_call_completed.value,
-                        )
-        else:
-            model_response = await self.model.aresponse(messages=messages_for_model)
-            # Handle structured outputs
-            if self.response_model is not None and self.structured_outputs:
-                self.run_response.content = model_response.parsed
-                self.run_response.content_type = self.response_model.__name__
+        with self._trace_span("model_response", stream=stream_agent_response):
+            if stream and self.streamable:
+                model_response = ModelResponse(content="")
+                model_response_stream = self.model.aresponse_stream(messages=messages_for_model)
+                async for model_response_chunk in model_response_stream:  # type: ignore
+                    if model_response_chunk.event == ModelResponseEvent.assistant_response.value:
+                        if model_response_chunk.content is not None and model_response.content is not None:
+                            model_response.content += model_response_chunk.content
+                            self.run_response.content = model_response_chunk.content
+                            self.run_response.created_at = model_response_chunk.created_at
+                            yield self.run_response
+                    elif model_response_chunk.event == ModelResponseEvent.tool_call_started.value:
+                        # Add tool call to the run_response
+                        tool_call_dict = model_response_chunk.tool_call
+                        if tool_call_dict is not None:
+                            if self.run_response.tools is None:
+                                self.run_response.tools = []
+                            self.run_response.tools.append(tool_call_dict)
+                        if stream_intermediate_steps:
+                            yield RunResponse(
+                                run_id=self.run_id,
+                                session_id=self.session_id,
+                                agent_id=self.agent_id,
+                                content=model_response_chunk.content,
+                                tools=self.run_response.tools,
+                                messages=self.run_response.messages,
+                                model=self.run_response.model,
+                                extra_data=self.run_response.extra_data,
+                                event=RunEvent.tool_call_started.value,
+                            )
+                    elif model_response_chunk.event == ModelResponseEvent.tool_call_completed.value:
+                        # Update the existing tool call in the run_response
+                        tool_call_dict = model_response_chunk.tool_call
+                        if tool_call_dict is not None and self.run_response.tools:
+                            tool_call_id = tool_call_dict["tool_call_id"]
+                            # Use a dictionary comprehension to create a mapping of tool_call_id to index
+                            tool_call_index_map = {
+                                tc["tool_call_id"]: i for i, tc in enumerate(self.run_response.tools)
+                            }
+                            # Update the tool call if it exists
+                            if tool_call_id in tool_call_index_map:
+                                self.run_response.tools[tool_call_index_map[tool_call_id]] = tool_call_dict
+                        if stream_intermediate_steps:
+                            yield RunResponse(
+                                run_id=self.run_id,
+                                session_id=self.session_id,
+                                agent_id=self.agent_id,
+                                content=model_response_chunk.content,
+                                tools=self.run_response.tools,
+                                messages=self.run_response.messages,
+                                model=self.run_response.model,
+                                extra_data=self.run_response.extra_data,
+                                event=RunEvent.tool_call_completed.value,
+                            )
             else:
-                self.run_response.content = model_response.content
-            self.run_response.messages = messages_for_model
-            self.run_response.created_at = model_response.created_at
+                model_response = await self.model.aresponse(messages=messages_for_model)
+                # Handle structured outputs
+                if self.response_model is not None and self.structured_outputs:
+                    self.run_response.content = model_response.parsed
+                    self.run_response.content_type = self.response_model.__name__
+                else:
+                    self.run_response.content = model_response.content
+                self.run_response.messages = messages_for_model
+                self.run_response.created_at = model_response.created_at
 
         # Build a list of messages that belong to this particular run
         run_messages = user_messages + messages_for_model[num_input_messages:]
@@ -2059,6 +2360,8 @@ class Agent(BaseModel):
 
         # Create an AgentRun object to add to memory
         agent_run = AgentRun(response=self.run_response)
+        # User messages to update the memories with
+        memory_inputs: List[str] = []
         if message is not None:
             user_message_for_memory: Optional[Message] = None
             if isinstance(message, str):
@@ -2067,9 +2370,7 @@ class Agent(BaseModel):
                 user_message_for_memory = message
             if user_message_for_memory is not None:
                 agent_run.message = user_message_for_memory
-                # Update the memories with the user message if needed
-                if self.memory.create_user_memories and self.memory.update_user_memories_after_run:
-                    await self.memory.aupdate_memory(input=user_message_for_memory.get_content_string())
+                memory_inputs.append(user_message_for_memory.get_content_string())
         elif messages is not None and len(messages) > 0:
             for _m in messages:
                 _um = None
@@ -2087,19 +2388,17 @@ class Agent(BaseModel):
                     if agent_run.messages is None:
                         agent_run.messages = []
                     agent_run.messages.append(_um)
-                    if self.memory.create_user_memories and self.memory.update_user_memories_after_run:
-                        await self.memory.aupdate_memory(input=_um.get_content_string())
+                    memory_inputs.append(_um.get_content_string())
                 else:
                     logger.warning("Unable to add message to memory")
         # Add AgentRun to memory
         self.memory.add_run(agent_run)
 
-        # Update the session summary if needed
-        if self.memory.create_session_summary and self.memory.update_session_summary_after_run:
-            await self.memory.aupdate_summary()
-
-        # 7. Save session to storage
-        self.write_to_storage()
+        # 7. Save session to storage, after updating the memories and the session summary
+        if self.post_run_in_background and self.session_id is not None:
+            self._submit_post_run(self.session_id, memory_inputs=memory_inputs)
+        else:
+            await self._apost_run(memory_inputs=memory_inputs)
 
         # 8. Save output to file if save_response_to_file is set
         self.save_run_response_to_file(message=message)
@@ -2116,7 +2415,9 @@ class Agent(BaseModel):
             self.run_input = [m.to_dict() if isinstance(m, Message) else m for m in messages]
 
         # Log Agent Run
-        await self.alog_agent_run()
+        with self._trace_span("log_agent_run"):
+            await self.alog_agent_run()
+        self._end_run_trace()
 
         logger.debug(f"*********** Async Agent Run End: {self.run_response.run_id} ***********")
         if stream_intermediate_steps:
@@ -2300,6 +2601,15 @@ class Agent(BaseModel):
         # -*- Save to storage
         self.write_to_storage()
 
+    async def adelete_session(self, session_id: str):
+        """Delete the current session and save to storage without blocking the event loop"""
+        if self.storage is None:
+            return
+        # -*- Delete session
+        await self.storage.adelete_session(session_id=session_id)
+        # -*- Save to storage
+        await self.awrite_to_storage()
+
     ###########################################################################
     # Default Tools
     ###########################################################################
@@ -0,0 +1,137 @@
+import atexit
+from collections import deque
+from threading import Condition, Thread
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from phi.utils.log import logger
+
+
+class PostRunQueue:
+    """Runs the work an Agent does after a run, such as memory updates, session summaries and storage writes,
+    on a background thread pool.
+
+    Tasks of the same session run one at a time, in the order they were submitted. Tasks of different sessions
+    run concurrently. When the process exits, pending tasks are given a few seconds to complete.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        # Maximum number of sessions processed at the same time
+        self.max_workers: int = max_workers
+
+        self.num_submitted: int = 0
+        self.num_completed: int = 0
+        self.num_failed: int = 0
+
+        # Tasks of each session with pending work. The first task is running.
+        self._pending: Dict[str, Deque[Callable[[], Any]]] = {}
+        # Sessions with pending work which are not processed by a worker yet
+        self._ready: Deque[str] = deque()
+        self._condition = Condition()
+        # Workers are daemon threads, so tasks still running at exit do not block the process after close()
+        self._workers: List[Thread] = []
+        self._idle_workers: int = 0
+        self._closed: bool = False
+        atexit.register(self.close)
+
+    def submit(self, session_id: str, task: Callable[[], Any]) -> None:
+        """Runs a task after the pending tasks of the session"""
+        with self._condition:
+            self.num_submitted += 1
+            if self._closed:
+                # Tasks submitted after close() start new workers
+                self._closed = False
+                self._workers = [worker for worker in self._workers if worker.is_alive()]
+            session_tasks = self._pending.get(session_id)
+            if session_tasks is not None:
+                # The session is already processed, its worker runs the task next
+                session_tasks.append(task)
+                return
+            self._pending[session_id] = deque([task])
+            self._ready.append(session_id)
+            if self._idle_workers == 0 and len(self._workers) < self.max_workers:
+                worker = Thread(target=self._run_worker, name=f"phi-post-run-{len(self._workers)}", daemon=True)
+                self._workers.append(worker)
+                worker.start()
+            else:
+                self._condition.notify_all()
+
+    def _run_worker(self) -> None:
+        while True:
+            with self._condition:
+                self._idle_workers += 1
+                self._condition.wait_for(lambda: len(self._ready) > 0 or self._closed)
+                self._idle_workers -= 1
+                if len(self._ready) == 0:
+                    return
+                session_id = self._ready.popleft()
+            self._run_session(session_id)
+
+    def _run_session(self, session_id: str) -> None:
+        while True:
+            with self._condition:
+                session_tasks = self._pending[session_id]
+                task = session_tasks[0]
+            failed = False
+            try:
+                task()
+            except Exception as e:
+                failed = True
+                logger.warning(f"Post-run task failed for session {session_id}: {e}")
+            with self._condition:
+                if failed:
+                    self.num_failed += 1
+                else:
+                    self.num_completed += 1
+                session_tasks.popleft()
+                if len(session_tasks) == 0:
+                    del self._pending[session_id]
+                    self._condition.notify_all()
+                    return
+
+    def has_pending(self, session_id: str) -> bool:
+        with self._condition:
+            return session_id in self._pending
+
+    def wait(self, session_id: str, timeout: Optional[float] = None) -> bool:
+        """Waits until the tasks of a session are done. Returns False if the timeout expired first."""
+        with self._condition:
+            return self._condition.wait_for(lambda: session_id not in self._pending, timeout=timeout)
+
+    def wait_all(self, timeout: Optional[float] = None) -> bool:
+        """Waits until the tasks of all sessions are done. Returns False if the timeout expired first."""
+        with self._condition:
+            return self._condition.wait_for(lambda: len(self._pending) == 0, timeout=timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Waits up to `timeout` seconds for the pending tasks to complete and stops the workers.
+        Tasks which are not done by then are abandoned."""
+        done = self.wait_all(timeout=timeout)
+        with self._condition:
+            if not done:
+                pending = {session_id: len(session_tasks) for session_id, session_tasks in self._pending.items()}
+                logger.warning(
+                    f"Abandoning {sum(pending.values())} post-run tasks of {len(pending)} sessions "
+                    f"after {timeout}s: {pending}"
+                )
+                # Workers finish their running task, the tasks after it are not started
+                for session_tasks in self._pending.values():
+                    while len(session_tasks) > 1:
+                        session_tasks.pop()
+            self._closed = True
+            self._condition.notify_all()
+
+    def info(self) -> Dict[str, Any]:
+        """Returns the task counters"""
+        with self._condition:
+            num_pending = sum(len(session_tasks) for session_tasks in self._pending.values())
+        return {
+            "pending": num_pending,
+            "sessions": len(self._pending),
+            "submitted": self.num_submitted,
+            "completed": self.num_completed,
+            "failed": self.num_failed,
+        }
+
+
+# The queue shared by all Agents in this process, so runs of a session wait for its pending work
+post_run_queue = PostRunQueue()
@@ -1,24 +1,22 @@
-from phi.api.api import api
+from phi.api.exporter import api_exporter
 from phi.api.routes import ApiRoutes
 from phi.api.schemas.agent import AgentRunCreate, AgentSessionCreate
 from phi.cli.settings import phi_cli_settings
 from phi.utils.log import logger
 
+# Sessions and runs are queued and sent by the api exporter in a background thread, so logging them does not
+# block the Agent run
+
 
 def create_agent_session(session: AgentSessionCreate, monitor: bool = False) -> None:
     if not phi_cli_settings.api_enabled:
         return
 
     logger.debug("--**-- Logging Agent Session")
-    with api.AuthenticatedClient() as api_client:
-        try:
-            api_client.post(
-                ApiRoutes.AGENT_SESSION_CREATE if monitor else ApiRoutes.AGENT_TELEMETRY_SESSION_CREATE,
-                json={"session": session.model_dump(exclude_none=True)},
-            )
-        except Exception as e:
-            logger.debug(f"Could not create Agent session: {e}")
-    return
+    api_exporter.submit(
+        ApiRoutes.AGENT_SESSION_CREATE if monitor else ApiRoutes.AGENT_TELEMETRY_SESSION_CREATE,
+        json={"session": session.model_dump(exclude_none=True)},
+    )
 
 
 def create_agent_run(run: AgentRunCreate, monitor: bool = False) -> None:
@@ -26,42 +24,15 @@ def create_agent_run(run: AgentRunCreate, monitor: bool = False) -> None:
         return
 
     logger.debug("--**-- Logging Agent Run")
-    with api.AuthenticatedClient() as api_client:
-        try:
-            api_client.post(
-                ApiRoutes.AGENT_RUN_CREATE if monitor else ApiRoutes.AGENT_TELEMETRY_RUN_CREATE,
-                json={"run": run.model_dump(exclude_none=True)},
-            )
-        except Exception as e:
-            logger.debug(f"Could not create Agent run: {e}")
-    return
+    api_exporter.submit(
+        ApiRoutes.AGENT_RUN_CREATE if monitor else ApiRoutes.AGENT_TELEMETRY_RUN_CREATE,
+        json={"run": run.model_dump(exclude_none=True)},
+    )
 
 
 async def acreate_agent_session(session: AgentSessionCreate, monitor: bool = False) -> None:
-    if not phi_cli_settings.api_enabled:
-        return
-
-    logger.debug("--**-- Logging Agent Session (Async)")
-    async with api.AuthenticatedAsyncClient() as api_client:
-        try:
-            await api_client.post(
-                ApiRoutes.AGENT_SESSION_CREATE if monitor else ApiRoutes.AGENT_TELEMETRY_SESSION_CREATE,
-                json={"session": session.model_dump(exclude_none=True)},
-            )
-        except Exception as e:
-            logger.debug(f"Could not create Agent session: {e}")
+    create_agent_session(session=session, monitor=monitor)
 
 
 async def acreate_agent_run(run: AgentRunCreate, monitor: bool = False) -> None:
-    if not phi_cli_settings.api_enabled:
-        return
-
-    logger.debug("--**-- Logging Agent Run (Async)")
-    async with api.AuthenticatedAsyncClient() as api_client:
-        try:
-            await api_client.post(
-                ApiRoutes.AGENT_RUN_CREATE if monitor else ApiRoutes.AGENT_TELEMETRY_RUN_CREATE,
-                json={"run": run.model_dump(exclude_none=True)},
-            )
-        except Exception as e:
-            logger.debug(f"Could not create Agent run: {e}")
+    create_agent_run(run=run, monitor=monitor)
@@ -0,0 +1,173 @@
+import atexit
+from collections import deque
+from threading import Condition, Thread
+from time import monotonic
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from httpx import Client as HttpxClient
+
+from phi.api.api import api, invalid_response
+from phi.cli.settings import phi_cli_settings
+from phi.utils.log import logger
+
+# (route, json, headers)
+ApiEvent = Tuple[str, Dict[str, Any], Optional[Dict[str, str]]]
+
+
+class ApiExporter:
+    """Sends monitoring and telemetry events to the phidata api from a background thread.
+
+    Events are queued without blocking the caller and sent in batches over a single pooled http client,
+    so sync and async runs do not wait for the api. The queue is bounded: when it is full, new events are dropped,
+    or the oldest queued events when drop_oldest is True. Queued events are sent when the process exits.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 1000,
+        batch_size: int = 50,
+        flush_interval: float = 1.0,
+        drop_oldest: bool = False,
+    ):
+        # Maximum number of events waiting to be sent
+        self.max_queue_size: int = max_queue_size
+        # Maximum number of events sent each time the worker wakes up
+        self.batch_size: int = batch_size
+        # Seconds the worker waits for a full batch before sending the queued events
+        self.flush_interval: float = flush_interval
+        # When the queue is full, drop the oldest queued event instead of the new event
+        self.drop_oldest: bool = drop_oldest
+
+        self.num_submitted: int = 0
+        self.num_sent: int = 0
+        self.num_failed: int = 0
+        self.num_dropped: int = 0
+
+        self._queue: Deque[ApiEvent] = deque()
+        self._in_flight: int = 0
+        # Number of threads waiting in flush(), while the worker sends partial batches
+        self._flush_waiters: int = 0
+        self._condition = Condition()
+        self._closed: bool = False
+        self._worker: Optional[Thread] = None
+        self._client: Optional[HttpxClient] = None
+        atexit.register(self.close)
+
+    @property
+    def client(self) -> HttpxClient:
+        """The http client used for all events, so connections are reused between batches"""
+        if self._client is None:
+            self._client = api.AuthenticatedClient()
+        return self._client
+
+    def submit(self, route: str, json: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> bool:
+        """Queues an event to POST to an api route. Returns False if the event was dropped."""
+        if not phi_cli_settings.api_enabled:
+            return False
+
+        with self._condition:
+            if self._closed:
+                self.num_dropped += 1
+                return False
+            if len(self._queue) >= self.max_queue_size:
+                self.num_dropped += 1
+                if not self.drop_oldest:
+                    logger.debug(f"Api event queue is full, dropping event: {route}")
+                    return False
+                self._queue.popleft()
+            self._queue.append((route, json, headers))
+            self.num_submitted += 1
+            if self._worker is None:
+                self._worker = Thread(target=self._run_worker, name="phi-api-exporter", daemon=True)
+                self._worker.start()
+            # Wake the worker to start a batch, or to send a full batch
+            if len(self._queue) == 1 or len(self._queue) >= self.batch_size:
+                self._condition.notify_all()
+        return True
+
+    def _next_batch(self) -> Optional[list]:
+        """Waits for a full batch, or flush_interval seconds after the first event, and returns the events to send"""
+        with self._condition:
+            while len(self._queue) == 0 and not self._closed:
+                self._condition.wait()
+            deadline = monotonic() + self.flush_interval
+            while len(self._queue) < self.batch_size and not self._closed and self._flush_waiters == 0:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+            if len(self._queue) == 0:
+                return None
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            self._in_flight += len(batch)
+            return batch
+
+    def _send(self, event: ApiEvent) -> None:
+        route, json, headers = event
+        try:
+            response = self.client.post(route, json=json, headers=headers)
+            if invalid_response(response):
+                self.num_failed += 1
+                logger.debug(f"Api event failed: {route}: {response.status_code}")
+            else:
+                self.num_sent += 1
+        except Exception as e:
+            self.num_failed += 1
+            logger.debug(f"Could not send api event: {route}: {e}")
+
+    def _run_worker(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            for event in batch:
+                self._send(event)
+            with self._condition:
+                self._in_flight -= len(batch)
+                self._condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits until the queued events are sent. Returns False if the timeout expired first."""
+        deadline = monotonic() + timeout if timeout is not None else None
+        with self._condition:
+            if self._worker is None:
+                return len(self._queue) == 0
+            # Wake the worker to send a partial batch
+            self._flush_waiters += 1
+            self._condition.notify_all()
+            try:
+                while len(self._queue) > 0 or self._in_flight > 0:
+                    remaining = deadline - monotonic() if deadline is not None else None
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._condition.wait(remaining)
+            finally:
+                self._flush_waiters -= 1
+        return True
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Sends the queued events and stops the worker"""
+        self.flush(timeout=timeout)
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._worker is not None:
+            self._worker.join(timeout=timeout)
+            self._worker = None
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    def info(self) -> Dict[str, Any]:
+        """Returns the exporter counters"""
+        return {
+            "queued": len(self._queue),
+            "submitted": self.num_submitted,
+            "sent": self.num_sent,
+            "failed": self.num_failed,
+            "dropped": self.num_dropped,
+        }
+
+
+# The exporter shared by all Agents and Assistants in this process
+api_exporter = ApiExporter()
@@ -1,8 +1,31 @@
-from typing import Optional, Dict, Any, List
+from contextlib import contextmanager
+from threading import local
+from typing import Optional, Dict, Any, Iterator, List
 
 from pydantic import BaseModel, ConfigDict
 
 from phi.embedder import Embedder
+from phi.embedder.base import split_usage
+
+_reuse_embeddings = local()
+
+
+@contextmanager
+def reuse_embeddings() -> Iterator[None]:
+    """Within this context, Document.embed_documents keeps the embeddings documents already have on this thread.
+
+    The ingestion pipeline embeds documents before writing them, and writes them to the vector db in this context.
+    """
+    previous = getattr(_reuse_embeddings, "active", False)
+    _reuse_embeddings.active = True
+    try:
+        yield
+    finally:
+        _reuse_embeddings.active = previous
+
+
+def is_reusing_embeddings() -> bool:
+    return getattr(_reuse_embeddings, "active", False)
 
 
 class Document(BaseModel):
@@ -27,6 +50,36 @@ class Document(BaseModel):
 
         self.embedding, self.usage = _embedder.get_embedding_and_usage(self.content)
 
+    @classmethod
+    def embed_documents(
+        cls, documents: List["Document"], embedder: Embedder, reuse_existing: Optional[bool] = None
+    ) -> None:
+        """Embed a list of documents using batched requests to the embedder.
+
+        Args:
+            documents (List[Document]): The documents to embed.
+            embedder (Embedder): The embedder to use.
+            reuse_existing (Optional[bool]): If True, documents which already have an embedding are not embedded
+                again. Defaults to True within reuse_embeddings(), and False otherwise.
+        """
+
+        if reuse_existing is None:
+            reuse_existing = is_reusing_embeddings()
+        if reuse_existing:
+            documents = [document for document in documents if document.embedding is None]
+        if len(documents) == 0:
+            return
+
+        embeddings, usage = embedder.get_embeddings_batch([document.content for document in documents])
+        if len(embeddings) != len(documents):
+            raise ValueError(f"Expected {len(documents)} embeddings, got {len(embeddings)}")
+
+        # Usage is reported per request, so it is split between the documents embedded together
+        usages = split_usage(usage, [document.content for document in documents])
+        for document, embedding, document_usage in zip(documents, embeddings, usages):
+            document.embedding = embedding
+            document.usage = document_usage
+
     def to_dict(self) -> Dict[str, Any]:
         """Returns a dictionary representation of the document"""
 
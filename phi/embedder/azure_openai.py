@@ -1,8 +1,9 @@
 from os import getenv
-from typing import Optional, Dict, List, Tuple, Any
+from typing import Optional, Dict, List, Tuple, Any, Union
 from typing_extensions import Literal
 
 from phi.embedder.base import Embedder
+from phi.utils.client_pool import client_pool
 from phi.utils.log import logger
 
 try:
@@ -51,9 +52,9 @@ class AzureOpenAIEmbedder(Embedder):
             _client_params["azure_ad_token"] = self.azure_ad_token
         if self.azure_ad_token_provider:
             _client_params["azure_ad_token_provider"] = self.azure_ad_token_provider
-        return AzureOpenAIClient(**_client_params)
+        return client_pool.get_client(AzureOpenAIClient, _client_params)
 
-    def _response(self, text: str) -> CreateEmbeddingResponse:
+    def _response(self, text: Union[str, List[str]]) -> CreateEmbeddingResponse:
         _request_params: Dict[str, Any] = {
             "input": text,
             "model": self.model,
@@ -81,3 +82,10 @@ class AzureOpenAIEmbedder(Embedder):
         embedding = response.data[0].embedding
         usage = response.usage
         return embedding, usage.model_dump()
+
+    def embed_batch(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        response: CreateEmbeddingResponse = self._response(text=texts)
+
+        embeddings = [data.embedding for data in sorted(response.data, key=lambda data: data.index)]
+        usage = response.usage
+        return embeddings, usage.model_dump()
@@ -1,12 +1,64 @@
-from typing import Optional, Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock, local
+from time import monotonic, sleep
+from typing import Any, Optional, Dict, List, Tuple, Iterator
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PrivateAttr
+
+
+class RateLimiter:
+    """Spaces requests evenly, so at most `requests_per_minute` requests start each minute across all threads"""
+
+    def __init__(self, requests_per_minute: float):
+        self.requests_per_minute: float = requests_per_minute
+        self.interval: float = 60.0 / requests_per_minute
+        self._next_start: float = 0.0
+        self._lock = Lock()
+
+    def wait(self) -> None:
+        """Waits until the next request can start"""
+        with self._lock:
+            now = monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            sleep(start - now)
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> "RateLimiter":
+        return RateLimiter(self.requests_per_minute)
+
+
+# Threads embedding a batch of a concurrent embedding, whose requests are not split across threads again
+_embedding_worker = local()
+
+
+def mark_embedding_worker() -> None:
+    """Marks the current thread as embedding one batch of many, used as a thread pool initializer"""
+    _embedding_worker.active = True
+
+
+def is_embedding_worker() -> bool:
+    return getattr(_embedding_worker, "active", False)
+
+
+_rate_limiter_lock = Lock()
 
 
 class Embedder(BaseModel):
     """Base class for managing embedders"""
 
     dimensions: Optional[int] = 1536
+    # Maximum number of texts to embed in a single request
+    batch_size: int = 100
+    # Maximum number of (estimated) tokens to embed in a single request
+    max_batch_tokens: Optional[int] = None
+    # Number of requests made at the same time when embedding more texts than fit in a request.
+    # Vector dbs also embed up to this many batches of documents while writing the previous batch.
+    concurrent_requests: int = 1
+    # Maximum number of batch requests started per minute, to stay within the rate limit of the provider
+    requests_per_minute: Optional[int] = None
+
+    _rate_limiter: Optional[RateLimiter] = PrivateAttr(default=None)
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -15,3 +67,126 @@ class Embedder(BaseModel):
 
     def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
         raise NotImplementedError
+
+    def get_embeddings_batch(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        """Returns the embeddings for a list of texts, in order, along with the combined usage.
+
+        The texts are split into batches limited by `batch_size` and `max_batch_tokens`,
+        and each batch is embedded using `embed_batch`. Up to `concurrent_requests` batches are embedded at the same time.
+        """
+        batches = list(self.get_batches(texts))
+        batch_results: List[Tuple[List[List[float]], Optional[Dict]]]
+        if self.concurrent_requests > 1 and len(batches) > 1 and not is_embedding_worker():
+            with ThreadPoolExecutor(
+                max_workers=min(self.concurrent_requests, len(batches)),
+                thread_name_prefix="phi-embed",
+                initializer=mark_embedding_worker,
+            ) as executor:
+                batch_results = list(executor.map(self._embed_batch_with_rate_limit, batches))
+        else:
+            batch_results = [self._embed_batch_with_rate_limit(batch) for batch in batches]
+
+        embeddings: List[List[float]] = []
+        usage: Optional[Dict] = None
+        for batch, (batch_embeddings, batch_usage) in zip(batches, batch_results):
+            if len(batch_embeddings) != len(batch):
+                raise ValueError(f"Expected {len(batch)} embeddings, got {len(batch_embeddings)}")
+            embeddings.extend(batch_embeddings)
+            usage = merge_usage(usage, batch_usage)
+        return embeddings, usage
+
+    def _embed_batch_with_rate_limit(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        if self.requests_per_minute is not None:
+            with _rate_limiter_lock:
+                if self._rate_limiter is None or self._rate_limiter.requests_per_minute != self.requests_per_minute:
+                    self._rate_limiter = RateLimiter(self.requests_per_minute)
+                rate_limiter = self._rate_limiter
+            rate_limiter.wait()
+        return self.embed_batch(texts)
+
+    def embed_batch(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        """Embeds a single batch of texts.
+
+        Embedders with a native batch API should override this method,
+        the default implementation makes one request per text.
+        """
+        embeddings: List[List[float]] = []
+        usage: Optional[Dict] = None
+        for text in texts:
+            embedding, text_usage = self.get_embedding_and_usage(text)
+            embeddings.append(embedding)
+            usage = merge_usage(usage, text_usage)
+        return embeddings, usage
+
+    def get_batches(self, texts: List[str]) -> Iterator[List[str]]:
+        """Splits texts into batches of at most `batch_size` texts and `max_batch_tokens` estimated tokens"""
+        batch_size = max(self.batch_size, 1)
+        batch: List[str] = []
+        batch_tokens = 0
+        for text in texts:
+            text_tokens = estimate_tokens(text)
+            if len(batch) > 0 and (
+                len(batch) >= batch_size
+                or (self.max_batch_tokens is not None and batch_tokens + text_tokens > self.max_batch_tokens)
+            ):
+                yield batch
+                batch = []
+                batch_tokens = 0
+            batch.append(text)
+            batch_tokens += text_tokens
+        if len(batch) > 0:
+            yield batch
+
+
+def estimate_tokens(text: str) -> int:
+    """Returns a rough estimate of the number of tokens in a text (~4 characters per token)"""
+    return len(text) // 4 + 1
+
+
+def merge_usage(usage: Optional[Dict], other: Optional[Dict]) -> Optional[Dict]:
+    """Merges two usage dictionaries by summing their numeric values"""
+    if usage is None:
+        return dict(other) if other is not None else None
+    if other is None:
+        return usage
+    for key, value in other.items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            usage[key] = usage.get(key, 0) + value
+        elif isinstance(value, dict):
+            usage[key] = merge_usage(usage.get(key), value)
+        elif key not in usage:
+            usage[key] = value
+    return usage
+
+
+def split_usage(usage: Optional[Dict], texts: List[str]) -> List[Optional[Dict]]:
+    """Splits the usage of a request embedding several texts between the texts, in proportion to their estimated
+    tokens. Integer values are split so the shares sum to the original value."""
+    if usage is None:
+        return [None] * len(texts)
+    weights = [estimate_tokens(text) for text in texts]
+    total = sum(weights)
+    shares: List[Optional[Dict]] = []
+    cumulative = 0
+    for weight in weights:
+        start = cumulative / total
+        cumulative += weight
+        shares.append(_usage_share(usage, start, cumulative / total))
+    return shares
+
+
+def _usage_share(usage: Dict, start: float, end: float) -> Dict:
+    """Returns the share of the usage between the fractions `start` and `end` of the request"""
+    share: Dict = {}
+    for key, value in usage.items():
+        if isinstance(value, bool):
+            share[key] = value
+        elif isinstance(value, int):
+            share[key] = round(value * end) - round(value * start)
+        elif isinstance(value, float):
+            share[key] = value * (end - start)
+        elif isinstance(value, dict):
+            share[key] = _usage_share(value, start, end)
+        else:
+            share[key] = value
+    return share
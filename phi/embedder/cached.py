@@ -0,0 +1,197 @@
+import sqlite3
+from array import array
+from hashlib import md5
+from pathlib import Path
+from threading import Lock
+from typing import Optional, Dict, List, Tuple, Any
+
+from pydantic import PrivateAttr
+
+from phi.embedder.base import Embedder
+from phi.utils.cache import LRUCache
+from phi.utils.log import logger
+
+
+class CachedEmbedder(Embedder):
+    """Embedder that caches the embeddings of another embedder.
+
+    Embeddings are keyed by (model, dimensions, content hash) and persisted to a sqlite database,
+    with an in-memory LRU cache in front of it.
+    """
+
+    # The embedder to cache embeddings for
+    embedder: Embedder
+    # Sqlite database file used to persist embeddings. If None, embeddings are only cached in memory.
+    db_file: Optional[str] = "tmp/embeddings_cache.db"
+    # Table to store embeddings in
+    table_name: str = "embeddings"
+    # Maximum number of embeddings to keep in memory
+    max_memory_entries: int = 10000
+
+    # Number of embeddings served from the cache
+    hits: int = 0
+    # Number of embeddings requested from the embedder
+    misses: int = 0
+
+    _memory: "LRUCache[List[float]]" = PrivateAttr(default_factory=LRUCache)
+    _lock: Any = PrivateAttr(default_factory=Lock)
+    _connection: Optional[sqlite3.Connection] = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        # Vector dbs read the dimensions and batch size from the embedder they are given
+        self.dimensions = self.embedder.dimensions
+        self.batch_size = self.embedder.batch_size
+        self.max_batch_tokens = self.embedder.max_batch_tokens
+        self.concurrent_requests = self.embedder.concurrent_requests
+        self._memory = LRUCache(max_entries=self.max_memory_entries)
+
+    @property
+    def model_id(self) -> str:
+        model = getattr(self.embedder, "model", None)
+        return f"{self.embedder.__class__.__name__}:{model}"
+
+    @property
+    def connection(self) -> Optional[sqlite3.Connection]:
+        if self.db_file is None:
+            return None
+        if self._connection is None:
+            db_path = Path(self.db_file).resolve()
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            logger.debug(f"Opening embeddings cache: {db_path}")
+            self._connection = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table_name} ("
+                "model TEXT NOT NULL, "
+                "dimensions INTEGER NOT NULL, "
+                "content_hash TEXT NOT NULL, "
+                "embedding BLOB NOT NULL, "
+                "PRIMARY KEY (model, dimensions, content_hash))"
+            )
+            self._connection.commit()
+        return self._connection
+
+    def get_key(self, text: str) -> Tuple[str, int, str]:
+        return self.model_id, self.dimensions or 0, md5(text.encode()).hexdigest()
+
+    def _count(self, hits: int, misses: int) -> None:
+        # Embeddings are requested from multiple threads when documents are embedded concurrently
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def _read(self, keys: List[Tuple[str, int, str]]) -> Dict[Tuple[str, int, str], List[float]]:
+        """Returns the cached embeddings for the given keys, checking memory first and then the database"""
+        found: Dict[Tuple[str, int, str], List[float]] = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                embedding = self._memory.get(key)
+                if embedding is not None:
+                    found[key] = embedding
+                else:
+                    missing.append(key)
+
+            connection = self.connection
+            if connection is None or len(missing) == 0:
+                return found
+
+            model, dimensions = self.model_id, self.dimensions or 0
+            content_hashes = list({key[2] for key in missing})
+            # Query in chunks to stay below the sqlite variable limit
+            for i in range(0, len(content_hashes), 500):
+                chunk = content_hashes[i : i + 500]
+                rows = connection.execute(
+                    f"SELECT content_hash, embedding FROM {self.table_name} "
+                    f"WHERE model = ? AND dimensions = ? AND content_hash IN ({', '.join('?' * len(chunk))})",
+                    [model, dimensions, *chunk],
+                ).fetchall()
+                for content_hash, blob in rows:
+                    key = (model, dimensions, content_hash)
+                    embedding = array("f", blob).tolist()
+                    self._memory.set(key, embedding)
+                    found[key] = embedding
+        return found
+
+    def _write(self, items: Dict[Tuple[str, int, str], List[float]]) -> None:
+        """Stores embeddings in memory and in the database"""
+        with self._lock:
+            for key, embedding in items.items():
+                self._memory.set(key, embedding)
+
+            connection = self.connection
+            if connection is None or len(items) == 0:
+                return
+            connection.executemany(
+                f"INSERT OR REPLACE INTO {self.table_name} (model, dimensions, content_hash, embedding) "
+                "VALUES (?, ?, ?, ?)",
+                [(*key, array("f", embedding).tobytes()) for key, embedding in items.items()],
+            )
+            connection.commit()
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.get_embedding_and_usage(text)[0]
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        key = self.get_key(text)
+        cached = self._read([key]).get(key)
+        if cached is not None:
+            self._count(hits=1, misses=0)
+            return cached, None
+
+        self._count(hits=0, misses=1)
+        embedding, usage = self.embedder.get_embedding_and_usage(text)
+        # Do not cache failed embeddings
+        if embedding:
+            self._write({key: embedding})
+        return embedding, usage
+
+    def get_embeddings_batch(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        keys = [self.get_key(text) for text in texts]
+        cached = self._read(keys)
+
+        # Embed each uncached text once, even if it appears multiple times
+        uncached: Dict[Tuple[str, int, str], str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in uncached:
+                uncached[key] = text
+        self._count(hits=len(texts) - len(uncached), misses=len(uncached))
+
+        usage: Optional[Dict] = None
+        if len(uncached) > 0:
+            embeddings, usage = self.embedder.get_embeddings_batch(list(uncached.values()))
+            new_items = {key: embedding for key, embedding in zip(uncached.keys(), embeddings) if embedding}
+            self._write(new_items)
+            cached.update(new_items)
+
+        return [cached.get(key, []) for key in keys], usage
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Returns the cache hit/miss counters"""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total > 0 else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+    def clear(self) -> None:
+        """Removes all cached embeddings"""
+        with self._lock:
+            self._memory.clear()
+            if self.connection is not None:
+                self.connection.execute(f"DELETE FROM {self.table_name}")
+                self.connection.commit()
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> "CachedEmbedder":
+        """The cache is a shared resource, so copies of an Agent or VectorDb reuse the same CachedEmbedder"""
+        if memo is not None:
+            memo[id(self)] = self
+        return self
@@ -1,8 +1,10 @@
 from typing import List, Tuple, Optional, Dict
 from phi.embedder.base import Embedder
+from phi.embedder.registry import get_model
 from phi.utils.log import logger
 
 try:
+    import numpy as np
     from fastembed import TextEmbedding  # type: ignore
 
 except ImportError:
@@ -14,17 +16,44 @@ class FastEmbedEmbedder(Embedder):
 
     model: str = "BAAI/bge-small-en-v1.5"
     dimensions: int = 384
+    # Number of texts encoded together by the model
+    batch_size: int = 256
+    # Number of threads used by the onnx runtime
+    threads: Optional[int] = None
+    # Encode using this many worker processes, 0 uses all available cores. Useful on CPU-only hosts.
+    parallel: Optional[int] = None
+    cache_dir: Optional[str] = None
+
+    @property
+    def client(self) -> TextEmbedding:
+        # The model is shared by every embedder in this process using the same model and settings
+        return get_model(
+            ("fastembed", self.model, self.threads, self.cache_dir),
+            lambda: TextEmbedding(model_name=self.model, threads=self.threads, cache_dir=self.cache_dir),
+        )
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encodes texts into a float32 matrix with one row per text"""
+        embeddings = list(self.client.embed(texts, batch_size=self.batch_size, parallel=self.parallel))
+        if len(embeddings) == 0:
+            return np.empty((0, self.dimensions), dtype=np.float32)
+        return np.asarray(embeddings, dtype=np.float32)
 
     def get_embedding(self, text: str) -> List[float]:
-        model = TextEmbedding(model_name=self.model)
-        embeddings = model.embed(text)
-        embedding_list = list(embeddings)
-
         try:
-            return embedding_list
+            return self.encode([text])[0].tolist()
         except Exception as e:
             logger.warning(e)
             return []
 
     def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
-        return super().get_embedding_and_usage(text)
+        return self.get_embedding(text=text), None
+
+    def get_embeddings_batch(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        # The model batches internally, so all texts are passed in a single call
+        if len(texts) == 0:
+            return [], None
+        return self.encode(texts).tolist(), None
+
+    def embed_batch(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        return self.encode(texts).tolist(), None
@@ -3,6 +3,7 @@ from os import getenv
 from typing import Any, Dict, List, Optional, Tuple
 
 from phi.embedder.base import Embedder
+from phi.utils.client_pool import client_pool
 from phi.utils.log import logger
 
 try:
@@ -29,7 +30,7 @@ class HuggingfaceCustomEmbedder(Embedder):
             _client_params["api_key"] = self.api_key
         if self.client_params:
             _client_params.update(self.client_params)
-        return InferenceClient(**_client_params)
+        return client_pool.get_client(InferenceClient, _client_params)
 
     def _response(self, text: str):
         _request_params: SentenceSimilarityInput = {
@@ -1,6 +1,7 @@
 from typing import Optional, Dict, List, Tuple, Any
 
 from phi.embedder.base import Embedder
+from phi.utils.client_pool import client_pool
 from phi.utils.log import logger
 
 try:
@@ -31,7 +32,7 @@ class OllamaEmbedder(Embedder):
             _ollama_params["timeout"] = self.timeout
         if self.client_kwargs:
             _ollama_params.update(self.client_kwargs)
-        return OllamaClient(**_ollama_params)
+        return client_pool.get_client(OllamaClient, _ollama_params)
 
     def _response(self, text: str) -> Dict[str, Any]:
         kwargs: Dict[str, Any] = {}
@@ -60,3 +61,21 @@ class OllamaEmbedder(Embedder):
         except Exception as e:
             logger.warning(e)
         return embedding, usage
+
+    def embed_batch(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        kwargs: Dict[str, Any] = {}
+        if self.options is not None:
+            kwargs["options"] = self.options
+
+        try:
+            # The `embed` endpoint accepts a list of inputs and returns the embeddings in the same order
+            response = self.client.embed(input=texts, model=self.model, **kwargs)  # type: ignore
+        except Exception as e:
+            logger.warning(e)
+            # Embed the texts one at a time, so a text which fails gets an empty embedding instead of failing the batch
+            return super().embed_batch(texts)
+        embeddings = response.get("embeddings", [])
+        usage = None
+        if response.get("prompt_eval_count") is not None:
+            usage = {"prompt_tokens": response.get("prompt_eval_count")}
+        return embeddings, usage
@@ -1,7 +1,8 @@
-from typing import Optional, Dict, List, Tuple, Any
+from typing import Optional, Dict, List, Tuple, Any, Union
 from typing_extensions import Literal
 
 from phi.embedder.base import Embedder
+from phi.utils.client_pool import client_pool
 from phi.utils.log import logger
 
 try:
@@ -37,9 +38,9 @@ class OpenAIEmbedder(Embedder):
             _client_params["base_url"] = self.base_url
         if self.client_params:
             _client_params.update(self.client_params)
-        return OpenAIClient(**_client_params)
+        return client_pool.get_client(OpenAIClient, _client_params)
 
-    def _response(self, text: str) -> CreateEmbeddingResponse:
+    def _response(self, text: Union[str, List[str]]) -> CreateEmbeddingResponse:
         _request_params: Dict[str, Any] = {
             "input": text,
             "model": self.model,
@@ -69,3 +70,12 @@ class OpenAIEmbedder(Embedder):
         if usage:
             return embedding, usage.model_dump()
         return embedding, None
+
+    def embed_batch(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        response: CreateEmbeddingResponse = self._response(text=texts)
+
+        embeddings = [data.embedding for data in sorted(response.data, key=lambda data: data.index)]
+        usage = response.usage
+        if usage:
+            return embeddings, usage.model_dump()
+        return embeddings, None
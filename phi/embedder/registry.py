@@ -0,0 +1,38 @@
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable
+
+from phi.utils.log import logger
+
+# Local embedding models loaded in this process, keyed by (library, model, options)
+_models: Dict[Hashable, Any] = {}
+# One lock per key, so loading one model does not block access to the others
+_locks: Dict[Hashable, Lock] = {}
+_registry_lock = Lock()
+
+
+def get_model(key: Hashable, loader: Callable[[], Any]) -> Any:
+    """Returns the model registered under `key`, calling `loader` to load it on first use.
+
+    Models are loaded lazily, at most once per process, and are safe to request from multiple threads.
+    """
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _registry_lock:
+        key_lock = _locks.setdefault(key, Lock())
+
+    with key_lock:
+        model = _models.get(key)
+        if model is None:
+            logger.debug(f"Loading embedding model: {key}")
+            model = loader()
+            _models[key] = model
+    return model
+
+
+def remove_model(key: Hashable) -> None:
+    """Removes a model from the registry so it can be garbage collected"""
+    with _registry_lock:
+        _models.pop(key, None)
+        _locks.pop(key, None)
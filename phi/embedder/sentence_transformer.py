@@ -1,15 +1,16 @@
+import atexit
 import platform
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from phi.embedder.base import Embedder
+from phi.embedder.registry import get_model
 from phi.utils.log import logger
 
 try:
+    import numpy as np
     from sentence_transformers import SentenceTransformer
 
     if platform.system() == "Windows":
-        import numpy as np
-
         numpy_version = np.__version__
         if numpy_version.startswith("2"):
             raise RuntimeError(
@@ -21,16 +22,78 @@ except ImportError:
 
 class SentenceTransformerEmbedder(Embedder):
     model: str = "sentence-transformers/all-MiniLM-L6-v2"
+    # Number of texts encoded together by the model
+    batch_size: int = 32
+    # Device to load the model on, e.g. "cpu" or "cuda". Defaults to the best available device.
+    device: Optional[str] = None
+    normalize_embeddings: bool = False
+    # Encode large batches using a pool of worker processes, useful on CPU-only hosts
+    multi_process: bool = False
+    # Devices to start the worker processes on, e.g. ["cpu", "cpu", "cpu", "cpu"]
+    target_devices: Optional[List[str]] = None
+    # Minimum number of texts before the multi-process pool is used
+    multi_process_min_texts: int = 256
+    # -*- Provide the SentenceTransformer manually
     sentence_transformer_client: Optional[SentenceTransformer] = None
 
+    @property
+    def client(self) -> SentenceTransformer:
+        if self.sentence_transformer_client is not None:
+            return self.sentence_transformer_client
+
+        # The model is shared by every embedder in this process using the same model and device
+        return get_model(
+            ("sentence_transformers", self.model, self.device),
+            lambda: SentenceTransformer(model_name_or_path=self.model, device=self.device),
+        )
+
+    def get_pool(self) -> Dict[str, Any]:
+        """Returns the multi-process pool for this model, starting it on first use"""
+        client = self.client
+        target_devices = tuple(self.target_devices) if self.target_devices else None
+
+        def _start_pool() -> Dict[str, Any]:
+            pool = client.start_multi_process_pool(target_devices=list(target_devices) if target_devices else None)
+            atexit.register(client.stop_multi_process_pool, pool)
+            return pool
+
+        return get_model(("sentence_transformers_pool", self.model, self.device, target_devices), _start_pool)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encodes texts into a float32 matrix with one row per text"""
+        if self.multi_process and len(texts) >= self.multi_process_min_texts:
+            embeddings = self.client.encode_multi_process(
+                texts,
+                pool=self.get_pool(),
+                batch_size=self.batch_size,
+                normalize_embeddings=self.normalize_embeddings,
+            )
+        else:
+            embeddings = self.client.encode(
+                texts,
+                batch_size=self.batch_size,
+                normalize_embeddings=self.normalize_embeddings,
+                convert_to_numpy=True,
+            )
+        return np.asarray(embeddings, dtype=np.float32)
+
     def get_embedding(self, text: Union[str, List[str]]) -> List[float]:
-        model = SentenceTransformer(model_name_or_path=self.model)
-        embedding = model.encode(text)
         try:
-            return embedding
+            if isinstance(text, list):
+                return self.encode(text).tolist()
+            return self.encode([text])[0].tolist()
         except Exception as e:
             logger.warning(e)
             return []
 
     def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
         return self.get_embedding(text=text), None
+
+    def get_embeddings_batch(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        # The model batches internally, so all texts are passed in a single call
+        if len(texts) == 0:
+            return [], None
+        return self.encode(texts).tolist(), None
+
+    def embed_batch(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        return self.encode(texts).tolist(), None
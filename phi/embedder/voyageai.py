@@ -1,6 +1,7 @@
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from phi.embedder.base import Embedder
+from phi.utils.client_pool import client_pool
 from phi.utils.log import logger
 
 try:
@@ -13,6 +14,8 @@ except ImportError:
 class VoyageAIEmbedder(Embedder):
     model: str = "voyage-2"
     dimensions: int = 1024
+    # Voyage AI accepts at most 128 texts per request
+    batch_size: int = 128
     request_params: Optional[Dict[str, Any]] = None
     api_key: Optional[str] = None
     base_url: str = "https://api.voyageai.com/v1/embeddings"
@@ -35,11 +38,11 @@ class VoyageAIEmbedder(Embedder):
             _client_params["timeout"] = self.timeout
         if self.client_params:
             _client_params.update(self.client_params)
-        return Client(**_client_params)
+        return client_pool.get_client(Client, _client_params)
 
-    def _response(self, text: str) -> EmbeddingsObject:
+    def _response(self, text: Union[str, List[str]]) -> EmbeddingsObject:
         _request_params: Dict[str, Any] = {
-            "texts": [text],
+            "texts": text if isinstance(text, list) else [text],
             "model": self.model,
         }
         if self.request_params:
@@ -60,3 +63,10 @@ class VoyageAIEmbedder(Embedder):
         embedding = response.embeddings[0]
         usage = {"total_tokens": response.total_tokens}
         return embedding, usage
+
+    def embed_batch(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        response: EmbeddingsObject = self._response(text=texts)
+
+        embeddings = response.embeddings
+        usage = {"total_tokens": response.total_tokens}
+        return embeddings, usage
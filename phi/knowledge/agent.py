@@ -1,4 +1,7 @@
-from typing import List, Optional, Iterator, Dict, Any
+import asyncio
+from functools import partial
+from pathlib import Path
+from typing import List, Optional, Iterator, Dict, Any, Set
 
 from pydantic import ConfigDict
 
@@ -6,8 +9,12 @@ from phi.document import Document
 from phi.document.reader.base import Reader
 from phi.knowledge.base import AssistantKnowledge
 from phi.knowledge.chunks import CharacterChunks, ChunkingStrategy
+from phi.knowledge.manifest import KnowledgeManifest, ManifestEntry
+from phi.knowledge.pipeline import IngestionPipeline, PipelineStats
 from phi.vectordb import VectorDb
+from phi.vectordb.search import SearchResult
 from phi.utils.log import logger
+from phi.utils.tracing import span
 
 
 class AgentKnowledge(AssistantKnowledge):
@@ -27,6 +34,21 @@ class AgentKnowledge(AssistantKnowledge):
     optimize_on: Optional[int] = 1000
     # ChunkingStrategy to chunk documents into smaller documents before storing in vector db
     chunking_strategy: ChunkingStrategy = CharacterChunks()
+    # If True, `load` reads, embeds and writes documents concurrently
+    pipelined_load: bool = False
+    # Number of threads embedding documents in a pipelined load
+    embed_workers: int = 2
+    # Number of threads writing documents to the vector db in a pipelined load
+    write_workers: int = 1
+    # Maximum number of document lists waiting between the stages of a pipelined load
+    pipeline_queue_size: int = 4
+    # Counters from the last pipelined load
+    load_stats: Optional[PipelineStats] = None
+    # Sqlite file recording the files loaded to the vector db, for knowledge bases loaded from files.
+    # If set, `load` only reads new and changed files, and deletes the documents of removed files.
+    manifest_file: Optional[str] = None
+    # Key of this knowledge base in the manifest. Defaults to the class name and path.
+    manifest_key: Optional[str] = None
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -37,6 +59,14 @@ class AgentKnowledge(AssistantKnowledge):
         """
         raise NotImplementedError
 
+    def get_files(self) -> Optional[List[Path]]:
+        """Returns the files in the knowledge base, or None if the knowledge base is not loaded from files"""
+        return None
+
+    def read_file(self, file: Path) -> List[Document]:
+        """Reads a file in the knowledge base into a list of documents"""
+        raise NotImplementedError
+
     def search(
         self, query: str, num_documents: Optional[int] = None, filters: Optional[Dict[str, Any]] = None
     ) -> List[Document]:
@@ -48,7 +78,73 @@ class AgentKnowledge(AssistantKnowledge):
 
             _num_documents = num_documents or self.num_documents
             logger.debug(f"Getting {_num_documents} relevant documents for query: {query}")
-            return self.vector_db.search(query=query, limit=_num_documents, filters=filters)
+            with span("knowledge.search", vector_db=self.vector_db.__class__.__name__, limit=_num_documents) as s:
+                documents = self.vector_db.search(query=query, limit=_num_documents, filters=filters)
+                s.set_attribute("num_documents", len(documents))
+            return documents
+        except Exception as e:
+            logger.error(f"Error searching for documents: {e}")
+            return []
+
+    async def async_search(
+        self, query: str, num_documents: Optional[int] = None, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        """Returns relevant documents matching a query, without blocking the event loop"""
+        try:
+            if self.vector_db is None:
+                logger.warning("No vector db provided")
+                return []
+
+            _num_documents = num_documents or self.num_documents
+            logger.debug(f"Getting {_num_documents} relevant documents for query: {query}")
+            with span("knowledge.search", vector_db=self.vector_db.__class__.__name__, limit=_num_documents) as s:
+                documents = await self.vector_db.async_search(query=query, limit=_num_documents, filters=filters)
+                s.set_attribute("num_documents", len(documents))
+            return documents
+        except Exception as e:
+            logger.error(f"Error searching for documents: {e}")
+            return []
+
+    def search_results(
+        self, query: str, num_documents: Optional[int] = None, filters: Optional[Dict[str, Any]] = None
+    ) -> List[SearchResult]:
+        """Returns relevant documents matching a query without their embeddings, as added to the context of an Agent"""
+        if self.vector_db is None or type(self).search is not AgentKnowledge.search:
+            # Knowledge bases without a vector db, e.g. LangChain or LlamaIndex, or which override `search`,
+            # search documents using `search`
+            return [
+                SearchResult.from_document(document)
+                for document in self.search(query=query, num_documents=num_documents, filters=filters)
+            ]
+
+        try:
+            _num_documents = num_documents or self.num_documents
+            logger.debug(f"Getting {_num_documents} relevant documents for query: {query}")
+            with span("knowledge.search", vector_db=self.vector_db.__class__.__name__, limit=_num_documents) as s:
+                results = self.vector_db.search_results(query=query, limit=_num_documents, filters=filters)
+                s.set_attribute("num_documents", len(results))
+            return results
+        except Exception as e:
+            logger.error(f"Error searching for documents: {e}")
+            return []
+
+    async def async_search_results(
+        self, query: str, num_documents: Optional[int] = None, filters: Optional[Dict[str, Any]] = None
+    ) -> List[SearchResult]:
+        """Returns relevant documents matching a query without their embeddings, without blocking the event loop"""
+        if self.vector_db is None or type(self).search is not AgentKnowledge.search:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, partial(self.search_results, query=query, num_documents=num_documents, filters=filters)
+            )
+
+        try:
+            _num_documents = num_documents or self.num_documents
+            logger.debug(f"Getting {_num_documents} relevant documents for query: {query}")
+            with span("knowledge.search", vector_db=self.vector_db.__class__.__name__, limit=_num_documents) as s:
+                results = await self.vector_db.async_search_results(query=query, limit=_num_documents, filters=filters)
+                s.set_attribute("num_documents", len(results))
+            return results
         except Exception as e:
             logger.error(f"Error searching for documents: {e}")
             return []
@@ -81,8 +177,42 @@ class AgentKnowledge(AssistantKnowledge):
         self.vector_db.create()
 
         logger.info("Loading knowledge base")
+        document_lists = self.document_lists
+        manifest = self.get_manifest()
+        loaded_files: List[ManifestEntry] = []
+        if manifest is not None:
+            if recreate:
+                manifest.clear()
+            document_lists = self.sync_files(manifest, loaded_files)
+
+        try:
+            if self.pipelined_load:
+                use_upsert = upsert and self.vector_db.upsert_available()
+                self.run_pipeline(
+                    document_lists, upsert=use_upsert, skip_existing=skip_existing and not use_upsert, filters=filters
+                )
+            else:
+                self._load_document_lists(document_lists, upsert=upsert, skip_existing=skip_existing, filters=filters)
+
+            if manifest is not None:
+                # Files are only recorded once their documents are stored, so a failed load is retried on the next load
+                manifest.upsert(loaded_files)
+        finally:
+            if manifest is not None:
+                manifest.close()
+
+    def _load_document_lists(
+        self,
+        document_lists: Iterator[List[Document]],
+        upsert: bool = False,
+        skip_existing: bool = True,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if self.vector_db is None:
+            return
+
         num_documents = 0
-        for document_list in self.document_lists:
+        for document_list in document_lists:
             documents_to_load = document_list
             # Upsert documents if upsert is True and vector db supports upsert
             if upsert and self.vector_db.upsert_available():
@@ -91,13 +221,104 @@ class AgentKnowledge(AssistantKnowledge):
             else:
                 # Filter out documents which already exist in the vector db
                 if skip_existing:
-                    documents_to_load = [
-                        document for document in document_list if not self.vector_db.doc_exists(document)
-                    ]
+                    documents_to_load = self.vector_db.filter_new_documents(document_list)
                 self.vector_db.insert(documents=documents_to_load, filters=filters)
             num_documents += len(documents_to_load)
             logger.info(f"Added {len(documents_to_load)} documents to knowledge base")
 
+    def get_manifest(self) -> Optional[KnowledgeManifest]:
+        """Returns the manifest of the files loaded to the vector db, if the knowledge base uses one"""
+        if self.manifest_file is None:
+            return None
+        if self.get_files() is None:
+            logger.warning(f"{self.__class__.__name__} is not loaded from files, ignoring manifest_file")
+            return None
+
+        manifest_key = self.manifest_key
+        if manifest_key is None:
+            path = getattr(self, "path", None)
+            manifest_key = f"{self.__class__.__name__}:{Path(path).resolve() if path is not None else ''}"
+        return KnowledgeManifest(db_file=self.manifest_file, knowledge_base=manifest_key)
+
+    def sync_files(self, manifest: KnowledgeManifest, loaded_files: List[ManifestEntry]) -> Iterator[List[Document]]:
+        """Compares the files in the knowledge base with the manifest,
+        and deletes the documents of changed and removed files from the vector db.
+
+        Args:
+            manifest (KnowledgeManifest): The manifest of the files loaded to the vector db.
+            loaded_files (List[ManifestEntry]): Receives the manifest entries of the files as they are read.
+
+        Returns:
+            Iterator[List[Document]]: Iterator yielding the documents of new and changed files.
+        """
+        files = self.get_files() or []
+        files_to_read, removed_files, names_to_delete = manifest.plan(files)
+        logger.info(f"Syncing {len(files)} files: {len(files_to_read)} new or changed, {len(removed_files)} removed")
+
+        # Names of the documents which could not be deleted
+        failed_names: Set[str] = set()
+        if self.vector_db is not None:
+            all_names = sorted({name for names in names_to_delete.values() for name in names})
+            try:
+                for name in all_names:
+                    if not self.vector_db.delete_by_name(name):
+                        failed_names.add(name)
+            except NotImplementedError:
+                logger.warning(f"{self.vector_db.__class__.__name__} does not support deleting documents")
+                failed_names.update(all_names)
+
+        # Files whose old documents are still in the vector db are not read again and keep their manifest entries,
+        # so they are synced again on the next load
+        blocked_paths = {path for path, names in names_to_delete.items() if failed_names.intersection(names)}
+        if len(blocked_paths) > 0:
+            logger.warning(
+                f"Could not delete the documents of {len(blocked_paths)} changed or removed files, "
+                "these files are not synced: " + ", ".join(sorted(blocked_paths))
+            )
+            files_to_read = {path: value for path, value in files_to_read.items() if path not in blocked_paths}
+        manifest.delete([entry.path for entry in removed_files if entry.path not in blocked_paths])
+
+        def _read_files() -> Iterator[List[Document]]:
+            for file, entry in files_to_read.values():
+                documents = self.read_file(file)
+                entry.document_names = sorted({document.name for document in documents if document.name})
+                loaded_files.append(entry)
+                yield documents
+
+        return _read_files()
+
+    def run_pipeline(
+        self,
+        document_lists: Iterator[List[Document]],
+        upsert: bool = False,
+        skip_existing: bool = True,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> Optional[PipelineStats]:
+        """Load document lists to the vector db using the ingestion pipeline
+
+        Args:
+            document_lists (Iterator[List[Document]]): Iterator yielding lists of documents to load
+            upsert (bool): If True, upserts documents to the vector db. Defaults to False.
+            skip_existing (bool): If True, skips documents which already exist in the vector db. Defaults to True.
+            filters (Optional[Dict[str, Any]]): Filters to add to each row that can be used to limit results during querying. Defaults to None.
+        """
+        if self.vector_db is None:
+            logger.warning("No vector db provided")
+            return None
+
+        pipeline = IngestionPipeline(
+            vector_db=self.vector_db,
+            embed_workers=self.embed_workers,
+            write_workers=self.write_workers,
+            queue_size=self.pipeline_queue_size,
+        )
+        self.load_stats = pipeline.run(document_lists, upsert=upsert, skip_existing=skip_existing, filters=filters)
+        logger.info(
+            f"Loaded {self.load_stats.write.documents} documents to knowledge base "
+            f"in {self.load_stats.elapsed:.2f}s ({self.load_stats.documents_per_second:.1f} documents/s)"
+        )
+        return self.load_stats
+
     def load_documents(
         self,
         documents: List[Document],
@@ -129,11 +350,7 @@ class AgentKnowledge(AssistantKnowledge):
             return
 
         # Filter out documents which already exist in the vector db
-        documents_to_load = (
-            [document for document in documents if not self.vector_db.doc_exists(document)]
-            if skip_existing
-            else documents
-        )
+        documents_to_load = self.vector_db.filter_new_documents(documents) if skip_existing else documents
 
         # Insert documents
         if len(documents_to_load) > 0:
@@ -84,9 +84,7 @@ class AssistantKnowledge(BaseModel):
             else:
                 # Filter out documents which already exist in the vector db
                 if skip_existing:
-                    documents_to_load = [
-                        document for document in document_list if not self.vector_db.doc_exists(document)
-                    ]
+                    documents_to_load = self.vector_db.filter_new_documents(document_list)
                 self.vector_db.insert(documents=documents_to_load, filters=filters)
             num_documents += len(documents_to_load)
             logger.info(f"Added {len(documents_to_load)} documents to knowledge base")
@@ -122,11 +120,7 @@ class AssistantKnowledge(BaseModel):
             return
 
         # Filter out documents which already exist in the vector db
-        documents_to_load = (
-            [document for document in documents if not self.vector_db.doc_exists(document)]
-            if skip_existing
-            else documents
-        )
+        documents_to_load = self.vector_db.filter_new_documents(documents) if skip_existing else documents
 
         # Insert documents
         if len(documents_to_load) > 0:
@@ -19,10 +19,17 @@ class CSVKnowledgeBase(AgentKnowledge):
             Iterator[List[Document]]: Iterator yielding list of documents
         """
 
+        for _csv in self.get_files():
+            yield self.read_file(_csv)
+
+    def get_files(self) -> List[Path]:
         _csv_path: Path = Path(self.path) if isinstance(self.path, str) else self.path
 
         if _csv_path.exists() and _csv_path.is_dir():
-            for _csv in _csv_path.glob("**/*.csv"):
-                yield self.reader.read(file=_csv)
+            return list(_csv_path.glob("**/*.csv"))
         elif _csv_path.exists() and _csv_path.is_file() and _csv_path.suffix == ".csv":
-            yield self.reader.read(file=_csv_path)
+            return [_csv_path]
+        return []
+
+    def read_file(self, file: Path) -> List[Document]:
+        return self.reader.read(file=file)
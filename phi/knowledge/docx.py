@@ -20,11 +20,17 @@ class DocxKnowledgeBase(AgentKnowledge):
             Iterator[List[Document]]: Iterator yielding list of documents
         """
 
+        for _file in self.get_files():
+            yield self.read_file(_file)
+
+    def get_files(self) -> List[Path]:
         _file_path: Path = Path(self.path) if isinstance(self.path, str) else self.path
 
         if _file_path.exists() and _file_path.is_dir():
-            for _file in _file_path.glob("**/*"):
-                if _file.suffix in self.formats:
-                    yield self.reader.read(file=_file)
+            return [_file for _file in _file_path.glob("**/*") if _file.suffix in self.formats]
         elif _file_path.exists() and _file_path.is_file() and _file_path.suffix in self.formats:
-            yield self.reader.read(file=_file_path)
+            return [_file_path]
+        return []
+
+    def read_file(self, file: Path) -> List[Document]:
+        return self.reader.read(file=file)
@@ -19,10 +19,17 @@ class JSONKnowledgeBase(AgentKnowledge):
             Iterator[List[Document]]: Iterator yielding list of documents
         """
 
+        for _json in self.get_files():
+            yield self.read_file(_json)
+
+    def get_files(self) -> List[Path]:
         _json_path: Path = Path(self.path) if isinstance(self.path, str) else self.path
 
         if _json_path.exists() and _json_path.is_dir():
-            for _pdf in _json_path.glob("*.json"):
-                yield self.reader.read(path=_pdf)
+            return list(_json_path.glob("*.json"))
         elif _json_path.exists() and _json_path.is_file() and _json_path.suffix == ".json":
-            yield self.reader.read(path=_json_path)
+            return [_json_path]
+        return []
+
+    def read_file(self, file: Path) -> List[Document]:
+        return self.reader.read(path=file)
@@ -0,0 +1,182 @@
+import json
+import sqlite3
+from dataclasses import dataclass, field
+from hashlib import md5
+from pathlib import Path
+from threading import Lock
+from typing import Dict, List, Optional, Set, Tuple
+
+from phi.utils.log import logger
+
+
+@dataclass
+class ManifestEntry:
+    """A file loaded into a knowledge base"""
+
+    path: str
+    mtime: float
+    size: int
+    content_hash: str
+    # Names of the documents read from the file, used to delete them when the file changes
+    document_names: List[str] = field(default_factory=list)
+
+
+def get_file_hash(file: Path) -> str:
+    """Returns the md5 hash of the file contents"""
+    file_hash = md5()
+    with file.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def get_manifest_entry(file: Path) -> ManifestEntry:
+    stat = file.stat()
+    return ManifestEntry(
+        path=str(file.resolve()), mtime=stat.st_mtime, size=stat.st_size, content_hash=get_file_hash(file)
+    )
+
+
+class KnowledgeManifest:
+    """Records the files loaded into a knowledge base in a sqlite database, so only changed files are loaded again.
+
+    A file is considered unchanged if its mtime and size match the manifest, and is only hashed otherwise.
+    """
+
+    def __init__(self, db_file: str, knowledge_base: str, table_name: str = "knowledge_manifest"):
+        self.db_file: str = db_file
+        # Key of the knowledge base, one manifest database can track many knowledge bases
+        self.knowledge_base: str = knowledge_base
+        self.table_name: str = table_name
+        self._lock = Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            db_path = Path(self.db_file).resolve()
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            logger.debug(f"Opening knowledge manifest: {db_path}")
+            self._connection = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table_name} ("
+                "knowledge_base TEXT NOT NULL, "
+                "path TEXT NOT NULL, "
+                "mtime REAL NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "content_hash TEXT NOT NULL, "
+                "document_names TEXT NOT NULL, "
+                "PRIMARY KEY (knowledge_base, path))"
+            )
+            self._connection.commit()
+        return self._connection
+
+    def read(self) -> Dict[str, ManifestEntry]:
+        """Returns the manifest entries of the knowledge base, keyed by path"""
+        with self._lock:
+            rows = self.connection.execute(
+                f"SELECT path, mtime, size, content_hash, document_names FROM {self.table_name} "
+                "WHERE knowledge_base = ?",
+                (self.knowledge_base,),
+            ).fetchall()
+        return {
+            path: ManifestEntry(
+                path=path, mtime=mtime, size=size, content_hash=content_hash, document_names=json.loads(names)
+            )
+            for path, mtime, size, content_hash, names in rows
+        }
+
+    def upsert(self, entries: List[ManifestEntry]) -> None:
+        if len(entries) == 0:
+            return
+        with self._lock:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO {self.table_name} "
+                "(knowledge_base, path, mtime, size, content_hash, document_names) VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        self.knowledge_base,
+                        entry.path,
+                        entry.mtime,
+                        entry.size,
+                        entry.content_hash,
+                        json.dumps(entry.document_names),
+                    )
+                    for entry in entries
+                ],
+            )
+            self.connection.commit()
+
+    def delete(self, paths: List[str]) -> None:
+        if len(paths) == 0:
+            return
+        with self._lock:
+            self.connection.executemany(
+                f"DELETE FROM {self.table_name} WHERE knowledge_base = ? AND path = ?",
+                [(self.knowledge_base, path) for path in paths],
+            )
+            self.connection.commit()
+
+    def clear(self) -> None:
+        """Removes all entries of the knowledge base"""
+        with self._lock:
+            self.connection.execute(f"DELETE FROM {self.table_name} WHERE knowledge_base = ?", (self.knowledge_base,))
+            self.connection.commit()
+
+    def plan(
+        self, files: List[Path]
+    ) -> Tuple[Dict[str, Tuple[Path, ManifestEntry]], List[ManifestEntry], Dict[str, List[str]]]:
+        """Compares the files with the manifest
+
+        Args:
+            files (List[Path]): The files currently in the knowledge base.
+
+        Returns:
+            The files to read keyed by path, the entries of removed files,
+            and the names of the documents to delete before reading, keyed by the path of the file they were read from.
+        """
+        entries = self.read()
+        current_paths: Set[str] = set()
+        to_read: Dict[str, Tuple[Path, ManifestEntry]] = {}
+        touched: List[ManifestEntry] = []
+        for file in files:
+            path = str(file.resolve())
+            current_paths.add(path)
+            entry = entries.get(path)
+            stat = file.stat()
+            if entry is not None and entry.mtime == stat.st_mtime and entry.size == stat.st_size:
+                continue
+            new_entry = get_manifest_entry(file)
+            if entry is not None and entry.content_hash == new_entry.content_hash:
+                # Only the metadata changed, the documents are up to date
+                entry.mtime, entry.size = new_entry.mtime, new_entry.size
+                touched.append(entry)
+                continue
+            to_read[path] = (file, new_entry)
+        self.upsert(touched)
+
+        removed = [entry for path, entry in entries.items() if path not in current_paths]
+        names_to_delete: Dict[str, List[str]] = {}
+        for entry in removed:
+            names_to_delete[entry.path] = entry.document_names
+        for path in to_read:
+            if path in entries:
+                names_to_delete[path] = entries[path].document_names
+
+        # Files sharing a document name with a deleted file lose their documents too, so they are read again
+        deleted_names: Set[str] = {name for names in names_to_delete.values() for name in names}
+        for file in files:
+            path = str(file.resolve())
+            entry = entries.get(path)
+            if path in to_read or entry is None:
+                continue
+            if deleted_names.intersection(entry.document_names):
+                to_read[path] = (file, get_manifest_entry(file))
+                names_to_delete[path] = entry.document_names
+
+        return to_read, removed, names_to_delete
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -19,13 +19,20 @@ class PDFKnowledgeBase(AgentKnowledge):
             Iterator[List[Document]]: Iterator yielding list of documents
         """
 
+        for _pdf in self.get_files():
+            yield self.read_file(_pdf)
+
+    def get_files(self) -> List[Path]:
         _pdf_path: Path = Path(self.path) if isinstance(self.path, str) else self.path
 
         if _pdf_path.exists() and _pdf_path.is_dir():
-            for _pdf in _pdf_path.glob("**/*.pdf"):
-                yield self.reader.read(pdf=_pdf)
+            return list(_pdf_path.glob("**/*.pdf"))
         elif _pdf_path.exists() and _pdf_path.is_file() and _pdf_path.suffix == ".pdf":
-            yield self.reader.read(pdf=_pdf_path)
+            return [_pdf_path]
+        return []
+
+    def read_file(self, file: Path) -> List[Document]:
+        return self.reader.read(pdf=file)
 
 
 class PDFUrlKnowledgeBase(AgentKnowledge):
@@ -0,0 +1,228 @@
+from dataclasses import dataclass, field
+from queue import Queue
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from phi.document import Document
+from phi.document.base import reuse_embeddings
+from phi.embedder import Embedder
+from phi.utils.log import logger
+from phi.utils.timer import Timer
+from phi.vectordb import VectorDb
+
+# Marks the end of a stage's input queue
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    """Counters for a single stage of the ingestion pipeline"""
+
+    name: str
+    workers: int = 1
+    # Number of document lists processed
+    batches: int = 0
+    # Number of documents produced by the stage
+    documents: int = 0
+    errors: int = 0
+    # Total time spent processing, summed over all workers
+    busy_time: float = 0.0
+    max_latency: float = 0.0
+    _lock: Any = field(default_factory=Lock, repr=False, compare=False)
+
+    def record(self, documents: int, elapsed: float) -> None:
+        with self._lock:
+            self.batches += 1
+            self.documents += documents
+            self.busy_time += elapsed
+            self.max_latency = max(self.max_latency, elapsed)
+
+    @property
+    def avg_latency(self) -> float:
+        return self.busy_time / self.batches if self.batches > 0 else 0.0
+
+    @property
+    def documents_per_second(self) -> float:
+        """Throughput of the stage when all its workers are busy"""
+        return self.documents * self.workers / self.busy_time if self.busy_time > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "batches": self.batches,
+            "documents": self.documents,
+            "errors": self.errors,
+            "busy_time": self.busy_time,
+            "avg_latency": self.avg_latency,
+            "max_latency": self.max_latency,
+            "documents_per_second": self.documents_per_second,
+        }
+
+
+@dataclass
+class PipelineStats:
+    """Counters for a run of the ingestion pipeline"""
+
+    read: StageStats
+    embed: StageStats
+    write: StageStats
+    # Wall clock time of the run
+    elapsed: float = 0.0
+
+    @property
+    def documents_per_second(self) -> float:
+        return self.write.documents / self.elapsed if self.elapsed > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "elapsed": self.elapsed,
+            "documents_per_second": self.documents_per_second,
+            "read": self.read.to_dict(),
+            "embed": self.embed.to_dict(),
+            "write": self.write.to_dict(),
+        }
+
+
+class IngestionPipeline:
+    """Loads document lists into a vector db, overlapping the read, embed and write stages.
+
+    Document lists are read on the calling thread, then embedded and written by pools of worker threads.
+    The stages are connected by bounded queues, so a slow stage applies backpressure to the ones before it.
+    """
+
+    def __init__(
+        self,
+        vector_db: VectorDb,
+        embed_workers: int = 2,
+        write_workers: int = 1,
+        queue_size: int = 4,
+    ):
+        self.vector_db: VectorDb = vector_db
+        self.embed_workers: int = max(1, embed_workers)
+        self.write_workers: int = max(1, write_workers)
+        self.queue_size: int = max(1, queue_size)
+        # Documents are embedded by the pipeline if the vector db exposes its embedder
+        self.embedder: Optional[Embedder] = getattr(vector_db, "embedder", None)
+        self.error: Optional[BaseException] = None
+
+    def run(
+        self,
+        document_lists: Iterator[List[Document]],
+        upsert: bool = False,
+        skip_existing: bool = True,
+        filters: Optional[Dict[str, Any]] = None,
+    ) -> PipelineStats:
+        """Load the document lists into the vector db
+
+        Args:
+            document_lists (Iterator[List[Document]]): Iterator yielding lists of documents.
+            upsert (bool): If True, upserts documents instead of inserting them. Defaults to False.
+            skip_existing (bool): If True, skips documents which already exist in the vector db. Defaults to True.
+            filters (Optional[Dict[str, Any]]): Filters to add to each row. Defaults to None.
+
+        Returns:
+            PipelineStats: Counters for the run.
+        """
+        stats = PipelineStats(
+            read=StageStats(name="read"),
+            embed=StageStats(name="embed", workers=self.embed_workers),
+            write=StageStats(name="write", workers=self.write_workers),
+        )
+        self.error = None
+        embed_queue: Queue = Queue(maxsize=self.queue_size)
+        write_queue: Queue = Queue(maxsize=self.queue_size)
+
+        def _embed(documents: List[Document]) -> List[Document]:
+            if skip_existing:
+                documents = self.vector_db.filter_new_documents(documents)
+            if self.embedder is not None:
+                Document.embed_documents(documents, embedder=self.embedder)
+            return documents
+
+        def _write(documents: List[Document]) -> List[Document]:
+            if len(documents) > 0:
+                # The documents were embedded by the embed stage
+                with reuse_embeddings():
+                    if upsert:
+                        self.vector_db.upsert(documents=documents, filters=filters)
+                    else:
+                        self.vector_db.insert(documents=documents, filters=filters)
+                logger.info(f"Added {len(documents)} documents to knowledge base")
+            return documents
+
+        embed_threads = self._start_workers(_embed, embed_queue, write_queue, stats.embed)
+        write_threads = self._start_workers(_write, write_queue, None, stats.write)
+
+        run_timer = Timer()
+        run_timer.start()
+        document_lists_iterator = iter(document_lists)
+        try:
+            while self.error is None:
+                read_timer = Timer()
+                read_timer.start()
+                document_list = next(document_lists_iterator, None)
+                read_timer.stop()
+                if document_list is None:
+                    break
+                stats.read.record(len(document_list), read_timer.elapsed)
+                embed_queue.put(document_list)
+        except Exception as e:
+            stats.read.errors += 1
+            self._set_error(e)
+        finally:
+            for _ in embed_threads:
+                embed_queue.put(_DONE)
+            for thread in embed_threads:
+                thread.join()
+            for _ in write_threads:
+                write_queue.put(_DONE)
+            for thread in write_threads:
+                thread.join()
+            run_timer.stop()
+            stats.elapsed = run_timer.elapsed
+
+        logger.debug(f"Ingestion pipeline stats: {stats.to_dict()}")
+        if self.error is not None:
+            raise self.error
+        return stats
+
+    def _start_workers(
+        self,
+        process: Callable[[List[Document]], List[Document]],
+        input_queue: Queue,
+        output_queue: Optional[Queue],
+        stage_stats: StageStats,
+    ) -> List[Thread]:
+        def _worker() -> None:
+            while True:
+                documents = input_queue.get()
+                if documents is _DONE:
+                    return
+                # After an error, keep draining the queue so earlier stages are not blocked
+                if self.error is not None:
+                    continue
+                try:
+                    timer = Timer()
+                    timer.start()
+                    result = process(documents)
+                    timer.stop()
+                    stage_stats.record(len(result), timer.elapsed)
+                    if output_queue is not None:
+                        output_queue.put(result)
+                except Exception as e:
+                    with stage_stats._lock:
+                        stage_stats.errors += 1
+                    self._set_error(e)
+
+        threads = [
+            Thread(target=_worker, name=f"phi-ingest-{stage_stats.name}-{i}", daemon=True)
+            for i in range(stage_stats.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        return threads
+
+    def _set_error(self, error: BaseException) -> None:
+        if self.error is None:
+            logger.error(f"Error loading knowledge base: {error}")
+            self.error = error
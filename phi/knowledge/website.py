@@ -71,17 +71,27 @@ class WebsiteKnowledgeBase(AgentKnowledge):
                     logger.debug(f"Skipping {url} as it exists in the vector db")
                     urls_to_read.remove(url)
 
-        for url in urls_to_read:
-            document_list = self.reader.read(url=url)
-            # Filter out documents which already exist in the vector db
-            if not recreate:
-                document_list = [document for document in document_list if not self.vector_db.doc_exists(document)]
-            if upsert and self.vector_db.upsert_available():
-                self.vector_db.upsert(documents=document_list, filters=filters)
-            else:
-                self.vector_db.insert(documents=document_list, filters=filters)
-            num_documents += len(document_list)
-            logger.info(f"Loaded {num_documents} documents to knowledge base")
+        if self.pipelined_load:
+            reader = self.reader
+            stats = self.run_pipeline(
+                (reader.read(url=url) for url in urls_to_read),
+                upsert=upsert and self.vector_db.upsert_available(),
+                skip_existing=not recreate,
+                filters=filters,
+            )
+            num_documents = stats.write.documents if stats is not None else 0
+        else:
+            for url in urls_to_read:
+                document_list = self.reader.read(url=url)
+                # Filter out documents which already exist in the vector db
+                if not recreate:
+                    document_list = self.vector_db.filter_new_documents(document_list)
+                if upsert and self.vector_db.upsert_available():
+                    self.vector_db.upsert(documents=document_list, filters=filters)
+                else:
+                    self.vector_db.insert(documents=document_list, filters=filters)
+                num_documents += len(document_list)
+                logger.info(f"Loaded {num_documents} documents to knowledge base")
 
         if self.optimize_on is not None and num_documents > self.optimize_on:
             logger.debug("Optimizing Vector DB")
@@ -34,6 +34,8 @@ class AgentMemory(BaseModel):
     # List of messages sent to the model
     messages: List[Message] = []
     update_system_message_on_change: bool = False
+    # Offsets of the first run and message in the storage run log, set when the runs are read from storage
+    log_offsets: Optional[Dict[str, int]] = None
 
     # Create and store session summaries
     create_session_summary: bool = False
@@ -68,14 +70,16 @@ class AgentMemory(BaseModel):
         _memory_dict = self.model_dump(
             exclude_none=True,
             exclude={
-                "summary",
-                "summarizer",
-                "db",
-                "updating_memory",
-                "memories",
-                "classifier",
-                "manager",
-                "retrieval",
+                "summary": True,
+                "summarizer": True,
+                "db": True,
+                "updating_memory": True,
+                "memories": True,
+                "classifier": True,
+                "manager": True,
+                "retrieval": True,
+                # Spans are only kept on the RunResponse, not in storage
+                "runs": {"__all__": {"response": {"spans"}}},
             },
         )
         if self.summary:
@@ -354,6 +358,7 @@ class AgentMemory(BaseModel):
 
         self.runs = []
         self.messages = []
+        self.log_offsets = None
         self.summary = None
         self.memories = None
 
@@ -362,3 +367,34 @@ class AgentMemory(BaseModel):
         # clear the new memory to remove any references to the old memory
         new_memory.clear()
         return new_memory
+
+    def shallow_copy(self, *, update: Optional[Dict[str, Any]] = None) -> "AgentMemory":
+        """Copy the AgentMemory for a new run, sharing the MemoryDb with this AgentMemory"""
+        new_memory = self.model_copy(update=update)
+        # clear the new memory to remove any references to the old memory
+        new_memory.clear()
+        # The summarizer, classifier and manager keep state from the last run, so the copy gets its own
+        if new_memory.summarizer is not None:
+            new_memory.summarizer = new_memory.summarizer.model_copy(
+                update={"model": new_memory.summarizer.model.shallow_copy() if new_memory.summarizer.model else None}
+            )
+        if new_memory.classifier is not None:
+            new_memory.classifier = new_memory.classifier.model_copy(
+                update={"model": new_memory.classifier.model.shallow_copy() if new_memory.classifier.model else None}
+            )
+        if new_memory.manager is not None:
+            new_memory.manager = new_memory.manager.model_copy(
+                update={"model": new_memory.manager.model.shallow_copy() if new_memory.manager.model else None}
+            )
+        return new_memory
+
+    def snapshot(self) -> "AgentMemory":
+        """Copy the AgentMemory to update it after a run in the background, while this AgentMemory is used for
+        the next run. The copy shares the MemoryDb and the runs and messages with this AgentMemory."""
+        new_memory = self.shallow_copy()
+        new_memory.runs = list(self.runs)
+        new_memory.messages = list(self.messages)
+        new_memory.log_offsets = self.log_offsets
+        new_memory.summary = self.summary
+        new_memory.memories = list(self.memories) if self.memories is not None else None
+        return new_memory
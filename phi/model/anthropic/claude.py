@@ -6,6 +6,7 @@ from phi.model.base import Model
 from phi.model.message import Message
 from phi.model.response import ModelResponse
 from phi.tools.function import FunctionCall
+from phi.utils.client_pool import client_pool
 from phi.utils.log import logger
 from phi.utils.timer import Timer
 from phi.utils.tools import (
@@ -112,7 +113,7 @@ class Claude(Model):
             _client_params["api_key"] = self.api_key
         if self.client_params:
             _client_params.update(self.client_params)
-        return AnthropicClient(**_client_params)
+        return client_pool.get_client(AnthropicClient, _client_params)
 
     @property
     def request_kwargs(self) -> Dict[str, Any]:
@@ -1,5 +1,6 @@
 from os import getenv
 from typing import Optional, Dict, Any
+from phi.utils.client_pool import client_pool
 from phi.utils.log import logger
 from phi.model.openai.like import OpenAILike
 import httpx
@@ -57,7 +58,7 @@ class AzureOpenAIChat(OpenAILike):
 
         _client_params: Dict[str, Any] = self.get_client_params()
 
-        return AzureOpenAIClient(**_client_params)
+        return client_pool.get_client(AzureOpenAIClient, _client_params)
 
     def get_async_client(self) -> AsyncAzureOpenAIClient:
         """
@@ -71,12 +72,14 @@ class AzureOpenAIChat(OpenAILike):
 
         if self.http_client:
             _client_params["http_client"] = self.http_client
-        else:
+            return client_pool.get_async_client(AsyncAzureOpenAIClient, _client_params)
+
+        def create_async_client() -> AsyncAzureOpenAIClient:
             # Create a new async HTTP client with custom limits
-            _client_params["http_client"] = httpx.AsyncClient(
-                limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100)
-            )
-        return AsyncAzureOpenAIClient(**_client_params)
+            http_client = httpx.AsyncClient(limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100))
+            return AsyncAzureOpenAIClient(**{**_client_params, "http_client": http_client})
+
+        return client_pool.get_async_client(AsyncAzureOpenAIClient, _client_params, create=create_async_client)
 
     def get_client_params(self) -> Dict[str, Any]:
         _client_params: Dict[str, Any] = {}
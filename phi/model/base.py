@@ -1,4 +1,4 @@
-from typing import List, Iterator, Optional, Dict, Any, Callable, Union
+from typing import List, Iterator, AsyncIterator, Optional, Dict, Any, Callable, Tuple, Union
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator, ValidationInfo
 
@@ -7,6 +7,7 @@ from phi.model.response import ModelResponse, ModelResponseEvent
 from phi.tools import Tool, Toolkit
 from phi.tools.function import Function, FunctionCall
 from phi.utils.log import logger
+from phi.utils.tracing import span
 from phi.utils.timer import Timer
 
 
@@ -39,6 +40,11 @@ class Model(BaseModel):
     show_tool_calls: Optional[bool] = None
     # Maximum number of tool calls allowed.
     tool_call_limit: Optional[int] = None
+    # If True, runs multiple tool calls from the same response concurrently.
+    # Functions marked with thread_safe=False are always run one at a time.
+    concurrent_tool_calls: bool = False
+    # Maximum number of tool calls to run at the same time.
+    max_concurrent_tool_calls: int = 8
 
     # -*- Functions available to the Model to call -*-
     # Functions extracted from the tools.
@@ -145,6 +151,8 @@ class Model(BaseModel):
                     if name not in self.functions:
                         if structured_outputs and self.supports_structured_outputs:
                             func.strict = True
+                        if not tool.thread_safe:
+                            func.thread_safe = False
                         self.functions[name] = func
                         self.tools.append({"type": "function", "function": func.to_dict()})
                         logger.debug(f"Function {name} from {tool.name} added to model.")
@@ -175,72 +183,237 @@ class Model(BaseModel):
         # This is triggered when the function call limit is reached.
         self.tool_choice = "none"
 
+    def _get_function_call_started_response(self, function_call: FunctionCall, tool_role: str) -> ModelResponse:
+        return ModelResponse(
+            content=function_call.get_call_str(),
+            tool_call={
+                "role": tool_role,
+                "tool_call_id": function_call.call_id,
+                "tool_name": function_call.function.name,
+                "tool_args": function_call.arguments,
+            },
+            event=ModelResponseEvent.tool_call_started.value,
+        )
+
+    def _complete_function_call(
+        self,
+        function_call: FunctionCall,
+        function_call_success: bool,
+        elapsed: float,
+        function_call_results: List[Message],
+        tool_role: str,
+    ) -> ModelResponse:
+        """Records the result and metrics of a function call and returns the tool_call_completed response."""
+        if self.function_call_stack is None:
+            self.function_call_stack = []
+
+        _function_call_result = Message(
+            role=tool_role,
+            content=function_call.result if function_call_success else function_call.error,
+            tool_call_id=function_call.call_id,
+            tool_name=function_call.function.name,
+            tool_args=function_call.arguments,
+            tool_call_error=not function_call_success,
+            metrics={"time": elapsed},
+        )
+
+        # Add metrics to the model
+        if "tool_call_times" not in self.metrics:
+            self.metrics["tool_call_times"] = {}
+        if function_call.function.name not in self.metrics["tool_call_times"]:
+            self.metrics["tool_call_times"][function_call.function.name] = []
+        self.metrics["tool_call_times"][function_call.function.name].append(elapsed)
+
+        # Add the function call result to the function call results
+        function_call_results.append(_function_call_result)
+        self.function_call_stack.append(function_call)
+
+        return ModelResponse(
+            content=f"{function_call.get_call_str()} completed in {elapsed:.4f}s.",
+            tool_call=_function_call_result.model_dump(
+                include={
+                    "content",
+                    "tool_call_id",
+                    "tool_name",
+                    "tool_args",
+                    "tool_call_error",
+                    "metrics",
+                    "created_at",
+                }
+            ),
+            event=ModelResponseEvent.tool_call_completed.value,
+        )
+
+    def _tool_call_limit_reached(self) -> bool:
+        return bool(
+            self.tool_call_limit
+            and self.function_call_stack is not None
+            and len(self.function_call_stack) >= self.tool_call_limit
+        )
+
+    def _limit_function_calls(self, function_calls: List[FunctionCall]) -> List[FunctionCall]:
+        """Returns the function calls that can run before the tool call limit is reached.
+        At least one function call is run, matching the sequential behaviour."""
+        if not self.tool_call_limit:
+            return function_calls
+        num_function_calls_run = len(self.function_call_stack) if self.function_call_stack is not None else 0
+        return function_calls[: max(self.tool_call_limit - num_function_calls_run, 1)]
+
+    def _run_concurrently(self, function_calls: List[FunctionCall]) -> bool:
+        return self.concurrent_tool_calls and len(function_calls) > 1
+
+    @staticmethod
+    def _execute_function_call(function_call: FunctionCall) -> Tuple[bool, float]:
+        _function_call_timer = Timer()
+        _function_call_timer.start()
+        with span("tool_call", tool=function_call.function.name):
+            function_call_success = function_call.execute()
+        _function_call_timer.stop()
+        return function_call_success, _function_call_timer.elapsed
+
+    @staticmethod
+    async def _aexecute_function_call(function_call: FunctionCall) -> Tuple[bool, float]:
+        _function_call_timer = Timer()
+        _function_call_timer.start()
+        with span("tool_call", tool=function_call.function.name):
+            function_call_success = await function_call.aexecute()
+        _function_call_timer.stop()
+        return function_call_success, _function_call_timer.elapsed
+
     def run_function_calls(
         self, function_calls: List[FunctionCall], function_call_results: List[Message], tool_role: str = "tool"
     ) -> Iterator[ModelResponse]:
-        for function_call in function_calls:
-            if self.function_call_stack is None:
-                self.function_call_stack = []
+        if self.function_call_stack is None:
+            self.function_call_stack = []
 
+        if self._run_concurrently(function_calls):
+            yield from self._run_function_calls_concurrently(function_calls, function_call_results, tool_role)
+            return
+
+        for function_call in function_calls:
             # -*- Start function call
-            _function_call_timer = Timer()
-            _function_call_timer.start()
-            yield ModelResponse(
-                content=function_call.get_call_str(),
-                tool_call={
-                    "role": tool_role,
-                    "tool_call_id": function_call.call_id,
-                    "tool_name": function_call.function.name,
-                    "tool_args": function_call.arguments,
-                },
-                event=ModelResponseEvent.tool_call_started.value,
-            )
+            yield self._get_function_call_started_response(function_call, tool_role)
 
             # -*- Run function call
-            function_call_success = function_call.execute()
-            _function_call_timer.stop()
-
-            _function_call_result = Message(
-                role=tool_role,
-                content=function_call.result if function_call_success else function_call.error,
-                tool_call_id=function_call.call_id,
-                tool_name=function_call.function.name,
-                tool_args=function_call.arguments,
-                tool_call_error=not function_call_success,
-                metrics={"time": _function_call_timer.elapsed},
+            function_call_success, elapsed = self._execute_function_call(function_call)
+            yield self._complete_function_call(
+                function_call, function_call_success, elapsed, function_call_results, tool_role
             )
-            yield ModelResponse(
-                content=f"{function_call.get_call_str()} completed in {_function_call_timer.elapsed:.4f}s.",
-                tool_call=_function_call_result.model_dump(
-                    include={
-                        "content",
-                        "tool_call_id",
-                        "tool_name",
-                        "tool_args",
-                        "tool_call_error",
-                        "metrics",
-                        "created_at",
-                    }
-                ),
-                event=ModelResponseEvent.tool_call_completed.value,
-            )
-
-            # Add metrics to the model
-            if "tool_call_times" not in self.metrics:
-                self.metrics["tool_call_times"] = {}
-            if function_call.function.name not in self.metrics["tool_call_times"]:
-                self.metrics["tool_call_times"][function_call.function.name] = []
-            self.metrics["tool_call_times"][function_call.function.name].append(_function_call_timer.elapsed)
-
-            # Add the function call result to the function call results
-            function_call_results.append(_function_call_result)
-            self.function_call_stack.append(function_call)
 
             # -*- Check function call limit
-            if self.tool_call_limit and len(self.function_call_stack) >= self.tool_call_limit:
+            if self._tool_call_limit_reached():
                 self.deactivate_function_calls()
                 break  # Exit early if we reach the function call limit
 
+    def _run_function_calls_concurrently(
+        self, function_calls: List[FunctionCall], function_call_results: List[Message], tool_role: str
+    ) -> Iterator[ModelResponse]:
+        """Runs function calls on a bounded thread pool and yields the results in the original call order."""
+        from concurrent.futures import ThreadPoolExecutor, Future
+        from contextvars import copy_context
+
+        function_calls = self._limit_function_calls(function_calls)
+
+        # -*- Start function calls
+        for function_call in function_calls:
+            yield self._get_function_call_started_response(function_call, tool_role)
+
+        # -*- Run function calls
+        outcomes: List[Tuple[bool, float]] = [(False, 0.0)] * len(function_calls)
+        max_workers = max(min(self.max_concurrent_tool_calls, len(function_calls)), 1)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="phi-tool") as executor:
+            # Each function call runs in a copy of the current context, so it is traced in the current run
+            futures: Dict[int, Future] = {
+                index: executor.submit(copy_context().run, self._execute_function_call, function_call)
+                for index, function_call in enumerate(function_calls)
+                if function_call.function.thread_safe
+            }
+            # Functions that are not thread safe run one at a time on the calling thread
+            for index, function_call in enumerate(function_calls):
+                if index not in futures:
+                    outcomes[index] = self._execute_function_call(function_call)
+            for index, future in futures.items():
+                outcomes[index] = future.result()
+
+        # -*- Complete function calls in the original order
+        for function_call, (function_call_success, elapsed) in zip(function_calls, outcomes):
+            yield self._complete_function_call(
+                function_call, function_call_success, elapsed, function_call_results, tool_role
+            )
+
+        # -*- Check function call limit
+        if self._tool_call_limit_reached():
+            self.deactivate_function_calls()
+
+    async def arun_function_calls(
+        self, function_calls: List[FunctionCall], function_call_results: List[Message], tool_role: str = "tool"
+    ) -> AsyncIterator[ModelResponse]:
+        """Async version of run_function_calls.
+
+        Coroutine functions are awaited and other functions run in a worker thread, so tool calls never block
+        the event loop.
+        """
+        if self.function_call_stack is None:
+            self.function_call_stack = []
+
+        if not self._run_concurrently(function_calls):
+            for function_call in function_calls:
+                # -*- Start function call
+                yield self._get_function_call_started_response(function_call, tool_role)
+
+                # -*- Run function call
+                function_call_success, elapsed = await self._aexecute_function_call(function_call)
+                yield self._complete_function_call(
+                    function_call, function_call_success, elapsed, function_call_results, tool_role
+                )
+
+                # -*- Check function call limit
+                if self._tool_call_limit_reached():
+                    self.deactivate_function_calls()
+                    break  # Exit early if we reach the function call limit
+            return
+
+        import asyncio
+
+        function_calls = self._limit_function_calls(function_calls)
+
+        # -*- Start function calls
+        for function_call in function_calls:
+            yield self._get_function_call_started_response(function_call, tool_role)
+
+        # -*- Run function calls
+        outcomes: List[Tuple[bool, float]] = [(False, 0.0)] * len(function_calls)
+        semaphore = asyncio.Semaphore(max(self.max_concurrent_tool_calls, 1))
+
+        async def _run_function_call(index: int) -> None:
+            async with semaphore:
+                outcomes[index] = await self._aexecute_function_call(function_calls[index])
+
+        async def _run_function_calls_not_thread_safe() -> None:
+            # Functions that are not thread safe run one at a time
+            for index, function_call in enumerate(function_calls):
+                if not function_call.function.thread_safe:
+                    outcomes[index] = await self._aexecute_function_call(function_call)
+
+        await asyncio.gather(
+            *[
+                _run_function_call(index)
+                for index, function_call in enumerate(function_calls)
+                if function_call.function.thread_safe
+            ],
+            _run_function_calls_not_thread_safe(),
+        )
+
+        # -*- Complete function calls in the original order
+        for function_call, (function_call_success, elapsed) in zip(function_calls, outcomes):
+            yield self._complete_function_call(
+                function_call, function_call_success, elapsed, function_call_results, tool_role
+            )
+
+        # -*- Check function call limit
+        if self._tool_call_limit_reached():
+            self.deactivate_function_calls()
+
     def get_system_message_for_model(self) -> Optional[str]:
         return self.system_prompt
 
@@ -260,3 +433,13 @@ class Model(BaseModel):
         # Clear the new model to remove any references to the old model
         new_model.clear()
         return new_model
+
+    def shallow_copy(self, *, update: Optional[Dict[str, Any]] = None) -> "Model":
+        """Copy the Model for a new run, sharing the client and configuration with this Model"""
+        new_model = self.model_copy(update=update)
+        # Clear the new model to remove any references to the old model
+        new_model.clear()
+        # Tools are added to the Model when an Agent runs, so the copy gets its own list
+        if new_model.tools is not None:
+            new_model.tools = list(new_model.tools)
+        return new_model
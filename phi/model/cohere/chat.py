@@ -6,6 +6,7 @@ from phi.model.base import Model
 from phi.model.message import Message
 from phi.model.response import ModelResponse
 from phi.tools.function import FunctionCall
+from phi.utils.client_pool import client_pool
 from phi.utils.log import logger
 from phi.utils.timer import Timer
 from phi.utils.tools import get_function_call_for_tool_call
@@ -74,7 +75,7 @@ class CohereChat(Model):
         _client_params: Dict[str, Any] = {}
         if self.api_key:
             _client_params["api_key"] = self.api_key
-        return CohereClient(**_client_params)
+        return client_pool.get_client(CohereClient, _client_params)
 
     @property
     def request_kwargs(self) -> Dict[str, Any]:
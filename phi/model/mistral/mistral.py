@@ -5,6 +5,7 @@ from phi.model.base import Model
 from phi.model.message import Message
 from phi.model.response import ModelResponse
 from phi.tools.function import FunctionCall
+from phi.utils.client_pool import client_pool
 from phi.utils.log import logger
 from phi.utils.timer import Timer
 from phi.utils.tools import get_function_call_for_tool_call
@@ -102,7 +103,7 @@ class MistralChat(Model):
             _client_params["timeout"] = self.timeout
         if self.client_params:
             _client_params.update(self.client_params)
-        return Mistral(**_client_params)
+        return client_pool.get_client(Mistral, _client_params)
 
     @property
     def api_kwargs(self) -> Dict[str, Any]:
@@ -1,12 +1,13 @@
 import json
 
 from dataclasses import dataclass, field
-from typing import Optional, List, Iterator, Dict, Any, Mapping, Union, Tuple
+from typing import Optional, List, Iterator, AsyncIterator, Dict, Any, Mapping, Union, Tuple
 
 from phi.model.base import Model
 from phi.model.message import Message
 from phi.model.response import ModelResponse
 from phi.tools.function import FunctionCall
+from phi.utils.client_pool import client_pool
 from phi.utils.log import logger
 from phi.utils.timer import Timer
 from phi.utils.tools import get_function_call_for_tool_call
@@ -108,7 +109,7 @@ class Ollama(Model):
         if self.client is not None:
             return self.client
 
-        return OllamaClient(**self.get_client_params())
+        return client_pool.get_client(OllamaClient, self.get_client_params())
 
     def get_async_client(self) -> AsyncOllamaClient:
         """
@@ -120,7 +121,7 @@ class Ollama(Model):
         if self.async_client is not None:
             return self.async_client
 
-        return AsyncOllamaClient(**self.get_client_params())
+        return client_pool.get_async_client(AsyncOllamaClient, self.get_client_params())
 
     @property
     def request_kwargs(self) -> Dict[str, Any]:
@@ -247,6 +248,49 @@ class Ollama(Model):
         async for chunk in async_stream:  # type: ignore
             yield chunk
 
+    def _get_tool_calls_content(self, assistant_message: Message) -> str:
+        """
+        Get the content of an assistant message with tool calls, shown before the tool calls are run.
+
+        Args:
+            assistant_message (Message): The assistant message.
+
+        Returns:
+            str: The content of the assistant message.
+        """
+        return assistant_message.get_content_string()
+
+    def _prepare_tool_calls(
+        self,
+        assistant_message: Message,
+        messages: List[Message],
+        model_response: ModelResponse,
+    ) -> List[FunctionCall]:
+        """
+        Set the model response content for the tool calls in the assistant message and get the function calls to run.
+
+        Args:
+            assistant_message (Message): The assistant message.
+            messages (List[Message]): The list of messages.
+            model_response (ModelResponse): The model response.
+
+        Returns:
+            List[FunctionCall]: The function calls to run.
+        """
+        model_response.content = self._get_tool_calls_content(assistant_message)
+        model_response.content += "\n\n"
+        function_calls_to_run = self._get_function_calls_to_run(assistant_message, messages)
+
+        if self.show_tool_calls:
+            if len(function_calls_to_run) == 1:
+                model_response.content += f" - Running: {function_calls_to_run[0].get_call_str()}\n\n"
+            elif len(function_calls_to_run) > 1:
+                model_response.content += "Running:"
+                for _f in function_calls_to_run:
+                    model_response.content += f"\n - {_f.get_call_str()}"
+                model_response.content += "\n\n"
+        return function_calls_to_run
+
     def _handle_tool_calls(
         self,
         assistant_message: Message,
@@ -265,20 +309,9 @@ class Ollama(Model):
             Optional[ModelResponse]: The model response.
         """
         if assistant_message.tool_calls is not None and len(assistant_message.tool_calls) > 0 and self.run_tools:
-            model_response.content = assistant_message.get_content_string()
-            model_response.content += "\n\n"
-            function_calls_to_run = self._get_function_calls_to_run(assistant_message, messages)
+            function_calls_to_run = self._prepare_tool_calls(assistant_message, messages, model_response)
             function_call_results: List[Message] = []
 
-            if self.show_tool_calls:
-                if len(function_calls_to_run) == 1:
-                    model_response.content += f" - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                elif len(function_calls_to_run) > 1:
-                    model_response.content += "Running:"
-                    for _f in function_calls_to_run:
-                        model_response.content += f"\n - {_f.get_call_str()}"
-                    model_response.content += "\n\n"
-
             for _ in self.run_function_calls(
                 function_calls=function_calls_to_run,
                 function_call_results=function_call_results,
@@ -290,6 +323,38 @@ class Ollama(Model):
             return model_response
         return None
 
+    async def _ahandle_tool_calls(
+        self,
+        assistant_message: Message,
+        messages: List[Message],
+        model_response: ModelResponse,
+    ) -> Optional[ModelResponse]:
+        """
+        Handle tool calls in the assistant message without blocking the event loop.
+
+        Args:
+            assistant_message (Message): The assistant message.
+            messages (List[Message]): The list of messages.
+            model_response (ModelResponse): The model response.
+
+        Returns:
+            Optional[ModelResponse]: The model response.
+        """
+        if assistant_message.tool_calls is not None and len(assistant_message.tool_calls) > 0 and self.run_tools:
+            function_calls_to_run = self._prepare_tool_calls(assistant_message, messages, model_response)
+            function_call_results: List[Message] = []
+
+            async for _ in self.arun_function_calls(
+                function_calls=function_calls_to_run,
+                function_call_results=function_call_results,
+            ):
+                pass
+
+            self._format_function_call_results(function_call_results, messages)
+
+            return model_response
+        return None
+
     def _update_usage_metrics(
         self,
         assistant_message: Message,
@@ -480,7 +545,7 @@ class Ollama(Model):
         metrics.log()
 
         # -*- Handle tool calls
-        if self._handle_tool_calls(assistant_message, messages, model_response):
+        if await self._ahandle_tool_calls(assistant_message, messages, model_response):
             response_after_tool_calls = await self.aresponse(messages=messages)
             if response_after_tool_calls.content is not None:
                 if model_response.content is None:
@@ -531,6 +596,42 @@ class Ollama(Model):
 
             self._format_function_call_results(function_call_results, messages)
 
+    async def _ahandle_stream_tool_calls(
+        self,
+        assistant_message: Message,
+        messages: List[Message],
+    ) -> AsyncIterator[ModelResponse]:
+        """
+        Handle tool calls for async response stream without blocking the event loop.
+
+        Args:
+            assistant_message (Message): The assistant message.
+            messages (List[Message]): The list of messages.
+
+        Returns:
+            AsyncIterator[ModelResponse]: An async iterator of the model response.
+        """
+        if assistant_message.tool_calls is not None and len(assistant_message.tool_calls) > 0 and self.run_tools:
+            yield ModelResponse(content="\n\n")
+            function_calls_to_run = self._get_function_calls_to_run(assistant_message, messages)
+            function_call_results: List[Message] = []
+
+            if self.show_tool_calls:
+                if len(function_calls_to_run) == 1:
+                    yield ModelResponse(content=f" - Running: {function_calls_to_run[0].get_call_str()}\n\n")
+                elif len(function_calls_to_run) > 1:
+                    yield ModelResponse(content="Running:")
+                    for _f in function_calls_to_run:
+                        yield ModelResponse(content=f"\n - {_f.get_call_str()}")
+                    yield ModelResponse(content="\n\n")
+
+            async for intermediate_model_response in self.arun_function_calls(
+                function_calls=function_calls_to_run, function_call_results=function_call_results
+            ):
+                yield intermediate_model_response
+
+            self._format_function_call_results(function_call_results, messages)
+
     def _handle_tool_call_chunk(self, content, tool_call_buffer, message_data) -> Tuple[str, bool]:
         """
         Handle a tool call chunk for response stream.
@@ -717,7 +818,7 @@ class Ollama(Model):
 
         # -*- Handle tool calls
         if assistant_message.tool_calls is not None and len(assistant_message.tool_calls) > 0 and self.run_tools:
-            for model_response in self._handle_stream_tool_calls(assistant_message, messages):
+            async for model_response in self._ahandle_stream_tool_calls(assistant_message, messages):
                 yield model_response
             async for model_response in self.aresponse_stream(messages=messages):
                 yield model_response
@@ -224,7 +224,7 @@ class Hermes(Ollama):
 
         # -*- Handle tool calls
         if assistant_message.tool_calls is not None and len(assistant_message.tool_calls) > 0 and self.run_tools:
-            for model_response in self._handle_stream_tool_calls(assistant_message, messages):
+            async for model_response in self._ahandle_stream_tool_calls(assistant_message, messages):
                 yield model_response
             async for model_response in self.aresponse_stream(messages=messages):
                 yield model_response
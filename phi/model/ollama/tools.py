@@ -140,48 +140,17 @@ class OllamaTools(Ollama):
                 )
                 messages.append(_fc_message)
 
-    def _handle_tool_calls(
-        self,
-        assistant_message: Message,
-        messages: List[Message],
-        model_response: ModelResponse,
-    ) -> Optional[ModelResponse]:
+    def _get_tool_calls_content(self, assistant_message: Message) -> str:
         """
-        Handle tool calls in the assistant message.
+        Get the content of an assistant message with tool calls, without the tool calls.
 
         Args:
             assistant_message (Message): The assistant message.
-            messages (List[Message]): The list of messages.
-            model_response (ModelResponse): The model response.
 
         Returns:
-            Optional[ModelResponse]: The model response.
+            str: The content of the assistant message.
         """
-        if assistant_message.tool_calls is not None and len(assistant_message.tool_calls) > 0 and self.run_tools:
-            model_response.content = str(remove_tool_calls_from_string(assistant_message.get_content_string()))
-            model_response.content += "\n\n"
-            function_calls_to_run = self._get_function_calls_to_run(assistant_message, messages)
-            function_call_results: List[Message] = []
-
-            if self.show_tool_calls:
-                if len(function_calls_to_run) == 1:
-                    model_response.content += f" - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                elif len(function_calls_to_run) > 1:
-                    model_response.content += "Running:"
-                    for _f in function_calls_to_run:
-                        model_response.content += f"\n - {_f.get_call_str()}"
-                    model_response.content += "\n\n"
-
-            for _ in self.run_function_calls(
-                function_calls=function_calls_to_run,
-                function_call_results=function_call_results,
-            ):
-                pass
-
-            self._format_function_call_results(function_call_results, messages)
-
-            return model_response
-        return None
+        return str(remove_tool_calls_from_string(assistant_message.get_content_string()))
 
     def response_stream(self, messages: List[Message]) -> Iterator[ModelResponse]:
         """
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Optional, List, Iterator, Dict, Any, Union
+from typing import Optional, List, Iterator, AsyncIterator, Dict, Any, Union
 
 import httpx
 from pydantic import BaseModel
@@ -8,8 +8,10 @@ from phi.model.base import Model
 from phi.model.message import Message
 from phi.model.response import ModelResponse
 from phi.tools.function import FunctionCall
+from phi.utils.client_pool import client_pool
 from phi.utils.log import logger
 from phi.utils.timer import Timer
+from phi.utils.tracing import span
 from phi.utils.tools import get_function_call_for_tool_call
 
 try:
@@ -179,7 +181,7 @@ class OpenAIChat(Model):
         _client_params: Dict[str, Any] = self.get_client_params()
         if self.http_client is not None:
             _client_params["http_client"] = self.http_client
-        return OpenAIClient(**_client_params)
+        return client_pool.get_client(OpenAIClient, _client_params)
 
     def get_async_client(self) -> AsyncOpenAIClient:
         """
@@ -195,12 +197,14 @@ class OpenAIChat(Model):
 
         if self.http_client:
             _client_params["http_client"] = self.http_client
-        else:
+            return client_pool.get_async_client(AsyncOpenAIClient, _client_params)
+
+        def create_async_client() -> AsyncOpenAIClient:
             # Create a new async HTTP client with custom limits
-            _client_params["http_client"] = httpx.AsyncClient(
-                limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100)
-            )
-        return AsyncOpenAIClient(**_client_params)
+            http_client = httpx.AsyncClient(limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100))
+            return AsyncOpenAIClient(**{**_client_params, "http_client": http_client})
+
+        return client_pool.get_async_client(AsyncOpenAIClient, _client_params, create=create_async_client)
 
     @property
     def request_kwargs(self) -> Dict[str, Any]:
@@ -393,6 +397,48 @@ class OpenAIChat(Model):
         async for chunk in async_stream:  # type: ignore
             yield chunk
 
+    def _get_function_calls_to_run(
+        self, assistant_message: Message, messages: List[Message], tool_role: str = "tool"
+    ) -> List[FunctionCall]:
+        """
+        Get the function calls to run from the assistant message.
+        Tool calls that cannot be run are answered with an error message.
+
+        Args:
+            assistant_message (Message): The assistant message.
+            messages (List[Message]): The list of messages.
+            tool_role (str): The role to use for tool messages.
+
+        Returns:
+            List[FunctionCall]: The list of function calls to run.
+        """
+        function_calls_to_run: List[FunctionCall] = []
+        if assistant_message.tool_calls is None:
+            return function_calls_to_run
+        for tool_call in assistant_message.tool_calls:
+            _tool_call_id = tool_call.get("id")
+            _function_call = get_function_call_for_tool_call(tool_call, self.functions)
+            if _function_call is None:
+                messages.append(
+                    Message(
+                        role=tool_role,
+                        tool_call_id=_tool_call_id,
+                        content="Could not find function to call.",
+                    )
+                )
+                continue
+            if _function_call.error is not None:
+                messages.append(
+                    Message(
+                        role=tool_role,
+                        tool_call_id=_tool_call_id,
+                        content=_function_call.error,
+                    )
+                )
+                continue
+            function_calls_to_run.append(_function_call)
+        return function_calls_to_run
+
     def _handle_tool_calls(
         self, assistant_message: Message, messages: List[Message], model_response: ModelResponse
     ) -> Optional[ModelResponse]:
@@ -410,30 +456,8 @@ class OpenAIChat(Model):
         if assistant_message.tool_calls is not None and len(assistant_message.tool_calls) > 0 and self.run_tools:
             model_response.content = ""
             tool_role: str = "tool"
-            function_calls_to_run: List[FunctionCall] = []
+            function_calls_to_run = self._get_function_calls_to_run(assistant_message, messages, tool_role)
             function_call_results: List[Message] = []
-            for tool_call in assistant_message.tool_calls:
-                _tool_call_id = tool_call.get("id")
-                _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                if _function_call is None:
-                    messages.append(
-                        Message(
-                            role="tool",
-                            tool_call_id=_tool_call_id,
-                            content="Could not find function to call.",
-                        )
-                    )
-                    continue
-                if _function_call.error is not None:
-                    messages.append(
-                        Message(
-                            role="tool",
-                            tool_call_id=_tool_call_id,
-                            content=_function_call.error,
-                        )
-                    )
-                    continue
-                function_calls_to_run.append(_function_call)
 
             if self.show_tool_calls:
                 model_response.content += "\nRunning:"
@@ -452,6 +476,43 @@ class OpenAIChat(Model):
             return model_response
         return None
 
+    async def _ahandle_tool_calls(
+        self, assistant_message: Message, messages: List[Message], model_response: ModelResponse
+    ) -> Optional[ModelResponse]:
+        """
+        Handle tool calls in the assistant message without blocking the event loop.
+
+        Args:
+            assistant_message (Message): The assistant message.
+            messages (List[Message]): The list of messages.
+            model_response (ModelResponse): The model response.
+
+        Returns:
+            Optional[ModelResponse]: The model response after handling tool calls.
+        """
+        if assistant_message.tool_calls is not None and len(assistant_message.tool_calls) > 0 and self.run_tools:
+            model_response.content = ""
+            tool_role: str = "tool"
+            function_calls_to_run = self._get_function_calls_to_run(assistant_message, messages, tool_role)
+            function_call_results: List[Message] = []
+
+            if self.show_tool_calls:
+                model_response.content += "\nRunning:"
+                for _f in function_calls_to_run:
+                    model_response.content += f"\n - {_f.get_call_str()}"
+                model_response.content += "\n\n"
+
+            async for _ in self.arun_function_calls(
+                function_calls=function_calls_to_run, function_call_results=function_call_results, tool_role=tool_role
+            ):
+                pass
+
+            if len(function_call_results) > 0:
+                messages.extend(function_call_results)
+
+            return model_response
+        return None
+
     def _update_usage_metrics(
         self, assistant_message: Message, metrics: Metrics, response_usage: Optional[CompletionUsage]
     ) -> None:
@@ -555,7 +616,11 @@ class OpenAIChat(Model):
 
         # -*- Generate response
         metrics.response_timer.start()
-        response: Union[ChatCompletion, ParsedChatCompletion] = self.invoke(messages=messages)
+        with span("model.invoke", provider=self.provider, model=self.id) as s:
+            response: Union[ChatCompletion, ParsedChatCompletion] = self.invoke(messages=messages)
+            if response.usage is not None:
+                s.set_attribute("input_tokens", response.usage.prompt_tokens)
+                s.set_attribute("output_tokens", response.usage.completion_tokens)
         metrics.response_timer.stop()
 
         # -*- Parse response
@@ -624,7 +689,11 @@ class OpenAIChat(Model):
 
         # -*- Generate response
         metrics.response_timer.start()
-        response: Union[ChatCompletion, ParsedChatCompletion] = await self.ainvoke(messages=messages)
+        with span("model.invoke", provider=self.provider, model=self.id) as s:
+            response: Union[ChatCompletion, ParsedChatCompletion] = await self.ainvoke(messages=messages)
+            if response.usage is not None:
+                s.set_attribute("input_tokens", response.usage.prompt_tokens)
+                s.set_attribute("output_tokens", response.usage.completion_tokens)
         metrics.response_timer.stop()
 
         # -*- Parse response
@@ -657,7 +726,7 @@ class OpenAIChat(Model):
         metrics.log()
 
         # -*- Handle tool calls
-        if self._handle_tool_calls(assistant_message, messages, model_response):
+        if await self._ahandle_tool_calls(assistant_message, messages, model_response):
             response_after_tool_calls = await self.aresponse(messages=messages)
             if response_after_tool_calls.content is not None:
                 if model_response.content is None:
@@ -748,30 +817,8 @@ class OpenAIChat(Model):
         """
         if assistant_message.tool_calls is not None and len(assistant_message.tool_calls) > 0 and self.run_tools:
             tool_role: str = "tool"
-            function_calls_to_run: List[FunctionCall] = []
+            function_calls_to_run = self._get_function_calls_to_run(assistant_message, messages, tool_role)
             function_call_results: List[Message] = []
-            for tool_call in assistant_message.tool_calls:
-                _tool_call_id = tool_call.get("id")
-                _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                if _function_call is None:
-                    messages.append(
-                        Message(
-                            role=tool_role,
-                            tool_call_id=_tool_call_id,
-                            content="Could not find function to call.",
-                        )
-                    )
-                    continue
-                if _function_call.error is not None:
-                    messages.append(
-                        Message(
-                            role=tool_role,
-                            tool_call_id=_tool_call_id,
-                            content=_function_call.error,
-                        )
-                    )
-                    continue
-                function_calls_to_run.append(_function_call)
 
             if self.show_tool_calls:
                 yield ModelResponse(content="\nRunning:")
@@ -787,6 +834,40 @@ class OpenAIChat(Model):
             if len(function_call_results) > 0:
                 messages.extend(function_call_results)
 
+    async def _ahandle_stream_tool_calls(
+        self,
+        assistant_message: Message,
+        messages: List[Message],
+    ) -> AsyncIterator[ModelResponse]:
+        """
+        Handle tool calls for async response stream without blocking the event loop.
+
+        Args:
+            assistant_message (Message): The assistant message.
+            messages (List[Message]): The list of messages.
+
+        Returns:
+            AsyncIterator[ModelResponse]: An async iterator of the model response.
+        """
+        if assistant_message.tool_calls is not None and len(assistant_message.tool_calls) > 0 and self.run_tools:
+            tool_role: str = "tool"
+            function_calls_to_run = self._get_function_calls_to_run(assistant_message, messages, tool_role)
+            function_call_results: List[Message] = []
+
+            if self.show_tool_calls:
+                yield ModelResponse(content="\nRunning:")
+                for _f in function_calls_to_run:
+                    yield ModelResponse(content=f"\n - {_f.get_call_str()}")
+                yield ModelResponse(content="\n\n")
+
+            async for intermediate_model_response in self.arun_function_calls(
+                function_calls=function_calls_to_run, function_call_results=function_call_results, tool_role=tool_role
+            ):
+                yield intermediate_model_response
+
+            if len(function_call_results) > 0:
+                messages.extend(function_call_results)
+
     def response_stream(self, messages: List[Message]) -> Iterator[ModelResponse]:
         """
         Generate a streaming response from OpenAI.
@@ -804,27 +885,29 @@ class OpenAIChat(Model):
 
         # -*- Generate response
         metrics.response_timer.start()
-        for response in self.invoke_stream(messages=messages):
-            if len(response.choices) > 0:
-                metrics.completion_tokens += 1
-                if metrics.completion_tokens == 1:
-                    metrics.time_to_first_token = metrics.response_timer.elapsed
-
-                response_delta: ChoiceDelta = response.choices[0].delta
-                response_content: Optional[str] = response_delta.content
-                response_tool_calls: Optional[List[ChoiceDeltaToolCall]] = response_delta.tool_calls
-
-                if response_content is not None:
-                    stream_data.response_content += response_content
-                    yield ModelResponse(content=response_content)
-
-                if response_tool_calls is not None:
-                    if stream_data.response_tool_calls is None:
-                        stream_data.response_tool_calls = []
-                    stream_data.response_tool_calls.extend(response_tool_calls)
-
-            if response.usage is not None:
-                self._add_response_usage_to_metrics(metrics=metrics, response_usage=response.usage)
+        with span("model.invoke", provider=self.provider, model=self.id, stream=True) as s:
+            for response in self.invoke_stream(messages=messages):
+                if len(response.choices) > 0:
+                    metrics.completion_tokens += 1
+                    if metrics.completion_tokens == 1:
+                        metrics.time_to_first_token = metrics.response_timer.elapsed
+
+                    response_delta: ChoiceDelta = response.choices[0].delta
+                    response_content: Optional[str] = response_delta.content
+                    response_tool_calls: Optional[List[ChoiceDeltaToolCall]] = response_delta.tool_calls
+
+                    if response_content is not None:
+                        stream_data.response_content += response_content
+                        yield ModelResponse(content=response_content)
+
+                    if response_tool_calls is not None:
+                        if stream_data.response_tool_calls is None:
+                            stream_data.response_tool_calls = []
+                        stream_data.response_tool_calls.extend(response_tool_calls)
+
+                if response.usage is not None:
+                    self._add_response_usage_to_metrics(metrics=metrics, response_usage=response.usage)
+            s.set_attribute("num_chunks", metrics.completion_tokens)
         metrics.response_timer.stop()
 
         # -*- Create assistant message
@@ -870,27 +953,29 @@ class OpenAIChat(Model):
 
         # -*- Generate response
         metrics.response_timer.start()
-        async for response in self.ainvoke_stream(messages=messages):
-            if len(response.choices) > 0:
-                metrics.completion_tokens += 1
-                if metrics.completion_tokens == 1:
-                    metrics.time_to_first_token = metrics.response_timer.elapsed
-
-                response_delta: ChoiceDelta = response.choices[0].delta
-                response_content = response_delta.content
-                response_tool_calls = response_delta.tool_calls
-
-                if response_content is not None:
-                    stream_data.response_content += response_content
-                    yield ModelResponse(content=response_content)
-
-                if response_tool_calls is not None:
-                    if stream_data.response_tool_calls is None:
-                        stream_data.response_tool_calls = []
-                    stream_data.response_tool_calls.extend(response_tool_calls)
-
-            if response.usage is not None:
-                self._add_response_usage_to_metrics(metrics=metrics, response_usage=response.usage)
+        with span("model.invoke", provider=self.provider, model=self.id, stream=True) as s:
+            async for response in self.ainvoke_stream(messages=messages):
+                if len(response.choices) > 0:
+                    metrics.completion_tokens += 1
+                    if metrics.completion_tokens == 1:
+                        metrics.time_to_first_token = metrics.response_timer.elapsed
+
+                    response_delta: ChoiceDelta = response.choices[0].delta
+                    response_content = response_delta.content
+                    response_tool_calls = response_delta.tool_calls
+
+                    if response_content is not None:
+                        stream_data.response_content += response_content
+                        yield ModelResponse(content=response_content)
+
+                    if response_tool_calls is not None:
+                        if stream_data.response_tool_calls is None:
+                            stream_data.response_tool_calls = []
+                        stream_data.response_tool_calls.extend(response_tool_calls)
+
+                if response.usage is not None:
+                    self._add_response_usage_to_metrics(metrics=metrics, response_usage=response.usage)
+            s.set_attribute("num_chunks", metrics.completion_tokens)
         metrics.response_timer.stop()
 
         # -*- Create assistant message
@@ -914,7 +999,7 @@ class OpenAIChat(Model):
 
         # -*- Handle tool calls
         if assistant_message.tool_calls is not None and len(assistant_message.tool_calls) > 0 and self.run_tools:
-            for model_response in self._handle_stream_tool_calls(assistant_message, messages):
+            async for model_response in self._ahandle_stream_tool_calls(assistant_message, messages):
                 yield model_response
             async for model_response in self.aresponse_stream(messages=messages):
                 yield model_response
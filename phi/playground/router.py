@@ -96,8 +96,8 @@ def get_playground_router(agents: List[Agent]) -> APIRouter:
         else:
             logger.debug("Creating new session")
 
-        # Create a new instance of this agent
-        new_agent_instance = agent.deep_copy(update={"session_id": body.session_id})
+        # Create a new instance of this agent, sharing its storage, knowledge, tools and model clients
+        new_agent_instance = agent.shallow_copy(update={"session_id": body.session_id})
         if body.user_id is not None:
             new_agent_instance.user_id = body.user_id
 
@@ -265,8 +265,8 @@ def get_async_playground_router(agents: List[Agent]) -> APIRouter:
         else:
             logger.debug("Creating new session")
 
-        # Create a new instance of this agent
-        new_agent_instance = agent.deep_copy(update={"session_id": body.session_id})
+        # Create a new instance of this agent, sharing its storage, knowledge, tools and model clients
+        new_agent_instance = agent.shallow_copy(update={"session_id": body.session_id})
         if body.user_id is not None:
             new_agent_instance.user_id = body.user_id
 
@@ -301,7 +301,7 @@ def get_async_playground_router(agents: List[Agent]) -> APIRouter:
             return JSONResponse(status_code=404, content="Agent does not have storage enabled.")
 
         agent_sessions: List[AgentSessionsResponse] = []
-        all_agent_sessions: List[AgentSession] = agent.storage.get_all_sessions(user_id=body.user_id)
+        all_agent_sessions: List[AgentSession] = await agent.storage.aget_all_sessions(user_id=body.user_id)
         for session in all_agent_sessions:
             title = get_session_title(session)
             agent_sessions.append(
@@ -324,7 +324,7 @@ def get_async_playground_router(agents: List[Agent]) -> APIRouter:
         if agent.storage is None:
             return JSONResponse(status_code=404, content="Agent does not have storage enabled.")
 
-        agent_session: Optional[AgentSession] = agent.storage.read(session_id, body.user_id)
+        agent_session: Optional[AgentSession] = await agent.storage.aread(session_id, body.user_id)
         if agent_session is None:
             return JSONResponse(status_code=404, content="Session not found.")
 
@@ -349,10 +349,10 @@ def get_async_playground_router(agents: List[Agent]) -> APIRouter:
         if agent.storage is None:
             return JSONResponse(status_code=404, content="Agent does not have storage enabled.")
 
-        all_agent_sessions: List[AgentSession] = agent.storage.get_all_sessions(user_id=body.user_id)
+        all_agent_sessions: List[AgentSession] = await agent.storage.aget_all_sessions(user_id=body.user_id)
         for session in all_agent_sessions:
             if session.session_id == body.session_id:
-                agent.delete_session(body.session_id)
+                await agent.adelete_session(body.session_id)
                 return JSONResponse(content={"message": f"successfully deleted agent {agent.name}"})
 
         return JSONResponse(status_code=404, content="Session not found.")
@@ -6,6 +6,7 @@ from pydantic import BaseModel, ConfigDict, Field
 
 from phi.reasoning.step import ReasoningStep
 from phi.model.message import Message, MessageContext
+from phi.utils.tracing import Span
 
 
 class RunEvent(str, Enum):
@@ -49,6 +50,8 @@ class RunResponse(BaseModel):
     workflow_id: Optional[str] = None
     tools: Optional[List[Dict[str, Any]]] = None
     extra_data: Optional[RunResponseExtraData] = None
+    # Timed stages of the run, when tracing is enabled
+    spans: Optional[List[Span]] = None
     created_at: int = Field(default_factory=lambda: int(time()))
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
@@ -0,0 +1,198 @@
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from sqlalchemy.schema import MetaData, Table, Column, Index
+    from sqlalchemy.sql.expression import func, select
+    from sqlalchemy.types import BigInteger, String
+except ImportError:
+    raise ImportError("`sqlalchemy` not installed. Please install it using `pip install sqlalchemy`")
+
+# Roles of the message that AgentMemory keeps at the start of its messages. It is replaced when the system
+# message changes, so it is stored in the session row instead of the log.
+SYSTEM_MESSAGE_ROLES = ("system", "developer")
+
+
+@dataclass
+class RunLogPosition:
+    """Position of the runs and messages loaded into an AgentMemory, relative to the run log"""
+
+    # Number of runs in the log
+    num_runs: int = 0
+    # Number of messages in the log
+    num_messages: int = 0
+    # Index in the log of the first run in the AgentMemory
+    run_offset: int = 0
+    # Index in the log of the first message in the AgentMemory, after the system message
+    message_offset: int = 0
+
+
+def split_memory(
+    memory: Optional[Dict[str, Any]],
+) -> Tuple[Dict[str, Any], List[Any], List[Any], Dict[str, int]]:
+    """Splits the memory of an AgentSession into the fields stored in the session row, the runs, the messages
+    and the log offsets of the first run and message"""
+    session_memory = dict(memory or {})
+    runs = session_memory.pop("runs", None) or []
+    messages = session_memory.pop("messages", None) or []
+    log_offsets = session_memory.pop("log_offsets", None) or {}
+    if len(messages) > 0 and isinstance(messages[0], dict) and messages[0].get("role") in SYSTEM_MESSAGE_ROLES:
+        session_memory["messages"] = messages[:1]
+        messages = messages[1:]
+    return session_memory, runs, messages, log_offsets
+
+
+class AgentRunLog:
+    """Append-only log of the runs and messages of Agent sessions.
+
+    Each run and each message is a row keyed by (session_id, kind, position), so writing a session only inserts
+    the runs and messages added since it was read, and the cost of a write does not grow with the session.
+    When a session is read, the log offsets of its first run and message are stored in its memory as
+    `log_offsets`, so the runs and messages in the memory can be mapped back onto the log when it is written.
+    """
+
+    def __init__(self, table_name: str, metadata: MetaData, json_type: Any, insert: Callable[[Table], Any]):
+        # Dialect specific JSON type and insert, which must support on_conflict_do_update()
+        self.insert = insert
+        self.table: Table = Table(
+            table_name,
+            metadata,
+            # Session UUID
+            Column("session_id", String, primary_key=True),
+            # "run" or "message"
+            Column("kind", String, primary_key=True),
+            # Index of the run or message in the session
+            Column("position", BigInteger, primary_key=True, autoincrement=False),
+            # Index of the run the message was added with
+            Column("run_index", BigInteger),
+            # The AgentRun or Message
+            Column("data", json_type),
+            # The Unix timestamp of when this entry was created.
+            Column("created_at", BigInteger, default=lambda: int(time.time())),
+            extend_existing=True,
+        )
+        Index(f"idx_{table_name}_run_index", self.table.c.session_id, self.table.c.kind, self.table.c.run_index)
+
+    def get_position(self, sess: Any, session_id: str) -> RunLogPosition:
+        """Returns the number of runs and messages in the log of a session"""
+        stmt = (
+            select(self.table.c.kind, func.max(self.table.c.position))
+            .where(self.table.c.session_id == session_id)
+            .group_by(self.table.c.kind)
+        )
+        counts = {kind: max_position + 1 for kind, max_position in sess.execute(stmt).fetchall()}
+        return RunLogPosition(num_runs=counts.get("run", 0), num_messages=counts.get("message", 0))
+
+    def read(
+        self, sess: Any, session_id: str, memory: Optional[Dict[str, Any]], num_runs: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Adds the runs and messages from the log to the memory stored in the session row.
+
+        Args:
+            sess: Database session or connection.
+            session_id (str): ID of the session.
+            memory (Optional[Dict[str, Any]]): Memory from the session row.
+            num_runs (Optional[int]): Number of most recent runs to load, and the messages added with them.
+                Loads all runs if None.
+
+        Returns:
+            Dict[str, Any]: The memory, with the log offsets of its first run and message.
+        """
+        memory = dict(memory or {})
+        # Sessions written without the run log hold all runs in the session row, which are moved to the log
+        # on the next write
+        if "runs" in memory or "chats" in memory:
+            return memory
+
+        position = self.get_position(sess, session_id)
+        run_stmt = (
+            select(self.table.c.data)
+            .where(self.table.c.session_id == session_id, self.table.c.kind == "run")
+            .order_by(self.table.c.position.desc())
+        )
+        message_stmt = (
+            select(self.table.c.position, self.table.c.data)
+            .where(self.table.c.session_id == session_id, self.table.c.kind == "message")
+            .order_by(self.table.c.position)
+        )
+        if num_runs is not None:
+            run_stmt = run_stmt.limit(num_runs)
+        runs = [row[0] for row in sess.execute(run_stmt).fetchall()][::-1]
+        position.run_offset = position.num_runs - len(runs)
+        if num_runs is not None:
+            message_stmt = message_stmt.where(self.table.c.run_index >= position.run_offset)
+        message_rows = sess.execute(message_stmt).fetchall()
+        position.message_offset = message_rows[0][0] if len(message_rows) > 0 else position.num_messages
+
+        memory["runs"] = runs
+        memory["messages"] = (memory.get("messages") or []) + [row[1] for row in message_rows]
+        memory["log_offsets"] = {"runs": position.run_offset, "messages": position.message_offset}
+        return memory
+
+    def append(
+        self,
+        sess: Any,
+        session_id: str,
+        runs: List[Any],
+        messages: List[Any],
+        log_offsets: Optional[Dict[str, int]] = None,
+    ) -> RunLogPosition:
+        """Inserts the runs and messages of the memory of a session which are not in the log yet.
+
+        Args:
+            sess: Database session or connection, in a transaction.
+            session_id (str): ID of the session.
+            runs (List[Any]): Runs in the AgentMemory.
+            messages (List[Any]): Messages in the AgentMemory, without the system message.
+            log_offsets (Optional[Dict[str, int]]): Log offsets of the first run and message in the AgentMemory,
+                recorded when the session was read. If None, the memory holds every run and message.
+
+        Returns:
+            RunLogPosition: The position of the runs and messages in the log after the write.
+        """
+        position = self.get_position(sess, session_id)
+        position.run_offset = (log_offsets or {}).get("runs", 0)
+        position.message_offset = (log_offsets or {}).get("messages", 0)
+
+        new_runs = runs[max(position.num_runs - position.run_offset, 0) :]
+        new_messages = messages[max(position.num_messages - position.message_offset, 0) :]
+        # Messages are added to the memory with the run that follows them
+        run_index = max(position.num_runs + len(new_runs) - 1, 0)
+        rows = [
+            dict(
+                session_id=session_id,
+                kind="run",
+                position=position.num_runs + i,
+                run_index=position.num_runs + i,
+                data=run,
+            )
+            for i, run in enumerate(new_runs)
+        ] + [
+            dict(
+                session_id=session_id,
+                kind="message",
+                position=position.num_messages + i,
+                run_index=run_index,
+                data=message,
+            )
+            for i, message in enumerate(new_messages)
+        ]
+        if len(rows) > 0:
+            stmt = self.insert(self.table).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["session_id", "kind", "position"],
+                set_=dict(run_index=stmt.excluded.run_index, data=stmt.excluded.data),
+            )
+            sess.execute(stmt)
+
+        return RunLogPosition(
+            num_runs=position.num_runs + len(new_runs),
+            num_messages=position.num_messages + len(new_messages),
+            run_offset=position.run_offset,
+            message_offset=position.message_offset,
+        )
+
+    def delete(self, sess: Any, session_id: str) -> None:
+        """Deletes the runs and messages of a session"""
+        sess.execute(self.table.delete().where(self.table.c.session_id == session_id))
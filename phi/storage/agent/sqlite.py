@@ -1,6 +1,7 @@
 import time
+import asyncio
 from pathlib import Path
-from typing import Optional, List
+from typing import Any, Optional, List
 
 try:
     from sqlalchemy.dialects import sqlite
@@ -15,6 +16,8 @@ except ImportError:
 
 from phi.agent import AgentSession
 from phi.storage.agent.base import AgentStorage
+from phi.storage.agent.run_log import AgentRunLog, split_memory
+from phi.utils.async_engine import create_async_engine_for
 from phi.utils.log import logger
 
 
@@ -27,6 +30,8 @@ class SqlAgentStorage(AgentStorage):
         db_engine: Optional[Engine] = None,
         schema_version: int = 1,
         auto_upgrade_schema: bool = False,
+        append_runs: bool = False,
+        num_history_runs: Optional[int] = None,
     ):
         """
         This class provides agent storage using a sqlite database.
@@ -42,6 +47,10 @@ class SqlAgentStorage(AgentStorage):
             db_url: The database URL to connect to.
             db_file: The database file to connect to.
             db_engine: The SQLAlchemy database engine to use.
+            append_runs: Append runs and messages to a log table, so the session row only holds the small fields
+                that change between runs and the cost of a write does not grow with the session.
+            num_history_runs: Number of most recent runs loaded by read() when append_runs is True.
+                Loads all runs if None.
         """
         _engine: Optional[Engine] = db_engine
         if _engine is None and db_url is not None:
@@ -72,8 +81,16 @@ class SqlAgentStorage(AgentStorage):
 
         # Database session
         self.Session: sessionmaker[Session] = sessionmaker(bind=self.db_engine)
+        # Async engine for the async methods, created on first use
+        self._async_engine: Optional[Any] = None
+        self._async_engine_supported: bool = True
         # Database table for storage
         self.table: Table = self.get_table()
+        # Store runs and messages in an append-only log table instead of the session row
+        self.append_runs: bool = append_runs
+        # Number of most recent runs loaded by read() when append_runs is True. Loads all runs if None.
+        self.num_history_runs: Optional[int] = num_history_runs
+        self.run_log: Optional[AgentRunLog] = self.get_run_log()
 
     def get_table_v1(self) -> Table:
         """
@@ -122,6 +139,22 @@ class SqlAgentStorage(AgentStorage):
         else:
             raise ValueError(f"Unsupported schema version: {self.schema_version}")
 
+    def get_run_log(self) -> Optional[AgentRunLog]:
+        """
+        Get the log table for the runs and messages of each session, if append_runs is True.
+
+        Returns:
+            Optional[AgentRunLog]: The run log, stored in the table `{table_name}_runs`.
+        """
+        if not self.append_runs:
+            return None
+        return AgentRunLog(
+            table_name=f"{self.table_name}_runs",
+            metadata=self.metadata,
+            json_type=sqlite.JSON,
+            insert=sqlite.insert,
+        )
+
     def table_exists(self) -> bool:
         """
         Check if the table exists in the database.
@@ -143,6 +176,8 @@ class SqlAgentStorage(AgentStorage):
         if not self.table_exists():
             logger.debug(f"Creating table: {self.table.name}")
             self.table.create(self.db_engine, checkfirst=True)
+        if self.run_log is not None:
+            self.run_log.table.create(self.db_engine, checkfirst=True)
 
     def read(self, session_id: str, user_id: Optional[str] = None) -> Optional[AgentSession]:
         """
@@ -161,7 +196,14 @@ class SqlAgentStorage(AgentStorage):
                 if user_id:
                     stmt = stmt.where(self.table.c.user_id == user_id)
                 result = sess.execute(stmt).fetchone()
-                return AgentSession.model_validate(result) if result is not None else None
+                if result is None:
+                    return None
+                session = AgentSession.model_validate(result)
+                if self.run_log is not None:
+                    session.memory = self.run_log.read(
+                        sess, session_id=session_id, memory=session.memory, num_runs=self.num_history_runs
+                    )
+                return session
         except Exception as e:
             logger.debug(f"Exception reading from table: {e}")
             logger.debug(f"Table does not exist: {self.table.name}")
@@ -223,7 +265,13 @@ class SqlAgentStorage(AgentStorage):
                 stmt = stmt.order_by(self.table.c.created_at.desc())
                 # execute query
                 rows = sess.execute(stmt).fetchall()
-                return [AgentSession.model_validate(row) for row in rows] if rows is not None else []
+                sessions = [AgentSession.model_validate(row) for row in rows] if rows is not None else []
+                if self.run_log is not None:
+                    for session in sessions:
+                        session.memory = self.run_log.read(
+                            sess, session_id=session.session_id, memory=session.memory, num_runs=self.num_history_runs
+                        )
+                return sessions
         except Exception as e:
             logger.debug(f"Exception reading from table: {e}")
             logger.debug(f"Table does not exist: {self.table.name}")
@@ -231,6 +279,35 @@ class SqlAgentStorage(AgentStorage):
             self.create()
         return []
 
+    def _get_upsert_statement(self, session: AgentSession) -> Any:
+        """Returns the statement inserting the session, or updating it if the session_id already exists"""
+        # Create an insert statement
+        stmt = sqlite.insert(self.table).values(
+            session_id=session.session_id,
+            agent_id=session.agent_id,
+            user_id=session.user_id,
+            memory=session.memory,
+            agent_data=session.agent_data,
+            user_data=session.user_data,
+            session_data=session.session_data,
+        )
+
+        # Define the upsert if the session_id already exists
+        # See: https://docs.sqlalchemy.org/en/20/dialects/sqlite.html#insert-on-conflict-upsert
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["session_id"],
+            set_=dict(
+                agent_id=session.agent_id,
+                user_id=session.user_id,
+                memory=session.memory,
+                agent_data=session.agent_data,
+                user_data=session.user_data,
+                session_data=session.session_data,
+                updated_at=int(time.time()),
+            ),  # The updated value for each column
+        )
+        return stmt
+
     def upsert(self, session: AgentSession, create_and_retry: bool = True) -> Optional[AgentSession]:
         """
         Insert or update an AgentSession in the database.
@@ -242,35 +319,12 @@ class SqlAgentStorage(AgentStorage):
         Returns:
             Optional[AgentSession]: The upserted AgentSession, or None if operation failed.
         """
+        if self.run_log is not None:
+            return self.append(session, create_and_retry=create_and_retry)
+
         try:
             with self.Session() as sess, sess.begin():
-                # Create an insert statement
-                stmt = sqlite.insert(self.table).values(
-                    session_id=session.session_id,
-                    agent_id=session.agent_id,
-                    user_id=session.user_id,
-                    memory=session.memory,
-                    agent_data=session.agent_data,
-                    user_data=session.user_data,
-                    session_data=session.session_data,
-                )
-
-                # Define the upsert if the session_id already exists
-                # See: https://docs.sqlalchemy.org/en/20/dialects/sqlite.html#insert-on-conflict-upsert
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=["session_id"],
-                    set_=dict(
-                        agent_id=session.agent_id,
-                        user_id=session.user_id,
-                        memory=session.memory,
-                        agent_data=session.agent_data,
-                        user_data=session.user_data,
-                        session_data=session.session_data,
-                        updated_at=int(time.time()),
-                    ),  # The updated value for each column
-                )
-
-                sess.execute(stmt)
+                sess.execute(self._get_upsert_statement(session))
         except Exception as e:
             logger.debug(f"Exception upserting into table: {e}")
             if create_and_retry and not self.table_exists():
@@ -281,6 +335,37 @@ class SqlAgentStorage(AgentStorage):
             return None
         return self.read(session_id=session.session_id)
 
+    def append(self, session: AgentSession, create_and_retry: bool = True) -> Optional[AgentSession]:
+        """
+        Update the session row and append the new runs and messages of an AgentSession to the run log.
+
+        Args:
+            session (AgentSession): The session data to write.
+            create_and_retry (bool): Retry if the tables do not exist.
+
+        Returns:
+            Optional[AgentSession]: The written AgentSession, or None if operation failed.
+        """
+        if self.run_log is None:
+            return self.upsert(session, create_and_retry=create_and_retry)
+
+        session_memory, runs, messages, log_offsets = split_memory(session.memory)
+        try:
+            with self.Session() as sess, sess.begin():
+                sess.execute(self._get_upsert_statement(session.model_copy(update={"memory": session_memory})))
+                self.run_log.append(
+                    sess, session_id=session.session_id, runs=runs, messages=messages, log_offsets=log_offsets
+                )
+        except Exception as e:
+            logger.debug(f"Exception appending to table: {e}")
+            if create_and_retry:
+                logger.debug("Creating tables and retrying append")
+                self.create()
+                return self.append(session, create_and_retry=False)
+            return None
+        # The session is not read back, as that would load every run
+        return session
+
     def delete_session(self, session_id: Optional[str] = None):
         """
         Delete a workflow session from the database.
@@ -300,6 +385,139 @@ class SqlAgentStorage(AgentStorage):
                 # Delete the session with the given session_id
                 delete_stmt = self.table.delete().where(self.table.c.session_id == session_id)
                 result = sess.execute(delete_stmt)
+                if self.run_log is not None:
+                    self.run_log.delete(sess, session_id=session_id)
+                if result.rowcount == 0:
+                    logger.debug(f"No session found with session_id: {session_id}")
+                else:
+                    logger.debug(f"Successfully deleted session with session_id: {session_id}")
+        except Exception as e:
+            logger.error(f"Error deleting session: {e}")
+
+    @property
+    def async_engine(self) -> Optional[Any]:
+        """Async engine connected to the same database, or None if no async driver is installed"""
+        if self._async_engine is None and self._async_engine_supported:
+            self._async_engine = create_async_engine_for(self.db_engine)
+            self._async_engine_supported = self._async_engine is not None
+        return self._async_engine
+
+    async def aread(self, session_id: str, user_id: Optional[str] = None) -> Optional[AgentSession]:
+        """
+        Read an AgentSession from the database without blocking the event loop.
+
+        Args:
+            session_id (str): ID of the session to read.
+            user_id (Optional[str]): User ID to filter by. Defaults to None.
+
+        Returns:
+            Optional[AgentSession]: AgentSession object if found, None otherwise.
+        """
+        # The run log is read and written in a thread
+        async_engine = self.async_engine if self.run_log is None else None
+        if async_engine is None:
+            return await super().aread(session_id=session_id, user_id=user_id)
+
+        try:
+            async with async_engine.connect() as conn:
+                stmt = select(self.table).where(self.table.c.session_id == session_id)
+                if user_id:
+                    stmt = stmt.where(self.table.c.user_id == user_id)
+                result = (await conn.execute(stmt)).fetchone()
+                return AgentSession.model_validate(result) if result is not None else None
+        except Exception as e:
+            logger.debug(f"Exception reading from table: {e}")
+            logger.debug(f"Table does not exist: {self.table.name}")
+            logger.debug("Creating table for future transactions")
+            await self.acreate()
+        return None
+
+    async def aget_all_sessions(
+        self, user_id: Optional[str] = None, agent_id: Optional[str] = None
+    ) -> List[AgentSession]:
+        """
+        Get all sessions without blocking the event loop, optionally filtered by user_id and/or agent_id.
+
+        Args:
+            user_id (Optional[str]): The ID of the user to filter by.
+            agent_id (Optional[str]): The ID of the agent to filter by.
+
+        Returns:
+            List[AgentSession]: List of AgentSession objects matching the criteria.
+        """
+        # The run log is read and written in a thread
+        async_engine = self.async_engine if self.run_log is None else None
+        if async_engine is None:
+            return await super().aget_all_sessions(user_id=user_id, agent_id=agent_id)
+
+        try:
+            async with async_engine.connect() as conn:
+                stmt = select(self.table)
+                if user_id is not None:
+                    stmt = stmt.where(self.table.c.user_id == user_id)
+                if agent_id is not None:
+                    stmt = stmt.where(self.table.c.agent_id == agent_id)
+                # order by created_at desc
+                stmt = stmt.order_by(self.table.c.created_at.desc())
+                rows = (await conn.execute(stmt)).fetchall()
+                return [AgentSession.model_validate(row) for row in rows] if rows is not None else []
+        except Exception as e:
+            logger.debug(f"Exception reading from table: {e}")
+            logger.debug(f"Table does not exist: {self.table.name}")
+            logger.debug("Creating table for future transactions")
+            await self.acreate()
+        return []
+
+    async def aupsert(self, session: AgentSession, create_and_retry: bool = True) -> Optional[AgentSession]:
+        """
+        Insert or update an AgentSession in the database without blocking the event loop.
+
+        Args:
+            session (AgentSession): The session data to upsert.
+            create_and_retry (bool): Retry upsert if table does not exist.
+
+        Returns:
+            Optional[AgentSession]: The upserted AgentSession, or None if operation failed.
+        """
+        # The run log is read and written in a thread
+        async_engine = self.async_engine if self.run_log is None else None
+        if async_engine is None:
+            return await super().aupsert(session=session)
+
+        try:
+            async with async_engine.begin() as conn:
+                await conn.execute(self._get_upsert_statement(session))
+        except Exception as e:
+            logger.debug(f"Exception upserting into table: {e}")
+            loop = asyncio.get_running_loop()
+            if create_and_retry and not await loop.run_in_executor(None, self.table_exists):
+                logger.debug(f"Table does not exist: {self.table.name}")
+                logger.debug("Creating table and retrying upsert")
+                await self.acreate()
+                return await self.aupsert(session, create_and_retry=False)
+            return None
+        return await self.aread(session_id=session.session_id)
+
+    async def adelete_session(self, session_id: Optional[str] = None) -> None:
+        """
+        Delete a session from the database without blocking the event loop.
+
+        Args:
+            session_id (Optional[str]): The ID of the session to delete.
+        """
+        if session_id is None:
+            logger.warning("No session_id provided for deletion.")
+            return
+
+        # The run log is read and written in a thread
+        async_engine = self.async_engine if self.run_log is None else None
+        if async_engine is None:
+            return await super().adelete_session(session_id=session_id)
+
+        try:
+            async with async_engine.begin() as conn:
+                delete_stmt = self.table.delete().where(self.table.c.session_id == session_id)
+                result = await conn.execute(delete_stmt)
                 if result.rowcount == 0:
                     logger.debug(f"No session found with session_id: {session_id}")
                 else:
@@ -314,6 +532,8 @@ class SqlAgentStorage(AgentStorage):
         if self.table_exists():
             logger.debug(f"Deleting table: {self.table_name}")
             self.table.drop(self.db_engine)
+        if self.run_log is not None:
+            self.run_log.table.drop(self.db_engine, checkfirst=True)
 
     def upgrade_schema(self) -> None:
         """
@@ -341,10 +561,10 @@ class SqlAgentStorage(AgentStorage):
 
         # Deep copy attributes
         for k, v in self.__dict__.items():
-            if k in {"metadata", "table", "inspector"}:
+            if k in {"metadata", "table", "inspector", "run_log"}:
                 continue
-            # Reuse db_engine and Session without copying
-            elif k in {"db_engine", "Session"}:
+            # Reuse db_engine, async engine and Session without copying
+            elif k in {"db_engine", "_async_engine", "Session"}:
                 setattr(copied_obj, k, v)
             else:
                 setattr(copied_obj, k, deepcopy(v, memo))
@@ -353,5 +573,6 @@ class SqlAgentStorage(AgentStorage):
         copied_obj.metadata = MetaData()
         copied_obj.inspector = inspect(copied_obj.db_engine)
         copied_obj.table = copied_obj.get_table()
+        copied_obj.run_log = copied_obj.get_run_log()
 
         return copied_obj
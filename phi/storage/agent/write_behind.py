@@ -0,0 +1,204 @@
+import atexit
+import asyncio
+from collections import OrderedDict
+from threading import Event, Lock, Thread
+from typing import Any, Dict, List, Optional
+
+from phi.agent.session import AgentSession
+from phi.storage.agent.base import AgentStorage
+from phi.utils.cache import LRUCache
+from phi.utils.log import logger
+
+
+class WriteBehindAgentStorage(AgentStorage):
+    """Agent storage that serves reads from an in-process session cache and writes to another storage in the background.
+
+    Writes update the cache and are queued for a background thread, which flushes them every `flush_interval`
+    seconds. Multiple writes to the same session before a flush are coalesced into one write of the latest
+    session. Pending writes are flushed when the process exits or `close()` is called.
+
+    Durability:
+        - By default writes are only flushed in the background, so the writes of the last `flush_interval`
+          seconds are lost if the process crashes.
+        - With `sync_every=N`, every Nth write flushes all pending writes before returning.
+        - When `max_pending` sessions are waiting to be written, the next write flushes them before returning.
+
+    The cache assumes this process is the only writer of the sessions it holds. Use `ttl` to re-read sessions
+    that may be written by other processes.
+    """
+
+    def __init__(
+        self,
+        storage: AgentStorage,
+        max_sessions: int = 1000,
+        ttl: Optional[float] = None,
+        flush_interval: float = 1.0,
+        max_pending: int = 1000,
+        sync_every: Optional[int] = None,
+    ):
+        # The storage to write sessions to
+        self.storage: AgentStorage = storage
+        # Cache of sessions, keyed by session_id
+        self.sessions: LRUCache[AgentSession] = LRUCache(max_entries=max_sessions, ttl=ttl)
+        # Seconds between background flushes
+        self.flush_interval: float = flush_interval
+        # Maximum number of sessions waiting to be written
+        self.max_pending: int = max_pending
+        # Flush pending writes on every Nth write. If None, writes are only flushed in the background.
+        self.sync_every: Optional[int] = sync_every
+
+        # Latest version of each session waiting to be written, in the order they were first queued
+        self.pending: "OrderedDict[str, AgentSession]" = OrderedDict()
+        self.num_writes: int = 0
+        self.num_flushed: int = 0
+        self.num_failed: int = 0
+        self._pending_lock = Lock()
+        # Only one flush runs at a time, so writes to a session reach the storage in order
+        self._flush_lock = Lock()
+        self._stop = Event()
+        self._flusher: Optional[Thread] = None
+        atexit.register(self.close)
+
+    def _start_flusher(self) -> None:
+        if self._flusher is None and not self._stop.is_set():
+            self._flusher = Thread(target=self._run_flusher, name="phi-storage-flusher", daemon=True)
+            self._flusher.start()
+
+    def _run_flusher(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"Error flushing sessions: {e}")
+
+    def flush(self) -> int:
+        """Writes the pending sessions to the storage and returns the number of sessions written"""
+        with self._flush_lock:
+            with self._pending_lock:
+                pending, self.pending = self.pending, OrderedDict()
+            if len(pending) == 0:
+                return 0
+
+            num_flushed = 0
+            for session_id, session in pending.items():
+                try:
+                    written = self.storage.upsert(session=session)
+                except Exception as e:
+                    logger.warning(f"Error writing session {session_id}: {e}")
+                    written = None
+                if written is not None:
+                    num_flushed += 1
+                    continue
+                # Retry on the next flush, unless the session was written again since
+                self.num_failed += 1
+                with self._pending_lock:
+                    if session_id not in self.pending:
+                        self.pending[session_id] = session
+                        self.pending.move_to_end(session_id, last=False)
+            self.num_flushed += num_flushed
+            logger.debug(f"Flushed {num_flushed} of {len(pending)} sessions")
+            return num_flushed
+
+    def close(self) -> None:
+        """Stops the background flusher and writes the pending sessions"""
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=self.flush_interval + 1)
+            self._flusher = None
+        self.flush()
+
+    def info(self) -> Dict[str, Any]:
+        """Returns the cache and write counters"""
+        return {
+            "sessions": self.sessions.info(),
+            "pending": len(self.pending),
+            "writes": self.num_writes,
+            "flushed": self.num_flushed,
+            "failed": self.num_failed,
+        }
+
+    def _get_cached(self, session_id: str, user_id: Optional[str] = None) -> Optional[AgentSession]:
+        with self._pending_lock:
+            session = self.pending.get(session_id)
+        if session is None:
+            session = self.sessions.get(session_id)
+        if session is None or (user_id and session.user_id != user_id):
+            return None
+        # Agents update the session data they read in place
+        return session.model_copy(deep=True)
+
+    def create(self) -> None:
+        self.storage.create()
+
+    def read(self, session_id: str, user_id: Optional[str] = None) -> Optional[AgentSession]:
+        session = self._get_cached(session_id, user_id=user_id)
+        if session is not None:
+            return session
+        session = self.storage.read(session_id=session_id, user_id=user_id)
+        if session is not None:
+            self.sessions.set(session_id, session.model_copy(deep=True))
+        return session
+
+    async def aread(self, session_id: str, user_id: Optional[str] = None) -> Optional[AgentSession]:
+        session = self._get_cached(session_id, user_id=user_id)
+        if session is not None:
+            return session
+        session = await self.storage.aread(session_id=session_id, user_id=user_id)
+        if session is not None:
+            self.sessions.set(session_id, session.model_copy(deep=True))
+        return session
+
+    def get_all_session_ids(self, user_id: Optional[str] = None, agent_id: Optional[str] = None) -> List[str]:
+        self.flush()
+        return self.storage.get_all_session_ids(user_id=user_id, agent_id=agent_id)
+
+    def get_all_sessions(self, user_id: Optional[str] = None, agent_id: Optional[str] = None) -> List[AgentSession]:
+        self.flush()
+        return self.storage.get_all_sessions(user_id=user_id, agent_id=agent_id)
+
+    def _queue(self, session: AgentSession) -> bool:
+        """Caches and queues a session, and returns True if the pending writes should be flushed now"""
+        session = session.model_copy(deep=True)
+        self.sessions.set(session.session_id, session)
+        with self._pending_lock:
+            self.pending[session.session_id] = session
+            self.num_writes += 1
+            num_pending = len(self.pending)
+            num_writes = self.num_writes
+        self._start_flusher()
+        return num_pending >= self.max_pending or (self.sync_every is not None and num_writes % self.sync_every == 0)
+
+    def upsert(self, session: AgentSession) -> Optional[AgentSession]:
+        # Writes after close(), e.g. from post-run tasks at exit, are flushed immediately
+        if self._queue(session) or self._stop.is_set():
+            self.flush()
+        return session
+
+    async def aupsert(self, session: AgentSession) -> Optional[AgentSession]:
+        if self._queue(session) or self._stop.is_set():
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.flush)
+        return session
+
+    def delete_session(self, session_id: Optional[str] = None):
+        if session_id is not None:
+            # Wait for a flush in progress, so it does not write the session after it is deleted
+            with self._flush_lock, self._pending_lock:
+                self.pending.pop(session_id, None)
+                self.sessions.delete(session_id)
+        self.storage.delete_session(session_id=session_id)
+
+    def drop(self) -> None:
+        with self._flush_lock, self._pending_lock:
+            self.pending.clear()
+            self.sessions.clear()
+        self.storage.drop()
+
+    def upgrade_schema(self) -> None:
+        self.storage.upgrade_schema()
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> "WriteBehindAgentStorage":
+        """The cache is a shared resource, so copies of an Agent reuse the same WriteBehindAgentStorage"""
+        if memo is not None:
+            memo[id(self)] = self
+        return self
@@ -1,4 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
+from functools import partial
 from typing import Optional, List
 
 from phi.workflow.session import WorkflowSession
@@ -38,3 +40,31 @@ class WorkflowStorage(ABC):
     @abstractmethod
     def upgrade_schema(self) -> None:
         raise NotImplementedError
+
+    # Async versions of the methods used while running a Workflow.
+    # Storages with an async driver should override these, the defaults run the sync method in a thread
+    # so the event loop is not blocked.
+
+    async def acreate(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.create)
+
+    async def aread(self, session_id: str, user_id: Optional[str] = None) -> Optional[WorkflowSession]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.read, session_id=session_id, user_id=user_id))
+
+    async def aget_all_sessions(
+        self, user_id: Optional[str] = None, workflow_id: Optional[str] = None
+    ) -> List[WorkflowSession]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None, partial(self.get_all_sessions, user_id=user_id, workflow_id=workflow_id)
+        )
+
+    async def aupsert(self, session: WorkflowSession) -> Optional[WorkflowSession]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.upsert, session=session))
+
+    async def adelete_session(self, session_id: Optional[str] = None) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, partial(self.delete_session, session_id=session_id))
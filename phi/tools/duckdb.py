@@ -23,7 +23,8 @@ class DuckDbTools(Toolkit):
         summarize_tables: bool = True,
         export_tables: bool = False,
     ):
-        super().__init__(name="duckdb_tools")
+        # DuckDB connections cannot be shared between threads
+        super().__init__(name="duckdb_tools", thread_safe=False)
 
         self.db_path: Optional[str] = db_path
         self.read_only: bool = read_only
@@ -1,3 +1,6 @@
+import asyncio
+from functools import partial
+from inspect import iscoroutinefunction, isawaitable
 from typing import Any, Dict, Optional, Callable, get_type_hints
 from pydantic import BaseModel, validate_call
 
@@ -20,6 +23,8 @@ class Function(BaseModel):
 
     # If True, the arguments are sanitized before being passed to the function.
     sanitize_arguments: bool = True
+    # If False, the function is never run concurrently with other function calls.
+    thread_safe: bool = True
 
     def to_dict(self) -> Dict[str, Any]:
         return self.model_dump(exclude_none=True, include={"name", "description", "parameters", "strict"})
@@ -155,3 +160,31 @@ class FunctionCall(BaseModel):
             logger.exception(e)
             self.error = str(e)
             return False
+
+    async def aexecute(self) -> bool:
+        """Runs the function call without blocking the event loop.
+        Coroutine functions are awaited, other functions are run in a worker thread.
+
+        @return: True if the function call was successful, False otherwise.
+        """
+        if self.function.entrypoint is None:
+            return False
+
+        logger.debug(f"Running: {self.get_call_str()}")
+
+        entrypoint = self.function.entrypoint
+        arguments = self.arguments or {}
+        try:
+            if iscoroutinefunction(entrypoint):
+                self.result = await entrypoint(**arguments)
+            else:
+                loop = asyncio.get_running_loop()
+                self.result = await loop.run_in_executor(None, partial(entrypoint, **arguments))
+                if isawaitable(self.result):
+                    self.result = await self.result
+            return True
+        except Exception as e:
+            logger.warning(f"Could not run function {self.get_call_str()}")
+            logger.exception(e)
+            self.error = str(e)
+            return False
@@ -11,7 +11,8 @@ except ImportError:
 
 class PandasTools(Toolkit):
     def __init__(self):
-        super().__init__(name="pandas_tools")
+        # Functions share and mutate the same dataframes
+        super().__init__(name="pandas_tools", thread_safe=False)
 
         self.dataframes: Dict[str, pd.DataFrame] = {}
         self.register(self.create_pandas_dataframe)
@@ -25,7 +25,8 @@ class PythonTools(Toolkit):
         safe_globals: Optional[dict] = None,
         safe_locals: Optional[dict] = None,
     ):
-        super().__init__(name="python_tools")
+        # Code is executed in a shared global and local scope
+        super().__init__(name="python_tools", thread_safe=False)
 
         self.base_dir: Path = base_dir or Path.cwd()
 
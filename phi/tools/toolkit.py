@@ -6,9 +6,11 @@ from phi.utils.log import logger
 
 
 class Toolkit:
-    def __init__(self, name: str = "toolkit"):
+    def __init__(self, name: str = "toolkit", thread_safe: bool = True):
         self.name: str = name
         self.functions: Dict[str, Function] = OrderedDict()
+        # If False, functions from this toolkit are never run concurrently with other function calls.
+        self.thread_safe: bool = thread_safe
 
     def register(self, function: Callable, sanitize_arguments: bool = True):
         try:
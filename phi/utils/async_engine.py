@@ -0,0 +1,36 @@
+from typing import Any, Dict, List, Optional
+
+from phi.utils.log import logger
+
+# Async drivers to try for each database backend, in order
+ASYNC_DRIVERS: Dict[str, List[str]] = {
+    "postgresql": ["psycopg", "asyncpg"],
+    "sqlite": ["aiosqlite"],
+}
+
+
+def create_async_engine_for(engine: Any) -> Optional[Any]:
+    """Returns an SQLAlchemy AsyncEngine connected to the same database as a sync engine.
+
+    Returns None if the database has no installed async driver, or is an in-memory sqlite database
+    which an async engine cannot share with the sync engine.
+    """
+    try:
+        # Requires `greenlet`
+        from sqlalchemy.ext.asyncio import create_async_engine
+    except ImportError as e:
+        logger.debug(f"SQLAlchemy asyncio not available: {e}")
+        return None
+
+    url = engine.url
+    backend = url.get_backend_name()
+    if backend == "sqlite" and url.database in (None, "", ":memory:"):
+        return None
+
+    drivers = [url.get_driver_name()] + ASYNC_DRIVERS.get(backend, [])
+    for driver in dict.fromkeys(drivers):
+        try:
+            return create_async_engine(url.set(drivername=f"{backend}+{driver}"))
+        except Exception as e:
+            logger.debug(f"Async driver {backend}+{driver} not available: {e}")
+    return None
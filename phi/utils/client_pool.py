@@ -0,0 +1,186 @@
+import asyncio
+import atexit
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple, Type, TypeVar
+from weakref import WeakKeyDictionary
+
+from phi.utils.log import logger
+
+T = TypeVar("T")
+
+
+def _freeze(value: Any) -> Hashable:
+    """Returns a hashable version of a client parameter"""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if type(value).__name__ == "URL":
+        return str(value)
+    # Objects such as http clients and token providers are kept alive by the pooled client, so their id is stable
+    return ("id", id(value))
+
+
+def get_client_key(client_class: Type, params: Dict[str, Any]) -> Hashable:
+    """Returns the pool key of a client: its class and the parameters it is created with"""
+    return f"{client_class.__module__}.{client_class.__qualname__}", _freeze(params)
+
+
+def count_connections(client: Any) -> int:
+    """Returns the number of connections open in the httpx connection pool of a client, or 0 if it has none"""
+    # API clients wrap an httpx client, e.g. OpenAI, Anthropic, Groq and Ollama in _client and Mistral in its config
+    candidates = [client, getattr(client, "_client", None)]
+    sdk_configuration = getattr(client, "sdk_configuration", None)
+    if sdk_configuration is not None:
+        candidates.append(getattr(sdk_configuration, "client", None))
+    for http_client in candidates:
+        connections = getattr(getattr(getattr(http_client, "_transport", None), "_pool", None), "connections", None)
+        if connections is not None:
+            return len(connections)
+    return 0
+
+
+class ClientPool:
+    """Process-wide pool of API clients, keyed by the client class and the parameters it is created with.
+
+    Models and embedders get their clients from the pool, so runs with the same provider, base_url, api key
+    and timeout reuse one client and its connections, instead of opening new connections for every request.
+
+    Async clients are bound to the event loop they are created in, so they are pooled per event loop.
+    The pool keeps up to `max_clients` clients, and `max_clients` async clients per event loop. When it is full,
+    the least recently used client is closed.
+    """
+
+    def __init__(self, max_clients: int = 100):
+        # Maximum number of clients, and of async clients per event loop
+        self.max_clients: int = max_clients
+        self._clients: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._async_clients: "WeakKeyDictionary[asyncio.AbstractEventLoop, OrderedDict[Hashable, Any]]" = (
+            WeakKeyDictionary()
+        )
+        self._lock = Lock()
+        # Tasks closing evicted async clients, referenced until they are done
+        self._closing: Set["asyncio.Future[Any]"] = set()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def _get(self, clients: "OrderedDict[Hashable, Any]", key: Hashable, create: Callable[[], T]) -> T:
+        evicted: List[Tuple[Hashable, Any]] = []
+        with self._lock:
+            client = clients.get(key)
+            if client is not None:
+                self.hits += 1
+                clients.move_to_end(key)
+                return client
+            self.misses += 1
+            client = create()
+            clients[key] = client
+            logger.debug(f"Created pooled client: {key[0] if isinstance(key, tuple) else key}")
+            while len(clients) > self.max_clients:
+                evicted.append(clients.popitem(last=False))
+            self.evictions += len(evicted)
+
+        for evicted_key, evicted_client in evicted:
+            evicted_name = evicted_key[0] if isinstance(evicted_key, tuple) else evicted_key
+            logger.debug(f"Closing evicted pooled client: {evicted_name}")
+            self._close_evicted(evicted_client)
+        return client
+
+    def _close_evicted(self, client: Any) -> None:
+        close = getattr(client, "close", None) or getattr(client, "aclose", None)
+        if not callable(close):
+            return
+        try:
+            result = close()
+            if asyncio.iscoroutine(result):
+                # Async clients are evicted in the running event loop they belong to, where they are closed
+                task = asyncio.ensure_future(result)
+                self._closing.add(task)
+                task.add_done_callback(self._closing.discard)
+        except Exception as e:
+            logger.debug(f"Error closing client: {e}")
+
+    def get_client(
+        self, client_class: Callable[..., T], params: Dict[str, Any], create: Optional[Callable[[], T]] = None
+    ) -> T:
+        """Returns the pooled client created with these parameters, creating it if needed.
+
+        Args:
+            client_class: The client class.
+            params (Dict[str, Any]): Parameters to create the client with, which are part of the pool key.
+            create: Creates the client, if it is not created with client_class(**params).
+        """
+        key = get_client_key(client_class, params)  # type: ignore
+        return self._get(self._clients, key, create or (lambda: client_class(**params)))
+
+    def get_async_client(
+        self, client_class: Callable[..., T], params: Dict[str, Any], create: Optional[Callable[[], T]] = None
+    ) -> T:
+        """Returns the pooled async client for the running event loop, creating it if needed.
+
+        Outside an event loop, a new client is returned as it cannot be shared safely.
+        """
+        create = create or (lambda: client_class(**params))
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return create()
+        with self._lock:
+            clients = self._async_clients.setdefault(loop, OrderedDict())
+        key = get_client_key(client_class, params)  # type: ignore
+        return self._get(clients, key, create)
+
+    def info(self) -> Dict[str, Any]:
+        """Returns the pool hit/miss counters and the number of open connections"""
+        with self._lock:
+            clients = list(self._clients.values())
+            async_clients = [
+                client for loop_clients in self._async_clients.values() for client in loop_clients.values()
+            ]
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total > 0 else 0.0,
+            "clients": len(clients),
+            "async_clients": len(async_clients),
+            "evictions": self.evictions,
+            "open_connections": sum(count_connections(client) for client in clients + async_clients),
+        }
+
+    def close(self) -> None:
+        """Closes the pooled clients and their connections"""
+        with self._lock:
+            clients, self._clients = self._clients, OrderedDict()
+            async_clients, self._async_clients = dict(self._async_clients), WeakKeyDictionary()
+
+        for client in clients.values():
+            close = getattr(client, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as e:
+                    logger.debug(f"Error closing client: {e}")
+
+        # Async clients can only be closed in their event loop, if it is still usable
+        for loop, loop_clients in async_clients.items():
+            if loop.is_closed() or loop.is_running():
+                continue
+            for client in loop_clients.values():
+                close = getattr(client, "close", None) or getattr(client, "aclose", None)
+                if callable(close):
+                    try:
+                        result = close()
+                        if asyncio.iscoroutine(result):
+                            loop.run_until_complete(result)
+                    except Exception as e:
+                        logger.debug(f"Error closing async client: {e}")
+
+
+# The pool shared by all models and embedders in this process
+client_pool = ClientPool()
+atexit.register(client_pool.close)
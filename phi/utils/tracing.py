@@ -0,0 +1,215 @@
+import sys
+from contextvars import ContextVar
+from time import perf_counter, time
+from typing import Any, Dict, List, Optional, TextIO
+from uuid import uuid4
+
+from pydantic import BaseModel, Field, PrivateAttr
+
+from phi.utils.log import logger
+
+
+class Span(BaseModel):
+    """A timed stage of a run. Spans are nested using parent_id."""
+
+    name: str
+    trace_id: str
+    span_id: str = Field(default_factory=lambda: uuid4().hex[:16])
+    parent_id: Optional[str] = None
+    # Unix timestamps of when the span started and ended
+    start_time: Optional[float] = None
+    end_time: Optional[float] = None
+    # Duration of the span in seconds
+    duration: Optional[float] = None
+    attributes: Dict[str, Any] = Field(default_factory=dict)
+    # Error raised in the span
+    error: Optional[str] = None
+
+    _trace: Optional["Trace"] = PrivateAttr(default=None)
+    _start_counter: float = PrivateAttr(default=0.0)
+    _previous_trace: Optional["Trace"] = PrivateAttr(default=None)
+    _previous_span: Optional["Span"] = PrivateAttr(default=None)
+    _active: bool = PrivateAttr(default=False)
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def start(self, activate: bool = True) -> "Span":
+        """Starts the span. If activate is True, it is the parent of the spans started in this context until it ends."""
+        if activate:
+            parent = _current_span.get()
+            if parent is not None and parent.trace_id == self.trace_id:
+                self.parent_id = parent.span_id
+            self._previous_trace = _current_trace.get()
+            self._previous_span = parent
+            _current_trace.set(self._trace)
+            _current_span.set(self)
+            self._active = True
+        self.start_time = time()
+        self._start_counter = perf_counter()
+        if self._trace is not None:
+            self._trace.spans.append(self)
+        return self
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        """Ends the span and restores the span that was active when it started"""
+        self.duration = perf_counter() - self._start_counter
+        self.end_time = (self.start_time or 0) + self.duration
+        if error is not None:
+            self.error = f"{type(error).__name__}: {error}"
+        if self._active:
+            # Generators can resume in a copy of the context the span was started in, so the previous values
+            # are set instead of resetting a token
+            _current_trace.set(self._previous_trace)
+            _current_span.set(self._previous_span)
+            self._active = False
+
+    def __enter__(self) -> "Span":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.end(error=exc_value)
+
+
+class NoOpSpan:
+    """Span returned when tracing is disabled, which records nothing"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def start(self, activate: bool = True) -> "NoOpSpan":
+        return self
+
+    def end(self, error: Optional[BaseException] = None) -> None:
+        pass
+
+    def __enter__(self) -> "NoOpSpan":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        pass
+
+
+NOOP_SPAN = NoOpSpan()
+
+
+class Trace:
+    """The spans recorded during a run, in the order they started.
+
+    The trace starts a root span, which is the parent of the spans started without a parent in their context.
+    The root span is not activated, so spans are only recorded in the context of the spans started from the trace.
+    """
+
+    def __init__(self, name: str = "run", trace_id: Optional[str] = None, **attributes: Any):
+        self.trace_id: str = trace_id or uuid4().hex
+        self.spans: List[Span] = []
+        self.root: Optional[Span] = None
+        self.root = self.span(name, **attributes).start(activate=False)
+
+    def span(self, name: str, **attributes: Any) -> Span:
+        """Returns a span in this trace, to use as a context manager"""
+        span = Span(
+            name=name,
+            trace_id=self.trace_id,
+            parent_id=self.root.span_id if self.root is not None else None,
+            attributes=attributes,
+        )
+        span._trace = self
+        return span
+
+    def end(self, error: Optional[BaseException] = None) -> List[Span]:
+        """Ends the root span and returns the spans in the trace"""
+        if self.root is not None and self.root.end_time is None:
+            self.root.end(error=error)
+        return self.spans
+
+    def get_durations(self) -> Dict[str, float]:
+        """Returns the total duration of the spans with each name"""
+        durations: Dict[str, float] = {}
+        for span in self.spans:
+            if span.duration is not None:
+                durations[span.name] = durations.get(span.name, 0.0) + span.duration
+        return durations
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("phi_current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("phi_current_span", default=None)
+
+
+def span(name: str, **attributes: Any):
+    """Returns a span in the current trace, or a span that records nothing when no trace is active.
+
+    Usage:
+        with span("knowledge.search", num_documents=5) as s:
+            documents = ...
+            s.set_attribute("num_results", len(documents))
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        return NOOP_SPAN
+    return trace.span(name, **attributes)
+
+
+def get_current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+class TraceExporter:
+    """Exports the spans of a run when it completes"""
+
+    def export(self, spans: List[Span]) -> None:
+        raise NotImplementedError
+
+
+class JsonTraceExporter(TraceExporter):
+    """Writes each span as a line of JSON, to stdout by default"""
+
+    def __init__(self, file: Optional[TextIO] = None):
+        self.file: Optional[TextIO] = file
+
+    def export(self, spans: List[Span]) -> None:
+        file = self.file or sys.stdout
+        for _span in spans:
+            file.write(_span.model_dump_json() + "\n")
+        file.flush()
+
+
+class OpenTelemetryTraceExporter(TraceExporter):
+    """Exports spans to OpenTelemetry, using the global tracer provider unless one is given"""
+
+    def __init__(self, tracer_provider: Optional[Any] = None, tracer_name: str = "phi"):
+        try:
+            import opentelemetry.trace as otel_trace
+        except ImportError:
+            raise ImportError("`opentelemetry-api` not installed. Please install using `pip install opentelemetry-api`")
+
+        self.otel_trace = otel_trace
+        self.tracer = otel_trace.get_tracer(tracer_name, tracer_provider=tracer_provider)
+
+    @staticmethod
+    def _get_attribute(value: Any) -> Any:
+        if isinstance(value, (str, bool, int, float)):
+            return value
+        return str(value)
+
+    def export(self, spans: List[Span]) -> None:
+        otel_spans: Dict[str, Any] = {}
+        # Spans are in the order they started, so parents are created before their children
+        for _span in spans:
+            if _span.start_time is None or _span.end_time is None:
+                continue
+            parent = otel_spans.get(_span.parent_id) if _span.parent_id is not None else None
+            context = self.otel_trace.set_span_in_context(parent) if parent is not None else None
+            otel_span = self.tracer.start_span(
+                _span.name,
+                context=context,
+                start_time=int(_span.start_time * 1e9),
+                attributes={k: self._get_attribute(v) for k, v in _span.attributes.items() if v is not None},
+            )
+            if _span.error is not None:
+                otel_span.set_status(self.otel_trace.Status(self.otel_trace.StatusCode.ERROR, _span.error))
+            otel_spans[_span.span_id] = otel_span
+        for _span in spans:
+            if _span.span_id in otel_spans:
+                otel_spans[_span.span_id].end(end_time=int(_span.end_time * 1e9))  # type: ignore
+        logger.debug(f"Exported {len(otel_spans)} spans to OpenTelemetry")
@@ -1,7 +1,81 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from hashlib import md5
+from typing import Deque, Iterator, List, Optional, Dict, Any, Set
 
 from phi.document import Document
+from phi.document.base import is_reusing_embeddings
+from phi.embedder.base import Embedder, mark_embedding_worker
+from phi.vectordb.search import SearchResult
+
+
+def get_content_hash(document: Document) -> str:
+    """Returns the hash of the document content, as stored by the vector dbs"""
+    cleaned_content = document.content.replace("\x00", "\ufffd")
+    return md5(cleaned_content.encode()).hexdigest()
+
+
+def embed_batches(documents: List[Document], embedder: Embedder, batch_size: int) -> Iterator["Future[List[Document]]"]:
+    """Splits documents into batches and embeds them on background threads, ahead of the caller writing them.
+
+    Yields a future for each batch of `batch_size` documents, in order. Its result is the batch with its documents
+    embedded, or it raises the error from embedding the batch. Documents are embedded in groups of at least
+    `embedder.batch_size`, so small write batches do not make more embedding requests, and while the caller writes
+    a batch the next `embedder.concurrent_requests` groups are embedded.
+
+    Usage:
+        for batch_future in embed_batches(documents, embedder, batch_size):
+            batch_docs = batch_future.result()
+            # write batch_docs
+    """
+    batch_size = max(batch_size, 1)
+    if len(documents) == 0:
+        return
+    # Embedding runs on other threads, so reuse_embeddings() of the caller is passed on
+    reuse_existing = is_reusing_embeddings()
+
+    # Number of write batches embedded together
+    batches_per_group = max(-(-getattr(embedder, "batch_size", 1) // batch_size), 1)
+    group_size = batch_size * batches_per_group
+    groups = [documents[i : i + group_size] for i in range(0, len(documents), group_size)]
+
+    def embed(group: List[Document]) -> List[Document]:
+        Document.embed_documents(group, embedder=embedder, reuse_existing=reuse_existing)
+        return group
+
+    num_ahead = max(getattr(embedder, "concurrent_requests", 1), 1)
+    executor = ThreadPoolExecutor(
+        max_workers=num_ahead, thread_name_prefix="phi-embed", initializer=mark_embedding_worker
+    )
+    pending: Deque["Future[List[Document]]"] = deque()
+    try:
+        next_group = 0
+        for group in groups:
+            # Keep the next groups embedding while the caller writes the current one
+            while next_group < len(groups) and len(pending) <= num_ahead:
+                pending.append(executor.submit(embed, groups[next_group]))
+                next_group += 1
+            error: Optional[BaseException] = None
+            try:
+                pending.popleft().result()
+            except Exception as e:
+                error = e
+            for i in range(0, len(group), batch_size):
+                batch_future: "Future[List[Document]]" = Future()
+                if error is not None:
+                    # Each batch of a group that failed to embed raises the error
+                    batch_future.set_exception(error)
+                else:
+                    batch_future.set_result(group[i : i + batch_size])
+                yield batch_future
+    finally:
+        # If the caller stopped early, do not embed the remaining groups
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
 
 
 class VectorDb(ABC):
@@ -15,6 +89,20 @@ class VectorDb(ABC):
     def doc_exists(self, document: Document) -> bool:
         raise NotImplementedError
 
+    def existing_content_hashes(self, documents: List[Document]) -> Set[str]:
+        """Returns the content hashes of the documents which already exist in the vector db.
+
+        Vector dbs should override this with a bulk lookup, the default checks one document at a time.
+        """
+        return {get_content_hash(document) for document in documents if self.doc_exists(document)}
+
+    def filter_new_documents(self, documents: List[Document]) -> List[Document]:
+        """Returns the documents which do not exist in the vector db"""
+        if len(documents) == 0:
+            return documents
+        existing_hashes = self.existing_content_hashes(documents)
+        return [document for document in documents if get_content_hash(document) not in existing_hashes]
+
     @abstractmethod
     def name_exists(self, name: str) -> bool:
         raise NotImplementedError
@@ -37,6 +125,45 @@ class VectorDb(ABC):
     def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
         raise NotImplementedError
 
+    def search_results(
+        self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[SearchResult]:
+        """Returns the results of a search without their embeddings, as used by Agents.
+
+        Vector dbs should override this to not fetch the embeddings, the default converts the results of `search`.
+        """
+        return [
+            SearchResult.from_document(document) for document in self.search(query=query, limit=limit, filters=filters)
+        ]
+
+    # Async versions of the methods used while running an Agent.
+    # Vector dbs with an async client should override these, the defaults run the sync method in a thread
+    # so the event loop is not blocked.
+
+    async def async_search(
+        self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.search, query=query, limit=limit, filters=filters))
+
+    async def async_search_results(
+        self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[SearchResult]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(self.search_results, query=query, limit=limit, filters=filters))
+
+    async def async_insert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, partial(self.insert, documents=documents, filters=filters))
+
+    async def async_upsert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, partial(self.upsert, documents=documents, filters=filters))
+
+    async def async_exists(self) -> bool:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.exists)
+
     def vector_search(self, query: str, limit: int = 5) -> List[Document]:
         raise NotImplementedError
 
@@ -60,3 +187,7 @@ class VectorDb(ABC):
     @abstractmethod
     def delete(self) -> bool:
         raise NotImplementedError
+
+    def delete_by_name(self, name: str) -> bool:
+        """Deletes all documents with the given name"""
+        raise NotImplementedError
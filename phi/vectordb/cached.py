@@ -0,0 +1,292 @@
+import json
+from threading import Lock
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pydantic import PrivateAttr
+
+from phi.document import Document
+from phi.embedder.base import Embedder
+from phi.utils.cache import LRUCache
+from phi.utils.log import logger
+from phi.vectordb.base import VectorDb
+from phi.vectordb.search import SearchResult
+
+
+def _copy_documents(documents: List[Document]) -> List[Document]:
+    """Copies documents so callers can modify search results without changing the cached results"""
+    return [document.model_copy(update={"meta_data": dict(document.meta_data)}) for document in documents]
+
+
+def _copy_results(results: List[SearchResult]) -> List[SearchResult]:
+    """Copies the meta data of search results so callers can modify it without changing the cached results"""
+    return [
+        result._replace(meta_data=dict(result.meta_data)) if result.meta_data is not None else result
+        for result in results
+    ]
+
+
+class QueryEmbeddingCache(Embedder):
+    """Embedder that caches the embeddings of single texts, such as search queries, in memory.
+
+    Batches of texts are embedded while loading documents, so they are passed through to the embedder uncached.
+    """
+
+    # The embedder to cache query embeddings for
+    embedder: Embedder
+    # Maximum number of embeddings to keep in memory
+    max_entries: int = 1000
+    # Seconds after which an embedding expires. If None, embeddings only leave the cache when it is full.
+    ttl: Optional[float] = None
+
+    _cache: Any = PrivateAttr(default=None)
+
+    def model_post_init(self, __context: Any) -> None:
+        # Vector dbs read the dimensions and batch size from the embedder they are given
+        self.dimensions = self.embedder.dimensions
+        self.batch_size = self.embedder.batch_size
+        self.max_batch_tokens = self.embedder.max_batch_tokens
+        self.concurrent_requests = self.embedder.concurrent_requests
+        self._cache = LRUCache(max_entries=self.max_entries, ttl=self.ttl)
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.get_embedding_and_usage(text)[0]
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        cached = self._cache.get(text)
+        if cached is not None:
+            return cached, None
+        embedding, usage = self.embedder.get_embedding_and_usage(text)
+        # Do not cache failed embeddings
+        if embedding:
+            self._cache.set(text, embedding)
+        return embedding, usage
+
+    def get_embeddings_batch(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        return self.embedder.get_embeddings_batch(texts)
+
+    def cache_info(self) -> Dict[str, Any]:
+        return self._cache.info()
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> "QueryEmbeddingCache":
+        if memo is not None:
+            memo[id(self)] = self
+        return self
+
+
+class CachedVectorDb(VectorDb):
+    """Vector db that caches the search results and query embeddings of another vector db.
+
+    Search results are keyed by (query, limit, filters, search type) and are invalidated by a generation
+    counter, which is incremented when documents are written to or deleted from the vector db through this class.
+    Results also expire after `ttl` seconds, so writes made by other processes become visible.
+
+    Query embeddings do not depend on the contents of the vector db, so they remain cached across writes.
+    To cache them, the embedder of the wrapped vector db is replaced with a `QueryEmbeddingCache`.
+    """
+
+    def __init__(
+        self,
+        vector_db: VectorDb,
+        max_entries: int = 1000,
+        ttl: Optional[float] = 300,
+        cache_query_embeddings: bool = True,
+        max_embedding_entries: int = 1000,
+    ):
+        # The vector db to cache search results for
+        self.vector_db: VectorDb = vector_db
+        # Cache of search results, keyed by the kind of result and the search arguments.
+        # Documents are cached for `search`, and SearchResults without embeddings for `search_results`.
+        self.results: LRUCache[Tuple[int, List[Any]]] = LRUCache(max_entries=max_entries, ttl=ttl)
+        # Incremented on every write, results cached in an earlier generation are not returned
+        self.generation: int = 0
+        self._generation_lock = Lock()
+
+        self.query_embeddings: Optional[QueryEmbeddingCache] = None
+        embedder = getattr(vector_db, "embedder", None)
+        if cache_query_embeddings and isinstance(embedder, QueryEmbeddingCache):
+            self.query_embeddings = embedder
+        elif cache_query_embeddings and isinstance(embedder, Embedder):
+            self.query_embeddings = QueryEmbeddingCache(embedder=embedder, max_entries=max_embedding_entries)
+            setattr(vector_db, "embedder", self.query_embeddings)
+
+    def __getattr__(self, name: str) -> Any:
+        # Attributes specific to the wrapped vector db, e.g. the embedder or search type
+        if name == "vector_db":
+            raise AttributeError(name)
+        return getattr(self.vector_db, name)
+
+    def invalidate(self) -> None:
+        """Marks all cached search results as stale"""
+        with self._generation_lock:
+            self.generation += 1
+
+    def get_cache_key(
+        self, query: str, limit: int, filters: Optional[Dict[str, Any]], kind: str = "documents"
+    ) -> Tuple[str, str, int, str, str]:
+        search_type = getattr(self.vector_db, "search_type", None)
+        return (
+            kind,
+            query,
+            limit,
+            json.dumps(filters, sort_keys=True, default=str) if filters else "",
+            str(getattr(search_type, "value", search_type)),
+        )
+
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        key = self.get_cache_key(query, limit, filters)
+        cached = self.results.get(key)
+        if cached is not None and cached[0] == self.generation:
+            logger.debug(f"Using cached search results for query: {query}")
+            return _copy_documents(cached[1])
+
+        # Read the generation before searching, so a write during the search makes the results stale
+        generation = self.generation
+        documents = self.vector_db.search(query=query, limit=limit, filters=filters)
+        self.results.set(key, (generation, _copy_documents(documents)))
+        return documents
+
+    async def async_search(
+        self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        key = self.get_cache_key(query, limit, filters)
+        cached = self.results.get(key)
+        if cached is not None and cached[0] == self.generation:
+            logger.debug(f"Using cached search results for query: {query}")
+            return _copy_documents(cached[1])
+
+        generation = self.generation
+        documents = await self.vector_db.async_search(query=query, limit=limit, filters=filters)
+        self.results.set(key, (generation, _copy_documents(documents)))
+        return documents
+
+    def search_results(
+        self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[SearchResult]:
+        key = self.get_cache_key(query, limit, filters, kind="results")
+        cached = self.results.get(key)
+        if cached is not None and cached[0] == self.generation:
+            logger.debug(f"Using cached search results for query: {query}")
+            return _copy_results(cached[1])
+
+        generation = self.generation
+        results = self.vector_db.search_results(query=query, limit=limit, filters=filters)
+        self.results.set(key, (generation, _copy_results(results)))
+        return results
+
+    async def async_search_results(
+        self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[SearchResult]:
+        key = self.get_cache_key(query, limit, filters, kind="results")
+        cached = self.results.get(key)
+        if cached is not None and cached[0] == self.generation:
+            logger.debug(f"Using cached search results for query: {query}")
+            return _copy_results(cached[1])
+
+        generation = self.generation
+        results = await self.vector_db.async_search_results(query=query, limit=limit, filters=filters)
+        self.results.set(key, (generation, _copy_results(results)))
+        return results
+
+    def cache_info(self) -> Dict[str, Any]:
+        """Returns the hit/miss counters of the search result and query embedding caches"""
+        return {
+            "generation": self.generation,
+            "results": self.results.info(),
+            "query_embeddings": self.query_embeddings.cache_info() if self.query_embeddings is not None else None,
+        }
+
+    def clear(self) -> None:
+        """Removes all cached search results and query embeddings"""
+        self.results.clear()
+        if self.query_embeddings is not None:
+            self.query_embeddings.clear()
+
+    def create(self) -> None:
+        self.vector_db.create()
+
+    def doc_exists(self, document: Document) -> bool:
+        return self.vector_db.doc_exists(document)
+
+    def existing_content_hashes(self, documents: List[Document]) -> Set[str]:
+        return self.vector_db.existing_content_hashes(documents)
+
+    def filter_new_documents(self, documents: List[Document]) -> List[Document]:
+        return self.vector_db.filter_new_documents(documents)
+
+    def name_exists(self, name: str) -> bool:
+        return self.vector_db.name_exists(name)
+
+    def id_exists(self, id: str) -> bool:
+        return self.vector_db.id_exists(id)
+
+    def insert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        try:
+            self.vector_db.insert(documents=documents, filters=filters)
+        finally:
+            self.invalidate()
+
+    async def async_insert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        try:
+            await self.vector_db.async_insert(documents=documents, filters=filters)
+        finally:
+            self.invalidate()
+
+    def upsert_available(self) -> bool:
+        return self.vector_db.upsert_available()
+
+    def upsert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        try:
+            self.vector_db.upsert(documents=documents, filters=filters)
+        finally:
+            self.invalidate()
+
+    async def async_upsert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        try:
+            await self.vector_db.async_upsert(documents=documents, filters=filters)
+        finally:
+            self.invalidate()
+
+    def vector_search(self, query: str, limit: int = 5) -> List[Document]:
+        return self.vector_db.vector_search(query=query, limit=limit)
+
+    def keyword_search(self, query: str, limit: int = 5) -> List[Document]:
+        return self.vector_db.keyword_search(query=query, limit=limit)
+
+    def hybrid_search(self, query: str, limit: int = 5) -> List[Document]:
+        return self.vector_db.hybrid_search(query=query, limit=limit)
+
+    def drop(self) -> None:
+        try:
+            self.vector_db.drop()
+        finally:
+            self.invalidate()
+
+    def exists(self) -> bool:
+        return self.vector_db.exists()
+
+    async def async_exists(self) -> bool:
+        return await self.vector_db.async_exists()
+
+    def optimize(self) -> None:
+        self.vector_db.optimize()
+
+    def delete(self) -> bool:
+        try:
+            return self.vector_db.delete()
+        finally:
+            self.invalidate()
+
+    def delete_by_name(self, name: str) -> bool:
+        try:
+            return self.vector_db.delete_by_name(name)
+        finally:
+            self.invalidate()
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> "CachedVectorDb":
+        """The cache is a shared resource, so copies of an Agent or knowledge base reuse the same CachedVectorDb"""
+        if memo is not None:
+            memo[id(self)] = self
+        return self
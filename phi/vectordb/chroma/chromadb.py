@@ -1,5 +1,5 @@
 from hashlib import md5
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set
 
 try:
     from chromadb import Client as ChromaDbClient
@@ -14,7 +14,7 @@ except ImportError:
 from phi.document import Document
 from phi.embedder import Embedder
 from phi.embedder.openai import OpenAIEmbedder
-from phi.vectordb.base import VectorDb
+from phi.vectordb.base import VectorDb, embed_batches, get_content_hash
 from phi.vectordb.distance import Distance
 from phi.utils.log import logger
 
@@ -96,6 +96,25 @@ class ChromaDb(VectorDb):
                 logger.error(f"Document does not exist: {e}")
         return False
 
+    def existing_content_hashes(self, documents: List[Document]) -> Set[str]:
+        """Get the content hashes of the documents which exist in the collection.
+        Args:
+            documents (List[Document]): Documents to check.
+        Returns:
+            Set[str]: Content hashes of the documents which exist.
+        """
+        if not self.client:
+            return set()
+        try:
+            collection: Collection = self.client.get_collection(name=self.collection)
+            collection_data: GetResult = collection.get(
+                ids=list({get_content_hash(document) for document in documents}), include=[]
+            )
+            return set(collection_data.get("ids", []))
+        except Exception as e:
+            logger.error(f"Error checking if documents exist: {e}")
+        return set()
+
     def name_exists(self, name: str) -> bool:
         """Check if a document with a given name exists in the collection.
         Args:
@@ -112,60 +131,69 @@ class ChromaDb(VectorDb):
                 logger.error(f"Document with given name does not exist: {e}")
         return False
 
-    def insert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+    def insert(
+        self, documents: List[Document], filters: Optional[Dict[str, Any]] = None, batch_size: int = 100
+    ) -> None:
         """Insert documents into the collection.
 
         Args:
             documents (List[Document]): List of documents to insert
             filters (Optional[Dict[str, Any]]): Filters to apply while inserting documents
+            batch_size (int): Number of documents written to the collection at a time
         """
         logger.debug(f"Inserting {len(documents)} documents")
-        ids: List = []
-        docs: List = []
-        docs_embeddings: List = []
-
-        for document in documents:
-            document.embed(embedder=self.embedder)
-            cleaned_content = document.content.replace("\x00", "\ufffd")
-            doc_id = md5(cleaned_content.encode()).hexdigest()
-            docs_embeddings.append(document.embedding)
-            docs.append(cleaned_content)
-            ids.append(doc_id)
-            logger.debug(f"Inserted document: {document.id} | {document.name} | {document.meta_data}")
-
-        if len(docs) > 0 and self._collection is not None:
-            self._collection.add(ids=ids, embeddings=docs_embeddings, documents=docs)
-            logger.debug(f"Committed {len(docs)} documents")
-        else:
+        if self._collection is None:
             logger.error("Collection does not exist")
-
-    def upsert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+            return
+
+        # Each batch is embedded in the background while the previous batch is written
+        for batch_future in embed_batches(documents, self.embedder, batch_size):
+            ids: List = []
+            docs: List = []
+            docs_embeddings: List = []
+            for document in batch_future.result():
+                cleaned_content = document.content.replace("\x00", "\ufffd")
+                doc_id = md5(cleaned_content.encode()).hexdigest()
+                docs_embeddings.append(document.embedding)
+                docs.append(cleaned_content)
+                ids.append(doc_id)
+                logger.debug(f"Inserted document: {document.id} | {document.name} | {document.meta_data}")
+
+            if len(docs) > 0:
+                self._collection.add(ids=ids, embeddings=docs_embeddings, documents=docs)
+                logger.debug(f"Committed {len(docs)} documents")
+
+    def upsert(
+        self, documents: List[Document], filters: Optional[Dict[str, Any]] = None, batch_size: int = 100
+    ) -> None:
         """Upsert documents into the collection.
 
         Args:
             documents (List[Document]): List of documents to upsert
             filters (Optional[Dict[str, Any]]): Filters to apply while upserting
+            batch_size (int): Number of documents written to the collection at a time
         """
         logger.debug(f"Upserting {len(documents)} documents")
-        ids: List = []
-        docs: List = []
-        docs_embeddings: List = []
-
-        for document in documents:
-            document.embed(embedder=self.embedder)
-            cleaned_content = document.content.replace("\x00", "\ufffd")
-            doc_id = md5(cleaned_content.encode()).hexdigest()
-            docs_embeddings.append(document.embedding)
-            docs.append(cleaned_content)
-            ids.append(doc_id)
-            logger.debug(f"Upserted document: {document.id} | {document.name} | {document.meta_data}")
-
-        if len(docs) > 0 and self._collection is not None:
-            self._collection.upsert(ids=ids, embeddings=docs_embeddings, documents=docs)
-            logger.debug(f"Committed {len(docs)} documents")
-
-        else:
+        if self._collection is None:
             logger.error("Collection does not exist")
+            return
+
+        # Each batch is embedded in the background while the previous batch is written
+        for batch_future in embed_batches(documents, self.embedder, batch_size):
+            ids: List = []
+            docs: List = []
+            docs_embeddings: List = []
+            for document in batch_future.result():
+                cleaned_content = document.content.replace("\x00", "\ufffd")
+                doc_id = md5(cleaned_content.encode()).hexdigest()
+                docs_embeddings.append(document.embedding)
+                docs.append(cleaned_content)
+                ids.append(doc_id)
+                logger.debug(f"Upserted document: {document.id} | {document.name} | {document.meta_data}")
+
+            if len(docs) > 0:
+                self._collection.upsert(ids=ids, embeddings=docs_embeddings, documents=docs)
+                logger.debug(f"Committed {len(docs)} documents")
 
     def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
         """Search the collection for a query.
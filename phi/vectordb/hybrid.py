@@ -0,0 +1,391 @@
+import json
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import md5
+from inspect import signature
+from pathlib import Path
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, TypeVar
+
+from phi.document import Document
+from phi.utils.log import logger
+from phi.vectordb.base import VectorDb, get_content_hash
+from phi.vectordb.cached import CachedVectorDb
+from phi.vectordb.search import SearchResult, SearchType
+
+T = TypeVar("T", Document, SearchResult)
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class KeywordIndex:
+    """Local BM25 full-text index of documents, for vector dbs without full-text search.
+
+    Documents are stored in a SQLite FTS5 table, keyed by their content hash, in memory or in `db_file`.
+    Persist the index to a file to search documents loaded by an earlier process.
+    """
+
+    def __init__(self, db_file: Optional[str] = None, table_name: str = "keyword_index"):
+        if not table_name.isidentifier():
+            raise ValueError(f"Invalid table_name: {table_name}")
+        # Sqlite database file used to persist the index. If None, the index is kept in memory.
+        self.db_file: Optional[str] = db_file
+        # Table to store the documents in
+        self.table_name: str = table_name
+
+        self._connection: Optional[sqlite3.Connection] = None
+        self._lock = Lock()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            if self.db_file is not None:
+                db_path = Path(self.db_file).resolve()
+                db_path.parent.mkdir(parents=True, exist_ok=True)
+                logger.debug(f"Opening keyword index: {db_path}")
+                self._connection = sqlite3.connect(str(db_path), check_same_thread=False)
+            else:
+                self._connection = sqlite3.connect(":memory:", check_same_thread=False)
+            self._connection.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {self.table_name} USING fts5("
+                "content, name UNINDEXED, meta_data UNINDEXED, filters UNINDEXED, tokenize='porter unicode61')"
+            )
+            self._connection.commit()
+        return self._connection
+
+    @staticmethod
+    def get_rowid(content_hash: str) -> int:
+        """Returns the rowid of a document, derived from its content hash so writing a document again replaces it"""
+        return int(content_hash[:15], 16)
+
+    def add(self, documents: Sequence[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        """Adds documents to the index, replacing documents with the same content"""
+        if len(documents) == 0:
+            return
+        filters_json = json.dumps(filters) if filters is not None else None
+        rows = [
+            (
+                self.get_rowid(get_content_hash(document)),
+                document.content.replace("\x00", "�"),
+                document.name,
+                json.dumps(document.meta_data),
+                filters_json,
+            )
+            for document in documents
+        ]
+        with self._lock:
+            self.connection.executemany(
+                f"INSERT OR REPLACE INTO {self.table_name} (rowid, content, name, meta_data, filters) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self.connection.commit()
+
+    def existing_content_hashes(self, documents: Sequence[Document]) -> Set[str]:
+        """Returns the content hashes of the documents in the index"""
+        hashes = {self.get_rowid(content_hash): content_hash for content_hash in map(get_content_hash, documents)}
+        existing: Set[str] = set()
+        rowids = list(hashes.keys())
+        with self._lock:
+            # Stay below the default limit of 999 variables in a statement
+            for i in range(0, len(rowids), 500):
+                chunk = rowids[i : i + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                cursor = self.connection.execute(
+                    f"SELECT rowid FROM {self.table_name} WHERE rowid IN ({placeholders})", chunk
+                )
+                existing.update(hashes[row[0]] for row in cursor)
+        return existing
+
+    @staticmethod
+    def get_match_expression(query: str) -> Optional[str]:
+        """Returns an FTS5 query matching any word of the query, so punctuation and operators in it are ignored"""
+        tokens = _TOKEN_PATTERN.findall(query.lower())
+        if len(tokens) == 0:
+            return None
+        return " OR ".join(f'"{token}"' for token in dict.fromkeys(tokens))
+
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """Returns the documents matching the query, ranked by BM25"""
+        match_expression = self.get_match_expression(query)
+        if match_expression is None or limit <= 0:
+            return []
+
+        sql = f"SELECT content, name, meta_data FROM {self.table_name} WHERE {self.table_name} MATCH ?"
+        params: List[Any] = [match_expression]
+        for key, value in (filters or {}).items():
+            sql += " AND json_extract(filters, ?) = ?"
+            params.extend([f'$."{key}"', json.dumps(value) if isinstance(value, (dict, list)) else value])
+        sql += f" ORDER BY bm25({self.table_name}) LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self.connection.execute(sql, params).fetchall()
+        return [
+            Document(content=content, name=name, meta_data=json.loads(meta_data) if meta_data else {})
+            for content, name, meta_data in rows
+        ]
+
+    def delete_by_name(self, name: str) -> None:
+        with self._lock:
+            self.connection.execute(f"DELETE FROM {self.table_name} WHERE name = ?", (name,))
+            self.connection.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.connection.execute(f"DELETE FROM {self.table_name}")
+            self.connection.commit()
+
+    def count(self) -> int:
+        with self._lock:
+            return self.connection.execute(f"SELECT COUNT(*) FROM {self.table_name}").fetchone()[0]
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def reciprocal_rank_fusion(
+    result_lists: Sequence[Sequence[T]], weights: Optional[Sequence[float]] = None, k: int = 60, limit: int = 5
+) -> List[T]:
+    """Fuses ranked result lists into one, scoring each result by the sum of weight / (k + rank) over the lists.
+
+    Results are identified by the hash of their content, the first occurrence of a result is returned.
+    """
+    weights = weights or [1.0] * len(result_lists)
+    scores: Dict[str, float] = {}
+    results: Dict[str, T] = {}
+    for result_list, weight in zip(result_lists, weights):
+        for rank, result in enumerate(result_list, start=1):
+            key = md5(result.content.replace("\x00", "�").encode()).hexdigest()
+            scores[key] = scores.get(key, 0.0) + weight / (k + rank)
+            results.setdefault(key, result)
+    ranked = sorted(scores, key=lambda key: scores[key], reverse=True)
+    return [results[key] for key in ranked[:limit]]
+
+
+class HybridVectorDb(VectorDb):
+    """Vector db that adds hybrid search to another vector db.
+
+    Each search runs a vector search and a keyword search concurrently, each for `num_candidates` results,
+    and fuses them with reciprocal rank fusion, weighting the vector results by `vector_weight`.
+
+    Vector dbs with full-text search, such as PgVector and LanceDb, are searched using their `keyword_search`.
+    For the others, documents written through this class are added to a local BM25 `KeywordIndex`.
+    Documents skipped by a knowledge base load because they already exist in the vector db are also indexed.
+    """
+
+    def __init__(
+        self,
+        vector_db: VectorDb,
+        keyword_index: Optional[KeywordIndex] = None,
+        use_native_keyword_search: bool = True,
+        vector_weight: float = 0.5,
+        rrf_k: int = 60,
+        num_candidates: Optional[int] = None,
+    ):
+        if not 0 <= vector_weight <= 1:
+            raise ValueError("vector_weight must be between 0 and 1")
+
+        # The vector db to add hybrid search to
+        self.vector_db: VectorDb = vector_db
+        # The vector db that runs the vector_search and keyword_search, inside any CachedVectorDb
+        self.search_db: VectorDb = self._unwrap(vector_db)
+        # Use the full-text search of the vector db, if it has one, instead of the local keyword index
+        self.use_native_keyword_search: bool = use_native_keyword_search and self._has_keyword_search(self.search_db)
+        # Local index for keyword search, when the vector db has no full-text search
+        self.keyword_index: Optional[KeywordIndex] = None
+        if not self.use_native_keyword_search:
+            self.keyword_index = keyword_index or KeywordIndex()
+        # Weight of the vector search results in the fusion, the keyword results are weighted 1 - vector_weight
+        self.vector_weight: float = vector_weight
+        # Constant added to the ranks in reciprocal rank fusion, higher values flatten the scores of top results
+        self.rrf_k: int = rrf_k
+        # Number of results retrieved by each search before fusing them. Defaults to 4 * limit.
+        self.num_candidates: Optional[int] = num_candidates
+        self.search_type: SearchType = SearchType.hybrid
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = Lock()
+
+    @staticmethod
+    def _unwrap(vector_db: VectorDb) -> VectorDb:
+        # CachedVectorDb forwards vector_search and keyword_search whether or not its vector db implements them
+        while isinstance(vector_db, CachedVectorDb):
+            vector_db = vector_db.vector_db
+        return vector_db
+
+    @staticmethod
+    def _has_keyword_search(vector_db: VectorDb) -> bool:
+        return getattr(type(vector_db), "keyword_search", None) is not VectorDb.keyword_search
+
+    @staticmethod
+    def _has_vector_search(vector_db: VectorDb) -> bool:
+        return getattr(type(vector_db), "vector_search", None) is not VectorDb.vector_search
+
+    def __getattr__(self, name: str) -> Any:
+        # Attributes specific to the wrapped vector db, e.g. the embedder
+        if name == "vector_db":
+            raise AttributeError(name)
+        return getattr(self.vector_db, name)
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        """Threads running the keyword searches, while the vector searches run on the calling thread"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="phi-hybrid-search")
+            return self._executor
+
+    @staticmethod
+    def _call_search(method: Callable[..., List[Any]], query: str, limit: int, filters: Optional[Dict[str, Any]]):
+        # Not every vector db accepts filters in vector_search and keyword_search
+        if filters is not None and "filters" in signature(method).parameters:
+            return method(query=query, limit=limit, filters=filters)
+        return method(query=query, limit=limit)
+
+    def _vector_search(self, query: str, limit: int, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        # Vector dbs searching by vector, or without a search type, run vector searches in search(), which is cached
+        # by a CachedVectorDb
+        search_type = getattr(self.search_db, "search_type", SearchType.vector)
+        if search_type != SearchType.vector and self._has_vector_search(self.search_db):
+            return self._call_search(self.search_db.vector_search, query, limit, filters)
+        return self.vector_db.search(query=query, limit=limit, filters=filters)
+
+    def _vector_search_results(
+        self, query: str, limit: int, filters: Optional[Dict[str, Any]] = None
+    ) -> List[SearchResult]:
+        search_type = getattr(self.search_db, "search_type", SearchType.vector)
+        if search_type == SearchType.vector or not self._has_vector_search(self.search_db):
+            return self.vector_db.search_results(query=query, limit=limit, filters=filters)
+        return [SearchResult.from_document(document) for document in self._vector_search(query, limit, filters)]
+
+    def _keyword_search(self, query: str, limit: int, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        if self.keyword_index is not None:
+            return self.keyword_index.search(query=query, limit=limit, filters=filters)
+        return self._call_search(self.search_db.keyword_search, query, limit, filters)
+
+    def _hybrid_search(
+        self,
+        vector_search: Callable[[str, int, Optional[Dict[str, Any]]], List[T]],
+        to_result: Callable[[Document], T],
+        query: str,
+        limit: int,
+        filters: Optional[Dict[str, Any]],
+    ) -> List[T]:
+        num_candidates = max(self.num_candidates or limit * 4, limit)
+        keyword_future = self.executor.submit(self._keyword_search, query, num_candidates, filters)
+        vector_results = vector_search(query, num_candidates, filters)
+        try:
+            keyword_results = [to_result(document) for document in keyword_future.result()]
+        except Exception as e:
+            logger.warning(f"Keyword search failed, using vector search results: {e}")
+            keyword_results = []
+        return reciprocal_rank_fusion(
+            [vector_results, keyword_results],
+            weights=[self.vector_weight, 1 - self.vector_weight],
+            k=self.rrf_k,
+            limit=limit,
+        )
+
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        return self._hybrid_search(self._vector_search, lambda document: document, query, limit, filters)
+
+    def search_results(
+        self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[SearchResult]:
+        return self._hybrid_search(self._vector_search_results, SearchResult.from_document, query, limit, filters)
+
+    def vector_search(self, query: str, limit: int = 5) -> List[Document]:
+        return self._vector_search(query=query, limit=limit)
+
+    def keyword_search(self, query: str, limit: int = 5) -> List[Document]:
+        return self._keyword_search(query=query, limit=limit)
+
+    def hybrid_search(self, query: str, limit: int = 5) -> List[Document]:
+        return self.search(query=query, limit=limit)
+
+    def index_documents(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        """Adds documents to the local keyword index, e.g. documents loaded into the vector db by another process"""
+        if self.keyword_index is not None:
+            self.keyword_index.add(documents, filters=filters)
+
+    def create(self) -> None:
+        self.vector_db.create()
+
+    def doc_exists(self, document: Document) -> bool:
+        return self.vector_db.doc_exists(document)
+
+    def existing_content_hashes(self, documents: List[Document]) -> Set[str]:
+        return self.vector_db.existing_content_hashes(documents)
+
+    def filter_new_documents(self, documents: List[Document]) -> List[Document]:
+        new_documents = self.vector_db.filter_new_documents(documents)
+        if self.keyword_index is not None and len(new_documents) < len(documents):
+            # Documents already in the vector db are skipped by the load, index the ones missing from the keyword index
+            new_ids = {id(document) for document in new_documents}
+            existing = [document for document in documents if id(document) not in new_ids]
+            indexed_hashes = self.keyword_index.existing_content_hashes(existing)
+            self.keyword_index.add(
+                [document for document in existing if get_content_hash(document) not in indexed_hashes]
+            )
+        return new_documents
+
+    def name_exists(self, name: str) -> bool:
+        return self.vector_db.name_exists(name)
+
+    def id_exists(self, id: str) -> bool:
+        return self.vector_db.id_exists(id)
+
+    def insert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        self.vector_db.insert(documents=documents, filters=filters)
+        self.index_documents(documents, filters=filters)
+
+    async def async_insert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        await self.vector_db.async_insert(documents=documents, filters=filters)
+        self.index_documents(documents, filters=filters)
+
+    def upsert_available(self) -> bool:
+        return self.vector_db.upsert_available()
+
+    def upsert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        self.vector_db.upsert(documents=documents, filters=filters)
+        self.index_documents(documents, filters=filters)
+
+    async def async_upsert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        await self.vector_db.async_upsert(documents=documents, filters=filters)
+        self.index_documents(documents, filters=filters)
+
+    def drop(self) -> None:
+        self.vector_db.drop()
+        if self.keyword_index is not None:
+            self.keyword_index.clear()
+
+    def exists(self) -> bool:
+        return self.vector_db.exists()
+
+    async def async_exists(self) -> bool:
+        return await self.vector_db.async_exists()
+
+    def optimize(self) -> None:
+        self.vector_db.optimize()
+
+    def delete(self) -> bool:
+        deleted = self.vector_db.delete()
+        if deleted and self.keyword_index is not None:
+            self.keyword_index.clear()
+        return deleted
+
+    def delete_by_name(self, name: str) -> bool:
+        deleted = self.vector_db.delete_by_name(name)
+        if deleted and self.keyword_index is not None:
+            self.keyword_index.delete_by_name(name)
+        return deleted
+
+    def __deepcopy__(self, memo: Optional[Dict[int, Any]] = None) -> "HybridVectorDb":
+        """The keyword index is a shared resource, so copies of an Agent or knowledge base reuse the same HybridVectorDb"""
+        if memo is not None:
+            memo[id(self)] = self
+        return self
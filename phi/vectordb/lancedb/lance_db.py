@@ -1,5 +1,5 @@
 from hashlib import md5
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set
 import json
 
 try:
@@ -11,9 +11,9 @@ except ImportError:
 
 from phi.document import Document
 from phi.embedder import Embedder
-from phi.vectordb.base import VectorDb
+from phi.vectordb.base import VectorDb, embed_batches, get_content_hash
 from phi.vectordb.distance import Distance
-from phi.vectordb.search import SearchType
+from phi.vectordb.search import SearchResult, SearchType
 from phi.utils.log import logger
 
 
@@ -126,37 +126,66 @@ class LanceDb(VectorDb):
             return len(result) > 0
         return False
 
-    def insert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+    def existing_content_hashes(self, documents: List[Document]) -> Set[str]:
+        """
+        Get the content hashes of the documents which already exist, filtering the table in batches
+
+        Args:
+            documents (List[Document]): Documents to validate
+        """
+        existing_hashes: Set[str] = set()
+        if not self.table:
+            return existing_hashes
+        doc_ids = list({get_content_hash(document) for document in documents})
+        for i in range(0, len(doc_ids), 1000):
+            batch = doc_ids[i : i + 1000]
+            ids_filter = ", ".join(f"'{doc_id}'" for doc_id in batch)
+            result = (
+                self.table.search()
+                .where(f"{self._id} IN ({ids_filter})")
+                .select([self._id])
+                .limit(len(batch))
+                .to_arrow()
+            )
+            existing_hashes.update(result[self._id].to_pylist())
+        return existing_hashes
+
+    def insert(
+        self, documents: List[Document], filters: Optional[Dict[str, Any]] = None, batch_size: int = 500
+    ) -> None:
         """
         Insert documents into the database.
 
         Args:
             documents (List[Document]): List of documents to insert
             filters (Optional[Dict[str, Any]]): Filters to apply while inserting documents
+            batch_size (int): Number of documents added to the table at a time. Each add creates a new version of the
+                table, so batches are larger than for the other vector dbs.
         """
         logger.debug(f"Inserting {len(documents)} documents")
-        data = []
-        for document in documents:
-            document.embed(embedder=self.embedder)
-            cleaned_content = document.content.replace("\x00", "\ufffd")
-            doc_id = str(md5(cleaned_content.encode()).hexdigest())
-            payload = {
-                "name": document.name,
-                "meta_data": document.meta_data,
-                "content": cleaned_content,
-                "usage": document.usage,
-            }
-            data.append(
-                {
-                    "id": doc_id,
-                    "vector": document.embedding,
-                    "payload": json.dumps(payload),
+        # Each batch is embedded in the background while the previous batch is added
+        for batch_future in embed_batches(documents, self.embedder, batch_size):
+            data = []
+            for document in batch_future.result():
+                cleaned_content = document.content.replace("\x00", "\ufffd")
+                doc_id = str(md5(cleaned_content.encode()).hexdigest())
+                payload = {
+                    "name": document.name,
+                    "meta_data": document.meta_data,
+                    "content": cleaned_content,
+                    "usage": document.usage,
                 }
-            )
-            logger.debug(f"Inserted document: {document.name} ({document.meta_data})")
+                data.append(
+                    {
+                        "id": doc_id,
+                        "vector": document.embedding,
+                        "payload": json.dumps(payload),
+                    }
+                )
+                logger.debug(f"Inserted document: {document.name} ({document.meta_data})")
 
-        self.table.add(data)
-        logger.debug(f"Upsert {len(data)} documents")
+            self.table.add(data)
+            logger.debug(f"Upsert {len(data)} documents")
 
     def upsert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
         """
@@ -180,11 +209,31 @@ class LanceDb(VectorDb):
             logger.error(f"Invalid search type '{self.search_type}'.")
             return []
 
-    def vector_search(self, query: str, limit: int = 5) -> List[Document]:
+    def search_results(
+        self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[SearchResult]:
+        """Search based on the configured search type, returning only the payload of the results"""
+        if self.search_type == SearchType.vector:
+            search_query = self._get_vector_query(query, limit)
+        elif self.search_type == SearchType.keyword:
+            search_query = self._get_keyword_query(query, limit)
+        elif self.search_type == SearchType.hybrid:
+            search_query = self._get_hybrid_query(query, limit)
+        else:
+            logger.error(f"Invalid search type '{self.search_type}'.")
+            return []
+        if search_query is None:
+            return []
+
+        # Only read the payload column, not the vectors
+        results = search_query.select(["payload"]).to_pandas()
+        return self._build_lean_search_results(results)
+
+    def _get_vector_query(self, query: str, limit: int = 5) -> Optional[Any]:
         query_embedding = self.embedder.get_embedding(query)
         if query_embedding is None:
             logger.error(f"Error getting embedding for Query: {query}")
-            return []
+            return None
 
         results = self.table.search(
             query=query_embedding,
@@ -194,17 +243,22 @@ class LanceDb(VectorDb):
             results.nprobes(self.nprobes)
         if self.reranker:
             results.rerank(reranker=self.reranker)
-        results = results.to_pandas()
+        return results
 
-        search_results = self._build_search_results(results)
+    def vector_search(self, query: str, limit: int = 5) -> List[Document]:
+        results = self._get_vector_query(query, limit)
+        if results is None:
+            return []
+
+        search_results = self._build_search_results(results.to_pandas())
 
         return search_results
 
-    def hybrid_search(self, query: str, limit: int = 5) -> List[Document]:
+    def _get_hybrid_query(self, query: str, limit: int = 5) -> Optional[Any]:
         query_embedding = self.embedder.get_embedding(query)
         if query_embedding is None:
             logger.error(f"Error getting embedding for Query: {query}")
-            return []
+            return None
         if not self.fts_index_exists:
             self.table.create_fts_index("payload", use_tantivy=self.use_tantivy, replace=True)
             self.fts_index_exists = True
@@ -223,26 +277,29 @@ class LanceDb(VectorDb):
             results.nprobes(self.nprobes)
         if self.reranker:
             results.rerank(reranker=self.reranker)
+        return results
 
-        results = results.to_pandas()
+    def hybrid_search(self, query: str, limit: int = 5) -> List[Document]:
+        results = self._get_hybrid_query(query, limit)
+        if results is None:
+            return []
 
-        search_results = self._build_search_results(results)
+        search_results = self._build_search_results(results.to_pandas())
 
         return search_results
 
-    def keyword_search(self, query: str, limit: int = 5) -> List[Document]:
+    def _get_keyword_query(self, query: str, limit: int = 5) -> Any:
         if not self.fts_index_exists:
             self.table.create_fts_index("payload", use_tantivy=self.use_tantivy, replace=True)
             self.fts_index_exists = True
 
-        results = (
-            self.table.search(
-                query=query,
-                query_type="fts",
-            )
-            .limit(limit)
-            .to_pandas()
-        )
+        return self.table.search(
+            query=query,
+            query_type="fts",
+        ).limit(limit)
+
+    def keyword_search(self, query: str, limit: int = 5) -> List[Document]:
+        results = self._get_keyword_query(query, limit).to_pandas()
         search_results = self._build_search_results(results)
         return search_results
 
@@ -267,6 +324,19 @@ class LanceDb(VectorDb):
 
         return search_results
 
+    def _build_lean_search_results(self, results) -> List[SearchResult]:
+        search_results: List[SearchResult] = []
+        try:
+            for payload_json in results["payload"]:
+                payload = json.loads(payload_json)
+                search_results.append(
+                    SearchResult(content=payload["content"], name=payload["name"], meta_data=payload["meta_data"])
+                )
+        except Exception as e:
+            logger.error(f"Error building search results: {e}")
+
+        return search_results
+
     def drop(self) -> None:
         if self.exists():
             logger.debug(f"Deleting collection: {self.table_name}")
@@ -0,0 +1 @@
+from phi.vectordb.numpydb.numpy_db import NumpyDb
@@ -0,0 +1,206 @@
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from pydantic import BaseModel
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("`numpy` not installed. Please install using `pip install numpy`")
+
+from phi.vectordb.distance import Distance
+from phi.utils.log import logger
+
+
+class IvfPq(BaseModel):
+    """Inverted file index with product quantization for NumpyDb.
+
+    Vectors are clustered into `lists`, and a query only scans the rows in the `probes` closest lists.
+    With product quantization, the scanned rows are scored using compact codes of their residual to the
+    list centroid, and the best candidates are re-ranked using the exact vectors.
+    """
+
+    # Number of inverted lists. Defaults to 4 * sqrt(number of rows) when the index is trained.
+    lists: Optional[int] = None
+    # Number of lists scanned per query, higher is more accurate and slower
+    probes: int = 16
+    # Number of sub-vectors each vector is quantized into. The embedding dimensions must be divisible by it.
+    # If None, the scanned rows are scored using the exact vectors (IVF-Flat).
+    pq_segments: Optional[int] = 16
+    # Number of candidates re-ranked using the exact vectors, as a multiple of the search limit
+    rerank_factor: int = 10
+    # The index is trained once the collection has this many rows, smaller collections are scanned
+    min_rows: int = 50000
+    # Maximum number of rows sampled to train the index
+    training_sample: int = 100000
+    kmeans_iterations: int = 10
+    seed: int = 0
+
+
+def _squared_distances(x: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    return (
+        np.square(x).sum(axis=1, keepdims=True) - 2 * (x @ centroids.T) + np.square(centroids).sum(axis=1)[np.newaxis]
+    )
+
+
+def assign(x: np.ndarray, centroids: np.ndarray, batch_size: int = 8192) -> np.ndarray:
+    """Returns the closest centroid of each row of x"""
+    assignments = np.empty(len(x), dtype=np.int32)
+    for start in range(0, len(x), batch_size):
+        assignments[start : start + batch_size] = _squared_distances(x[start : start + batch_size], centroids).argmin(
+            axis=1
+        )
+    return assignments
+
+
+def kmeans(x: np.ndarray, k: int, iterations: int = 20, seed: int = 0) -> np.ndarray:
+    """Returns k centroids for the rows of x, using Lloyd's algorithm"""
+    rng = np.random.default_rng(seed)
+    k = min(k, len(x))
+    centroids = x[rng.choice(len(x), size=k, replace=False)].astype(np.float32)
+    for _ in range(iterations):
+        assignments = assign(x, centroids)
+        counts = np.bincount(assignments, minlength=k)
+        non_empty = counts > 0
+        # Sum the rows of each cluster, sorting the rows by cluster so each cluster is a contiguous range
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        sums = np.add.reduceat(x[np.argsort(assignments, kind="stable")], starts[non_empty], axis=0)
+        centroids[non_empty] = sums / counts[non_empty, np.newaxis]
+        # Re-seed empty clusters with random rows
+        num_empty = int((~non_empty).sum())
+        if num_empty > 0:
+            centroids[~non_empty] = x[rng.choice(len(x), size=num_empty, replace=False)]
+    return centroids
+
+
+class IvfPqQuantizer:
+    """Trained coarse centroids and product quantization codebooks of an IvfPq index"""
+
+    def __init__(self, distance: Distance, centroids: np.ndarray, codebooks: Optional[np.ndarray] = None):
+        self.distance: Distance = distance
+        # (lists, dimensions)
+        self.centroids: np.ndarray = centroids
+        # (pq_segments, 256, dimensions / pq_segments)
+        self.codebooks: Optional[np.ndarray] = codebooks
+
+    @property
+    def num_lists(self) -> int:
+        return len(self.centroids)
+
+    def _prepare(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.distance == Distance.cosine:
+            norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+            return vectors / np.maximum(norms, 1e-12)
+        return vectors
+
+    @classmethod
+    def train(cls, vectors: np.ndarray, distance: Distance, index: IvfPq) -> "IvfPqQuantizer":
+        rng = np.random.default_rng(index.seed)
+        if len(vectors) > index.training_sample:
+            vectors = vectors[np.sort(rng.choice(len(vectors), size=index.training_sample, replace=False))]
+        quantizer = cls(distance=distance, centroids=np.empty((0, vectors.shape[1]), dtype=np.float32))
+        sample = quantizer._prepare(vectors)
+
+        num_lists = index.lists or int(4 * np.sqrt(len(sample)))
+        logger.debug(f"Training IVF index with {num_lists} lists on {len(sample)} rows")
+        quantizer.centroids = kmeans(sample, num_lists, iterations=index.kmeans_iterations, seed=index.seed)
+
+        if index.pq_segments is not None:
+            dimensions = sample.shape[1]
+            if dimensions % index.pq_segments != 0:
+                raise ValueError(f"Dimensions ({dimensions}) must be divisible by pq_segments ({index.pq_segments})")
+            sub_dimensions = dimensions // index.pq_segments
+            # 256 codes per sub-vector are well trained on a smaller sample than the inverted lists
+            pq_sample = sample
+            if len(pq_sample) > 256 * 64:
+                pq_sample = sample[np.sort(rng.choice(len(sample), size=256 * 64, replace=False))]
+            residuals = pq_sample - quantizer.centroids[assign(pq_sample, quantizer.centroids)]
+            codebooks = np.zeros((index.pq_segments, 256, sub_dimensions), dtype=np.float32)
+            for i in range(index.pq_segments):
+                sub_vectors = residuals[:, i * sub_dimensions : (i + 1) * sub_dimensions]
+                codebook = kmeans(sub_vectors, 256, iterations=index.kmeans_iterations, seed=index.seed + i)
+                codebooks[i, : len(codebook)] = codebook
+            quantizer.codebooks = codebooks
+        return quantizer
+
+    def encode(self, vectors: np.ndarray, batch_size: int = 65536) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """Returns the list of each vector and, with product quantization, its codes"""
+        assignments = np.empty(len(vectors), dtype=np.int32)
+        codes = None
+        if self.codebooks is not None:
+            codes = np.empty((len(vectors), len(self.codebooks)), dtype=np.uint8)
+        for start in range(0, len(vectors), batch_size):
+            batch = self._prepare(vectors[start : start + batch_size])
+            batch_assignments = assign(batch, self.centroids)
+            assignments[start : start + len(batch)] = batch_assignments
+            if codes is not None and self.codebooks is not None:
+                residuals = batch - self.centroids[batch_assignments]
+                sub_dimensions = self.codebooks.shape[2]
+                for i, codebook in enumerate(self.codebooks):
+                    sub_vectors = residuals[:, i * sub_dimensions : (i + 1) * sub_dimensions]
+                    codes[start : start + len(batch), i] = assign(sub_vectors, codebook)
+        return assignments, codes
+
+    def probe(self, query: np.ndarray, probes: int) -> np.ndarray:
+        """Returns the lists closest to the query"""
+        query = self._prepare(query)
+        if self.distance == Distance.max_inner_product:
+            scores = self.centroids @ query
+        else:
+            scores = -_squared_distances(query[np.newaxis], self.centroids)[0]
+        probes = min(probes, self.num_lists)
+        if probes >= self.num_lists:
+            return np.arange(self.num_lists)
+        return np.argpartition(-scores, probes - 1)[:probes]
+
+    def score_codes(self, query: np.ndarray, lists: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Returns the approximate similarity of the query to quantized vectors, higher is closer
+
+        Args:
+            query (np.ndarray): The query vector.
+            lists (np.ndarray): The list of each quantized vector.
+            codes (np.ndarray): The codes of each quantized vector.
+        """
+        if self.codebooks is None:
+            raise ValueError("Index does not use product quantization")
+        query = self._prepare(query)
+        list_ids, positions = np.unique(lists, return_inverse=True)
+        centroids = self.centroids[list_ids]
+        num_segments, num_codes, sub_dimensions = self.codebooks.shape
+        if self.distance == Distance.max_inner_product:
+            # q . (c + r) = q . c + sum of q . r over the sub-vectors
+            sub_queries = query.reshape(num_segments, 1, sub_dimensions)
+            tables = np.broadcast_to(
+                np.matmul(sub_queries, self.codebooks.transpose(0, 2, 1)), (num_segments, len(list_ids), num_codes)
+            )
+            offsets = centroids @ query
+        else:
+            # ||q - (c + r)||^2 = sum of ||(q - c) - r||^2 over the sub-vectors
+            sub_queries = (query - centroids).reshape(len(list_ids), num_segments, sub_dimensions).transpose(1, 0, 2)
+            tables = (
+                2 * np.matmul(sub_queries, self.codebooks.transpose(0, 2, 1))
+                - np.square(sub_queries).sum(axis=2, keepdims=True)
+                - np.square(self.codebooks).sum(axis=2)[:, np.newaxis]
+            )
+            offsets = np.zeros(len(list_ids), dtype=np.float32)
+        # tables is (pq_segments, lists, codes), look up the entries of each row in the flattened tables
+        flat_index = (np.arange(num_segments) * len(list_ids))[np.newaxis] + positions[:, np.newaxis]
+        flat_index = flat_index * num_codes + codes
+        return np.ascontiguousarray(tables).reshape(-1).take(flat_index).sum(axis=1) + offsets[positions]
+
+    def save(self, path: Path) -> None:
+        arrays: Dict[str, Any] = {"centroids": self.centroids, "distance": np.array(self.distance.value)}
+        if self.codebooks is not None:
+            arrays["codebooks"] = self.codebooks
+        with path.open("wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: Path) -> "IvfPqQuantizer":
+        with np.load(path) as data:
+            return cls(
+                distance=Distance(str(data["distance"])),
+                centroids=data["centroids"],
+                codebooks=data["codebooks"] if "codebooks" in data else None,
+            )
@@ -0,0 +1,607 @@
+import json
+import os
+import shutil
+from hashlib import md5
+from pathlib import Path
+from threading import RLock
+from typing import Optional, List, Dict, Any, Set, Tuple
+from uuid import uuid4
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("`numpy` not installed. Please install using `pip install numpy`")
+
+from phi.document import Document
+from phi.embedder import Embedder
+from phi.vectordb.base import VectorDb, get_content_hash
+from phi.vectordb.distance import Distance
+from phi.vectordb.numpydb.index import IvfPq, IvfPqQuantizer
+from phi.vectordb.search import SearchResult
+from phi.utils.log import logger
+
+# Metadata columns stored for every row, alongside the vectors
+COLUMNS = ("id", "name", "meta_data", "filters", "content", "usage", "content_hash")
+# Files storing the index of a segment
+INDEX_FILES = ("lists", "codes", "list_rows", "list_offsets")
+
+
+class Segment:
+    """An immutable batch of rows: a float32 matrix of vectors, their norms and the metadata columns.
+
+    Vectors and norms are stored as .npy files and memory-mapped when loaded, so opening a store does not copy them.
+    """
+
+    def __init__(self, name: str, vectors: np.ndarray, norms: np.ndarray, columns: Dict[str, List[Any]]):
+        self.name: str = name
+        self.vectors: np.ndarray = vectors
+        self.norms: np.ndarray = norms
+        self.columns: Dict[str, List[Any]] = columns
+        # False for rows that were deleted or replaced
+        self.alive: np.ndarray = np.ones(len(vectors), dtype=bool)
+        # The inverted list of each row and its product quantization codes, if the segment is indexed
+        self.lists: Optional[np.ndarray] = None
+        self.codes: Optional[np.ndarray] = None
+        # Rows sorted by inverted list, the rows of list i are list_rows[list_offsets[i] : list_offsets[i + 1]]
+        self.list_rows: Optional[np.ndarray] = None
+        self.list_offsets: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    @classmethod
+    def write(cls, directory: Path, vectors: np.ndarray, columns: Dict[str, List[Any]]) -> "Segment":
+        name = f"segment-{uuid4().hex}"
+        norms = np.linalg.norm(vectors, axis=1).astype(np.float32)
+        np.save(directory.joinpath(f"{name}.vectors.npy"), vectors)
+        np.save(directory.joinpath(f"{name}.norms.npy"), norms)
+        directory.joinpath(f"{name}.columns.json").write_text(json.dumps(columns))
+        return cls.load(directory, name)
+
+    @classmethod
+    def load(cls, directory: Path, name: str) -> "Segment":
+        vectors = np.load(directory.joinpath(f"{name}.vectors.npy"), mmap_mode="r")
+        norms = np.load(directory.joinpath(f"{name}.norms.npy"), mmap_mode="r")
+        columns = json.loads(directory.joinpath(f"{name}.columns.json").read_text())
+        segment = cls(name=name, vectors=vectors, norms=norms, columns=columns)
+        segment.load_index(directory)
+        return segment
+
+    @property
+    def indexed(self) -> bool:
+        return self.list_rows is not None
+
+    def write_index(self, directory: Path, quantizer: IvfPqQuantizer) -> None:
+        """Assigns the rows to the inverted lists of the quantizer and saves the index of the segment"""
+        lists, codes = quantizer.encode(self.vectors)
+        list_rows = np.argsort(lists, kind="stable")
+        list_offsets = np.searchsorted(lists[list_rows], np.arange(quantizer.num_lists + 1))
+        arrays = {"lists": lists, "codes": codes, "list_rows": list_rows, "list_offsets": list_offsets}
+        for index_file, array in arrays.items():
+            if array is not None:
+                np.save(directory.joinpath(f"{self.name}.{index_file}.npy"), array)
+        self.load_index(directory)
+
+    def load_index(self, directory: Path) -> None:
+        for index_file in INDEX_FILES:
+            path = directory.joinpath(f"{self.name}.{index_file}.npy")
+            setattr(self, index_file, np.load(path, mmap_mode="r") if path.exists() else None)
+
+    def remove(self, directory: Path) -> None:
+        for suffix in ("vectors.npy", "norms.npy", "columns.json", *(f"{f}.npy" for f in INDEX_FILES)):
+            try:
+                directory.joinpath(f"{self.name}.{suffix}").unlink()
+            except OSError as e:
+                logger.debug(f"Could not remove segment file: {e}")
+
+
+class NumpyDb(VectorDb):
+    """In-process vector db storing embeddings in memory-mapped float32 matrices.
+
+    Each insert appends a new segment. Deleted and replaced rows are tombstoned, and segments are merged
+    by `optimize`, or automatically once there are more than `max_segments` segments.
+    Search is an exact scan, unless an `index` is provided. The index is trained once the collection
+    reaches `index.min_rows` rows, and new segments are added to it as they are inserted.
+    """
+
+    def __init__(
+        self,
+        collection: str,
+        path: str = "tmp/numpydb",
+        embedder: Optional[Embedder] = None,
+        distance: Distance = Distance.cosine,
+        max_segments: int = 16,
+        index: Optional[IvfPq] = None,
+    ):
+        # Embedder for embedding the document contents
+        if embedder is None:
+            from phi.embedder.openai import OpenAIEmbedder
+
+            embedder = OpenAIEmbedder()
+        self.embedder: Embedder = embedder
+        self.dimensions: Optional[int] = self.embedder.dimensions
+
+        if self.dimensions is None:
+            raise ValueError("Embedder.dimensions must be set.")
+
+        # Distance metric
+        self.distance: Distance = distance
+
+        # Collection details
+        self.collection: str = collection
+        self.path: str = path
+        self.directory: Path = Path(path).joinpath(collection)
+        # Segments are merged once there are more than max_segments
+        self.max_segments: int = max_segments
+        # Approximate nearest neighbor index
+        self.index: Optional[IvfPq] = index
+
+        self._lock = RLock()
+        self._segments: List[Segment] = []
+        # Location of each row by id and by content hash
+        self._ids: Dict[str, Tuple[Segment, int]] = {}
+        self._content_hashes: Dict[str, Set[Tuple[str, int]]] = {}
+        self._loaded: bool = False
+        self._quantizer: Optional[IvfPqQuantizer] = None
+        self._quantizer_file: Optional[str] = None
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.directory.joinpath("manifest.json")
+
+    def _load(self) -> None:
+        """Loads the segments listed in the manifest"""
+        with self._lock:
+            if self._loaded:
+                return
+            self._segments = []
+            if self.manifest_path.exists():
+                manifest = json.loads(self.manifest_path.read_text())
+                self._quantizer_file = manifest.get("index")
+                if self._quantizer_file is not None:
+                    self._quantizer = IvfPqQuantizer.load(self.directory.joinpath(self._quantizer_file))
+                for segment_name in manifest.get("segments", []):
+                    segment = Segment.load(self.directory, segment_name)
+                    for row in manifest.get("deleted", {}).get(segment_name, []):
+                        segment.alive[row] = False
+                    self._segments.append(segment)
+            self._build_lookups()
+            self._loaded = True
+            logger.debug(f"Loaded {len(self._ids)} rows from {self.directory}")
+
+    def _build_lookups(self) -> None:
+        self._ids = {}
+        self._content_hashes = {}
+        for segment in self._segments:
+            self._add_to_lookups(segment)
+
+    def _add_to_lookups(self, segment: Segment) -> None:
+        for row in np.flatnonzero(segment.alive).tolist():
+            self._ids[segment.columns["id"][row]] = (segment, row)
+            self._content_hashes.setdefault(segment.columns["content_hash"][row], set()).add((segment.name, row))
+
+    def _tombstone(self, segment: Segment, row: int) -> None:
+        segment.alive[row] = False
+        self._ids.pop(segment.columns["id"][row], None)
+        content_hash = segment.columns["content_hash"][row]
+        locations = self._content_hashes.get(content_hash)
+        if locations is not None:
+            locations.discard((segment.name, row))
+            if len(locations) == 0:
+                del self._content_hashes[content_hash]
+
+    def _write_manifest(self) -> None:
+        """Atomically replaces the manifest with the current segments and tombstones"""
+        manifest = {
+            "dimensions": self.dimensions,
+            "segments": [segment.name for segment in self._segments],
+            "index": self._quantizer_file,
+            "deleted": {
+                segment.name: np.flatnonzero(~segment.alive).tolist()
+                for segment in self._segments
+                if not segment.alive.all()
+            },
+        }
+        tmp_path = self.directory.joinpath(f"manifest.{uuid4().hex}.tmp")
+        tmp_path.write_text(json.dumps(manifest))
+        os.replace(tmp_path, self.manifest_path)
+
+    def create(self) -> None:
+        if not self.exists():
+            logger.debug(f"Creating collection: {self.directory}")
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                self._write_manifest()
+        self._load()
+
+    def doc_exists(self, document: Document) -> bool:
+        """
+        Validating if the document exists or not
+
+        Args:
+            document (Document): Document to validate
+        """
+        self._load()
+        return get_content_hash(document) in self._content_hashes
+
+    def existing_content_hashes(self, documents: List[Document]) -> Set[str]:
+        self._load()
+        existing_hashes: Set[str] = set()
+        for document in documents:
+            content_hash = get_content_hash(document)
+            if content_hash in self._content_hashes:
+                existing_hashes.add(content_hash)
+        return existing_hashes
+
+    def name_exists(self, name: str) -> bool:
+        self._load()
+        return any(
+            segment.alive[row]
+            for segment in self._segments
+            for row, _name in enumerate(segment.columns["name"])
+            if _name == name
+        )
+
+    def id_exists(self, id: str) -> bool:
+        self._load()
+        return id in self._ids
+
+    def _append(self, documents: List[Document], filters: Optional[Dict[str, Any]], replace: bool) -> None:
+        if len(documents) == 0:
+            return
+        Document.embed_documents(documents, embedder=self.embedder)
+
+        columns: Dict[str, List[Any]] = {column: [] for column in COLUMNS}
+        embeddings: List[List[float]] = []
+        for document in documents:
+            if not document.embedding or len(document.embedding) != self.dimensions:
+                logger.error(f"Skipping document without a valid embedding: {document.name}")
+                continue
+            cleaned_content = document.content.replace("\x00", "\ufffd")
+            content_hash = md5(cleaned_content.encode()).hexdigest()
+            columns["id"].append(document.id or content_hash)
+            columns["name"].append(document.name)
+            columns["meta_data"].append(document.meta_data)
+            columns["filters"].append(filters)
+            columns["content"].append(cleaned_content)
+            columns["usage"].append(document.usage)
+            columns["content_hash"].append(content_hash)
+            embeddings.append(document.embedding)
+        if len(embeddings) == 0:
+            return
+
+        self.create()
+        with self._lock:
+            segment = Segment.write(self.directory, np.asarray(embeddings, dtype=np.float32), columns)
+            if self._quantizer is not None:
+                segment.write_index(self.directory, self._quantizer)
+            if replace:
+                for _id in columns["id"]:
+                    location = self._ids.get(_id)
+                    if location is not None:
+                        self._tombstone(*location)
+            self._segments = self._segments + [segment]
+            self._add_to_lookups(segment)
+            self._write_manifest()
+            logger.debug(f"Added segment {segment.name} with {len(segment)} rows")
+
+            if len(self._segments) > self.max_segments:
+                self.optimize()
+            elif self.index is not None and self._quantizer is None and self.get_count() >= self.index.min_rows:
+                self.optimize()
+
+    def insert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Insert documents into the collection.
+
+        Args:
+            documents (List[Document]): List of documents to insert
+            filters (Optional[Dict[str, Any]]): Filters to store with the documents, used to limit search results
+        """
+        logger.debug(f"Inserting {len(documents)} documents")
+        self._append(documents, filters=filters, replace=False)
+
+    def upsert_available(self) -> bool:
+        return True
+
+    def upsert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Upsert documents into the collection, replacing documents with the same id.
+
+        Args:
+            documents (List[Document]): List of documents to upsert
+            filters (Optional[Dict[str, Any]]): Filters to store with the documents, used to limit search results
+        """
+        logger.debug(f"Upserting {len(documents)} documents")
+        self._append(documents, filters=filters, replace=True)
+
+    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        return self.vector_search(query=query, limit=limit, filters=filters)
+
+    def _filter_mask(self, segment: Segment, filters: Dict[str, Any]) -> np.ndarray:
+        """Returns the rows of the segment whose filters contain all the given filters"""
+        return np.fromiter(
+            (
+                row_filters is not None and all(row_filters.get(key) == value for key, value in filters.items())
+                for row_filters in segment.columns["filters"]
+            ),
+            dtype=bool,
+            count=len(segment),
+        )
+
+    def _scores(
+        self, vectors: np.ndarray, norms: np.ndarray, query_vector: np.ndarray, query_norm: float
+    ) -> np.ndarray:
+        """Returns the similarity of each vector to the query, higher is closer"""
+        dot_products = vectors @ query_vector
+        if self.distance == Distance.cosine:
+            return dot_products / np.maximum(norms * query_norm, 1e-12)
+        elif self.distance == Distance.l2:
+            return -(np.square(norms) - 2 * dot_products + query_norm**2)
+        return dot_products
+
+    def _index_candidates(
+        self, segment: Segment, probed_lists: np.ndarray, query_vector: np.ndarray, limit: int, mask: np.ndarray
+    ) -> np.ndarray:
+        """Returns the rows of the segment in the probed lists that are in the mask, narrowed down using the
+        quantized codes"""
+        if segment.list_rows is None or segment.list_offsets is None:
+            return np.flatnonzero(mask)
+        offsets = segment.list_offsets
+        rows = np.concatenate([segment.list_rows[offsets[i] : offsets[i + 1]] for i in probed_lists.tolist()])
+        # Remove deleted and filtered out rows first, so they do not take the place of candidates
+        rows = rows[mask[rows]]
+        if (
+            self._quantizer is not None
+            and self.index is not None
+            and segment.codes is not None
+            and segment.lists is not None
+        ):
+            num_candidates = limit * self.index.rerank_factor
+            if len(rows) > num_candidates:
+                approximate_scores = self._quantizer.score_codes(
+                    query_vector, np.asarray(segment.lists[rows]), np.asarray(segment.codes[rows])
+                )
+                rows = rows[np.argpartition(-approximate_scores, num_candidates - 1)[:num_candidates]]
+        # Sorted rows are read sequentially from the memory-mapped vectors
+        return np.sort(rows)
+
+    def vector_search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+        """
+        Search for the documents closest to the query.
+
+        Args:
+            query (str): The search query.
+            limit (int): Maximum number of results to return.
+            filters (Optional[Dict[str, Any]]): Only return documents inserted with these filters.
+
+        Returns:
+            List[Document]: List of matching documents.
+        """
+        query_embedding = self.embedder.get_embedding(query)
+        if not query_embedding:
+            logger.error(f"Error getting embedding for Query: {query}")
+            return []
+        return self.search_by_embedding(query_embedding, limit=limit, filters=filters)
+
+    def search_by_embedding(
+        self,
+        query_embedding: List[float],
+        limit: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        probes: Optional[int] = None,
+        exact: bool = False,
+    ) -> List[Document]:
+        """
+        Search for the documents closest to an embedding.
+
+        Args:
+            query_embedding (List[float]): The embedding to search for.
+            limit (int): Maximum number of results to return.
+            filters (Optional[Dict[str, Any]]): Only return documents inserted with these filters.
+            probes (Optional[int]): Number of inverted lists to scan, overrides `index.probes`.
+            exact (bool): If True, scans every row instead of using the index.
+
+        Returns:
+            List[Document]: List of matching documents.
+        """
+        search_results: List[Document] = []
+        for segment, row in self._search_rows(
+            query_embedding, limit=limit, filters=filters, probes=probes, exact=exact
+        ):
+            search_results.append(
+                Document(
+                    id=segment.columns["id"][row],
+                    name=segment.columns["name"][row],
+                    meta_data=segment.columns["meta_data"][row],
+                    content=segment.columns["content"][row],
+                    embedder=self.embedder,
+                    embedding=segment.vectors[row].tolist(),
+                    usage=segment.columns["usage"][row],
+                )
+            )
+        return search_results
+
+    def search_results(
+        self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[SearchResult]:
+        """Search for the documents closest to the query, without copying their vectors"""
+        query_embedding = self.embedder.get_embedding(query)
+        if not query_embedding:
+            logger.error(f"Error getting embedding for Query: {query}")
+            return []
+        return [
+            SearchResult(
+                content=segment.columns["content"][row],
+                name=segment.columns["name"][row],
+                meta_data=segment.columns["meta_data"][row],
+                id=segment.columns["id"][row],
+            )
+            for segment, row in self._search_rows(query_embedding, limit=limit, filters=filters)
+        ]
+
+    def _search_rows(
+        self,
+        query_embedding: List[float],
+        limit: int,
+        filters: Optional[Dict[str, Any]] = None,
+        probes: Optional[int] = None,
+        exact: bool = False,
+    ) -> List[Tuple[Segment, int]]:
+        """Returns the segment and row of the documents closest to an embedding, closest first"""
+        self._load()
+        segments = self._segments
+        if len(segments) == 0 or limit <= 0:
+            return []
+
+        query_vector = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = float(np.linalg.norm(query_vector))
+
+        probed_lists: Optional[np.ndarray] = None
+        if not exact and self.index is not None and self._quantizer is not None:
+            probed_lists = self._quantizer.probe(query_vector, probes or self.index.probes)
+
+        # Select the top rows of each segment, then the top rows overall
+        candidate_scores: List[np.ndarray] = []
+        candidates: List[Tuple[Segment, np.ndarray]] = []
+        for segment in segments:
+            mask = segment.alive if filters is None else segment.alive & self._filter_mask(segment, filters)
+            if probed_lists is not None and segment.indexed:
+                rows = self._index_candidates(segment, probed_lists, query_vector, limit, mask)
+                scores = self._scores(segment.vectors[rows], segment.norms[rows], query_vector, query_norm)
+            else:
+                rows = np.arange(len(segment))
+                scores = self._scores(segment.vectors, segment.norms, query_vector, query_norm)
+                scores = np.where(mask, scores, -np.inf)
+            k = min(limit, len(rows))
+            if k == 0:
+                continue
+            top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+            top = top[np.isfinite(scores[top])]
+            candidate_scores.append(scores[top])
+            candidates.append((segment, rows[top]))
+        if len(candidates) == 0:
+            return []
+
+        all_scores = np.concatenate(candidate_scores)
+        all_locations = [(segment, int(row)) for segment, rows in candidates for row in rows]
+        order = np.argsort(-all_scores, kind="stable")[:limit]
+        return [all_locations[i] for i in order.tolist()]
+
+    def drop(self) -> None:
+        with self._lock:
+            if self.exists():
+                logger.debug(f"Deleting collection: {self.directory}")
+                shutil.rmtree(self.directory, ignore_errors=True)
+            self._segments = []
+            self._build_lookups()
+            self._loaded = False
+
+    def exists(self) -> bool:
+        return self.manifest_path.exists()
+
+    def get_count(self) -> int:
+        self._load()
+        return sum(int(segment.alive.sum()) for segment in self._segments)
+
+    def optimize(self, force_recreate: bool = False) -> None:
+        """Merges all segments into a single segment without the deleted rows, and trains the index
+
+        Args:
+            force_recreate (bool): If True, the index is trained again.
+        """
+        self._load()
+        with self._lock:
+            self._merge_segments(force=force_recreate)
+            if self.index is None:
+                return
+            if self._quantizer is None or force_recreate:
+                if self.get_count() >= self.index.min_rows:
+                    self._train_index()
+            elif self._quantizer is not None:
+                for segment in self._segments:
+                    if not segment.indexed:
+                        segment.write_index(self.directory, self._quantizer)
+
+    def _train_index(self) -> None:
+        if self.index is None:
+            return
+        # Sample the training rows from all segments
+        rng = np.random.default_rng(self.index.seed)
+        segment_rows = [np.flatnonzero(segment.alive) for segment in self._segments]
+        num_rows = sum(len(rows) for rows in segment_rows)
+        sample_probability = min(1.0, self.index.training_sample / max(num_rows, 1))
+        sample = np.concatenate(
+            [
+                np.asarray(segment.vectors[np.sort(rows[rng.random(len(rows)) < sample_probability])])
+                for segment, rows in zip(self._segments, segment_rows)
+            ]
+        )
+
+        quantizer = IvfPqQuantizer.train(sample, distance=self.distance, index=self.index)
+        quantizer_file = f"index-{uuid4().hex}.npz"
+        quantizer.save(self.directory.joinpath(quantizer_file))
+        for segment in self._segments:
+            segment.write_index(self.directory, quantizer)
+
+        old_quantizer_file = self._quantizer_file
+        self._quantizer, self._quantizer_file = quantizer, quantizer_file
+        self._write_manifest()
+        if old_quantizer_file is not None and self.directory.joinpath(old_quantizer_file).exists():
+            self.directory.joinpath(old_quantizer_file).unlink()
+        logger.debug(f"Trained index with {quantizer.num_lists} lists on {len(sample)} rows")
+
+    def _merge_segments(self, force: bool = False) -> None:
+        """Merges all segments into a single segment without the deleted rows"""
+        with self._lock:
+            old_segments = self._segments
+            if not force and len(old_segments) <= 1 and all(segment.alive.all() for segment in old_segments):
+                return
+
+            columns: Dict[str, List[Any]] = {column: [] for column in COLUMNS}
+            vectors: List[np.ndarray] = []
+            for segment in old_segments:
+                rows = np.flatnonzero(segment.alive)
+                vectors.append(np.asarray(segment.vectors[rows]))
+                for column in COLUMNS:
+                    values = segment.columns[column]
+                    columns[column].extend(values[row] for row in rows.tolist())
+
+            new_segments: List[Segment] = []
+            if len(columns["id"]) > 0:
+                new_segment = Segment.write(self.directory, np.concatenate(vectors), columns)
+                if self._quantizer is not None and not force:
+                    new_segment.write_index(self.directory, self._quantizer)
+                new_segments.append(new_segment)
+            self._segments = new_segments
+            self._build_lookups()
+            self._write_manifest()
+            for segment in old_segments:
+                segment.remove(self.directory)
+            logger.debug(f"Merged {len(old_segments)} segments into {len(new_segments)}")
+
+    def delete(self) -> bool:
+        with self._lock:
+            old_segments = self._segments
+            self._segments = []
+            self._build_lookups()
+            if self.exists():
+                self._write_manifest()
+            for segment in old_segments:
+                segment.remove(self.directory)
+        return True
+
+    def delete_by_name(self, name: str) -> bool:
+        self._load()
+        with self._lock:
+            for segment in self._segments:
+                for row, _name in enumerate(segment.columns["name"]):
+                    if _name == name and segment.alive[row]:
+                        self._tombstone(segment, row)
+            self._write_manifest()
+        return True
+
+    def __deepcopy__(self, memo):
+        """The collection is shared by every copy of an Agent, so copies reuse the same NumpyDb"""
+        memo[id(self)] = self
+        return self
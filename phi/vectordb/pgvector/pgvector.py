@@ -1,14 +1,17 @@
+import asyncio
+import time
+from functools import partial
 from math import sqrt
 from hashlib import md5
-from typing import Optional, List, Union, Dict, Any, cast
+from typing import Optional, List, Union, Dict, Any, Sequence, Set, cast
 
 try:
     from sqlalchemy.dialects import postgresql
     from sqlalchemy.engine import create_engine, Engine
     from sqlalchemy.inspection import inspect
     from sqlalchemy.orm import sessionmaker, scoped_session, Session
-    from sqlalchemy.schema import MetaData, Table, Column, Index
-    from sqlalchemy.sql.expression import text, func, select, desc, bindparam
+    from sqlalchemy.schema import MetaData, Table, Column, Computed, Index
+    from sqlalchemy.sql.expression import text, func, select, desc, delete, bindparam, any_, union, Select
     from sqlalchemy.types import DateTime, String
 except ImportError:
     raise ImportError("`sqlalchemy` not installed")
@@ -20,10 +23,11 @@ except ImportError:
 
 from phi.document import Document
 from phi.embedder import Embedder
-from phi.vectordb.base import VectorDb
+from phi.vectordb.base import VectorDb, embed_batches, get_content_hash
 from phi.vectordb.distance import Distance
-from phi.vectordb.search import SearchType
+from phi.vectordb.search import SearchResult, SearchType
 from phi.vectordb.pgvector.index import Ivfflat, HNSW
+from phi.utils.async_engine import create_async_engine_for
 from phi.utils.log import logger
 
 
@@ -50,6 +54,7 @@ class PgVector(VectorDb):
         content_language: str = "english",
         schema_version: int = 1,
         auto_upgrade_schema: bool = False,
+        hybrid_candidates: Optional[int] = None,
     ):
         """
         Initialize the PgVector instance.
@@ -66,8 +71,11 @@ class PgVector(VectorDb):
             prefix_match (bool): Enable prefix matching for full-text search.
             vector_score_weight (float): Weight for vector similarity in hybrid search.
             content_language (str): Language for full-text search.
-            schema_version (int): Version of the database schema.
+            schema_version (int): Version of the database schema. Version 2 adds a stored tsvector column with a
+                GIN index for keyword and hybrid search, and GIN indexes on the filters and meta_data columns.
             auto_upgrade_schema (bool): Automatically upgrade schema if True.
+            hybrid_candidates (Optional[int]): With schema version 2, the number of candidates hybrid search
+                retrieves from the vector index and from the full-text index before ranking them. Defaults to 10 * limit.
         """
         if not table_name:
             raise ValueError("Table name must be provided.")
@@ -113,7 +121,11 @@ class PgVector(VectorDb):
         # Weight for the vector similarity score in hybrid search
         self.vector_score_weight: float = vector_score_weight
         # Content language for full-text search
+        if not content_language.replace("_", "").isalnum():
+            raise ValueError(f"Invalid content_language: {content_language}")
         self.content_language: str = content_language
+        # Number of candidates retrieved from each index in hybrid search, with schema version 2
+        self.hybrid_candidates: Optional[int] = hybrid_candidates
 
         # Table schema version
         self.schema_version: int = schema_version
@@ -122,6 +134,9 @@ class PgVector(VectorDb):
 
         # Database session
         self.Session: scoped_session = scoped_session(sessionmaker(bind=self.db_engine))
+        # Async engine for async_search, created on first use
+        self._async_engine: Optional[Any] = None
+        self._async_engine_supported: bool = True
         # Database table
         self.table: Table = self.get_table()
         logger.debug(f"Initialized PgVector with table '{self.schema}.{self.table_name}'")
@@ -158,6 +173,41 @@ class PgVector(VectorDb):
 
         return table
 
+    def get_ts_vector_expression(self) -> str:
+        """Returns the SQL expression of the tsvector stored in the content_tsv column"""
+        return f"to_tsvector('{self.content_language}'::regconfig, coalesce(content, ''))"
+
+    def get_table_v2(self) -> Table:
+        """
+        Get the SQLAlchemy Table object for schema version 2.
+
+        Adds to version 1 a stored generated tsvector of the content with a GIN index, so keyword and hybrid search
+        do not tokenize the content of every row on every query, and GIN indexes on the filters and meta_data
+        columns for containment filters.
+
+        Returns:
+            Table: SQLAlchemy Table object representing the database table.
+        """
+        table = self.get_table_v1()
+        table.append_column(
+            Column("content_tsv", postgresql.TSVECTOR, Computed(self.get_ts_vector_expression(), persisted=True)),
+            replace_existing=True,
+        )
+        Index(f"idx_{self.table_name}_content_tsv", table.c.content_tsv, postgresql_using="gin")
+        Index(
+            f"idx_{self.table_name}_filters",
+            table.c.filters,
+            postgresql_using="gin",
+            postgresql_ops={"filters": "jsonb_path_ops"},
+        )
+        Index(
+            f"idx_{self.table_name}_meta_data",
+            table.c.meta_data,
+            postgresql_using="gin",
+            postgresql_ops={"meta_data": "jsonb_path_ops"},
+        )
+        return table
+
     def get_table(self) -> Table:
         """
         Get the SQLAlchemy Table object based on the current schema version.
@@ -167,6 +217,8 @@ class PgVector(VectorDb):
         """
         if self.schema_version == 1:
             return self.get_table_v1()
+        elif self.schema_version == 2:
+            return self.get_table_v2()
         else:
             raise NotImplementedError(f"Unsupported schema version: {self.schema_version}")
 
@@ -197,6 +249,42 @@ class PgVector(VectorDb):
                     sess.execute(text(f"CREATE SCHEMA IF NOT EXISTS {self.schema};"))
             logger.debug(f"Creating table: {self.table_name}")
             self.table.create(self.db_engine)
+        elif self.auto_upgrade_schema:
+            self.upgrade_schema()
+
+    def upgrade_schema(self) -> None:
+        """
+        Upgrade an existing table to the current schema version.
+
+        For schema version 2, adds the stored content_tsv column and the GIN indexes. Adding the column computes
+        the tsvector of every row, which rewrites the table, so run it outside of peak traffic on large tables.
+        """
+        if self.schema_version < 2 or not self.table_exists():
+            return
+
+        table_fullname = self.table.fullname
+        logger.info(f"Upgrading table '{table_fullname}' to schema version {self.schema_version}")
+        with self.Session() as sess, sess.begin():
+            sess.execute(
+                text(
+                    f"ALTER TABLE {table_fullname} ADD COLUMN IF NOT EXISTS content_tsv tsvector "
+                    f"GENERATED ALWAYS AS ({self.get_ts_vector_expression()}) STORED;"
+                )
+            )
+            sess.execute(
+                text(
+                    f'CREATE INDEX IF NOT EXISTS "idx_{self.table_name}_content_tsv" ON {table_fullname} '
+                    f"USING GIN (content_tsv);"
+                )
+            )
+            for column in ("filters", "meta_data"):
+                sess.execute(
+                    text(
+                        f'CREATE INDEX IF NOT EXISTS "idx_{self.table_name}_{column}" ON {table_fullname} '
+                        f"USING GIN ({column} jsonb_path_ops);"
+                    )
+                )
+        logger.info(f"Upgraded table '{table_fullname}' to schema version {self.schema_version}")
 
     def _record_exists(self, column, value) -> bool:
         """
@@ -232,6 +320,30 @@ class PgVector(VectorDb):
         content_hash = md5(cleaned_content.encode()).hexdigest()
         return self._record_exists(self.table.c.content_hash, content_hash)
 
+    def existing_content_hashes(self, documents: List[Document]) -> Set[str]:
+        """
+        Get the content hashes of the documents which already exist in the table, using a single query.
+
+        Args:
+            documents (List[Document]): The documents to check.
+
+        Returns:
+            Set[str]: The content hashes which exist in the table.
+        """
+        content_hashes = list({get_content_hash(document) for document in documents})
+        if len(content_hashes) == 0:
+            return set()
+        try:
+            with self.Session() as sess, sess.begin():
+                stmt = select(self.table.c.content_hash).where(
+                    self.table.c.content_hash
+                    == any_(bindparam("content_hashes", content_hashes, type_=postgresql.ARRAY(String)))
+                )
+                return {row[0] for row in sess.execute(stmt)}
+        except Exception as e:
+            logger.error(f"Error checking if records exist: {e}")
+            return set()
+
     def name_exists(self, name: str) -> bool:
         """
         Check if a document with the given name exists in the table.
@@ -284,14 +396,15 @@ class PgVector(VectorDb):
         """
         try:
             with self.Session() as sess, sess.begin():
-                for i in range(0, len(documents), batch_size):
-                    batch_docs = documents[i : i + batch_size]
+                # The next batches are embedded in the background while the current batch is written
+                for i, batch_future in enumerate(embed_batches(documents, self.embedder, batch_size)):
                     try:
+                        # Wait for the batch of documents to be embedded
+                        batch_docs = batch_future.result()
                         # Prepare documents for insertion
                         batch_records = []
                         for doc in batch_docs:
                             try:
-                                doc.embed(embedder=self.embedder)
                                 cleaned_content = self._clean_content(doc.content)
                                 content_hash = md5(cleaned_content.encode()).hexdigest()
                                 _id = doc.id or content_hash
@@ -347,14 +460,15 @@ class PgVector(VectorDb):
         """
         try:
             with self.Session() as sess, sess.begin():
-                for i in range(0, len(documents), batch_size):
-                    batch_docs = documents[i : i + batch_size]
+                # The next batches are embedded in the background while the current batch is written
+                for i, batch_future in enumerate(embed_batches(documents, self.embedder, batch_size)):
                     try:
+                        # Wait for the batch of documents to be embedded
+                        batch_docs = batch_future.result()
                         # Prepare documents for upserting
                         batch_records = []
                         for doc in batch_docs:
                             try:
-                                doc.embed(embedder=self.embedder)
                                 cleaned_content = self._clean_content(doc.content)
                                 content_hash = md5(cleaned_content.encode()).hexdigest()
                                 _id = doc.id or content_hash
@@ -397,7 +511,14 @@ class PgVector(VectorDb):
             logger.error(f"Error upserting documents: {e}")
             raise
 
-    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+    ) -> List[Document]:
         """
         Perform a search based on the configured search type.
 
@@ -405,21 +526,301 @@ class PgVector(VectorDb):
             query (str): The search query.
             limit (int): Maximum number of results to return.
             filters (Optional[Dict[str, Any]]): Filters to apply to the search.
+            probes (Optional[int]): Overrides the ivfflat.probes of the vector index for this search.
+            ef_search (Optional[int]): Overrides the hnsw.ef_search of the vector index for this search.
 
         Returns:
             List[Document]: List of matching documents.
         """
         if self.search_type == SearchType.vector:
-            return self.vector_search(query=query, limit=limit, filters=filters)
+            return self.vector_search(query=query, limit=limit, filters=filters, probes=probes, ef_search=ef_search)
         elif self.search_type == SearchType.keyword:
             return self.keyword_search(query=query, limit=limit, filters=filters)
         elif self.search_type == SearchType.hybrid:
-            return self.hybrid_search(query=query, limit=limit, filters=filters)
+            return self.hybrid_search(query=query, limit=limit, filters=filters, probes=probes, ef_search=ef_search)
         else:
             logger.error(f"Invalid search type '{self.search_type}'.")
             return []
 
-    def vector_search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+    def _get_columns(self) -> List[Any]:
+        return [
+            self.table.c.id,
+            self.table.c.name,
+            self.table.c.meta_data,
+            self.table.c.content,
+            self.table.c.embedding,
+            self.table.c.usage,
+        ]
+
+    def _get_result_columns(self) -> List[Any]:
+        """Columns of the lean search results, without the embedding"""
+        return [self.table.c.id, self.table.c.name, self.table.c.meta_data, self.table.c.content]
+
+    def _get_index_settings(self, probes: Optional[int] = None, ef_search: Optional[int] = None) -> Optional[str]:
+        """
+        Returns the statement setting the vector index search parameters for the current transaction.
+
+        Args:
+            probes (Optional[int]): ivfflat.probes to use instead of the value of the vector index.
+            ef_search (Optional[int]): hnsw.ef_search to use instead of the value of the vector index.
+        """
+        if isinstance(self.vector_index, Ivfflat):
+            return f"SET LOCAL ivfflat.probes = {int(probes or self.vector_index.probes)}"
+        elif isinstance(self.vector_index, HNSW):
+            return f"SET LOCAL hnsw.ef_search = {int(ef_search or self.vector_index.ef_search)}"
+        return None
+
+    def _get_vector_search_statement(
+        self,
+        query_embedding: List[float],
+        limit: int,
+        filters: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[Any]] = None,
+    ) -> Optional[Select]:
+        # Build the base statement
+        stmt = select(*(columns or self._get_columns()))
+
+        # Apply filters if provided
+        if filters is not None:
+            stmt = stmt.where(self.table.c.filters.contains(filters))
+
+        # Order the results based on the distance metric
+        if self.distance == Distance.l2:
+            stmt = stmt.order_by(self.table.c.embedding.l2_distance(query_embedding))
+        elif self.distance == Distance.cosine:
+            stmt = stmt.order_by(self.table.c.embedding.cosine_distance(query_embedding))
+        elif self.distance == Distance.max_inner_product:
+            stmt = stmt.order_by(self.table.c.embedding.max_inner_product(query_embedding))
+        else:
+            logger.error(f"Unknown distance metric: {self.distance}")
+            return None
+
+        # Limit the number of results
+        return stmt.limit(limit)
+
+    def _get_ts_vector(self) -> Any:
+        """Returns the text search vector of the content, stored in the content_tsv column from schema version 2"""
+        if self.schema_version >= 2:
+            return self.table.c.content_tsv
+        return func.to_tsvector(self.content_language, self.table.c.content)
+
+    def _get_ts_query(self, query: str) -> Any:
+        # Create the ts_query using websearch_to_tsquery with parameter binding
+        processed_query = self.enable_prefix_matching(query) if self.prefix_match else query
+        return func.websearch_to_tsquery(self.content_language, bindparam("query", value=processed_query))
+
+    def _get_keyword_search_statement(
+        self,
+        query: str,
+        limit: int,
+        filters: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[Any]] = None,
+    ) -> Select:
+        # Build the base statement
+        stmt = select(*(columns or self._get_columns()))
+
+        # Build the text search vector
+        ts_vector = self._get_ts_vector()
+        ts_query = self._get_ts_query(query)
+        # Compute the text rank
+        text_rank = func.ts_rank_cd(ts_vector, ts_query)
+
+        # Only rank matching rows when the tsvector is indexed, so the search uses the GIN index
+        if self.schema_version >= 2:
+            stmt = stmt.where(ts_vector.op("@@")(ts_query))
+
+        # Apply filters if provided
+        if filters is not None:
+            # Use the contains() method for JSONB columns to check if the filters column contains the specified filters
+            stmt = stmt.where(self.table.c.filters.contains(filters))
+
+        # Order by the relevance rank
+        stmt = stmt.order_by(text_rank.desc())
+
+        # Limit the number of results
+        return stmt.limit(limit)
+
+    def _get_hybrid_search_statement(
+        self,
+        query: str,
+        query_embedding: List[float],
+        limit: int,
+        filters: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[Any]] = None,
+    ) -> Optional[Select]:
+        # Build the text search vector
+        ts_vector = self._get_ts_vector()
+        ts_query = self._get_ts_query(query)
+        # Compute the text rank
+        text_rank = func.ts_rank_cd(ts_vector, ts_query)
+
+        # Compute the vector similarity score
+        vector_distance: Any
+        if self.distance == Distance.l2:
+            # For L2 distance, smaller distances are better
+            vector_distance = self.table.c.embedding.l2_distance(query_embedding)
+            # Invert and normalize the distance to get a similarity score between 0 and 1
+            vector_score = 1 / (1 + vector_distance)
+        elif self.distance == Distance.cosine:
+            # For cosine distance, smaller distances are better
+            vector_distance = self.table.c.embedding.cosine_distance(query_embedding)
+            vector_score = 1 / (1 + vector_distance)
+        elif self.distance == Distance.max_inner_product:
+            # For inner product, higher values are better
+            # Assume embeddings are normalized, so inner product ranges from -1 to 1
+            vector_distance = self.table.c.embedding.max_inner_product(query_embedding)
+            raw_vector_score = vector_distance
+            # Normalize to range [0, 1]
+            vector_score = (raw_vector_score + 1) / 2
+        else:
+            logger.error(f"Unknown distance metric: {self.distance}")
+            return None
+
+        # Apply weights to control the influence of each score
+        # Validate the vector_weight parameter
+        if not 0 <= self.vector_score_weight <= 1:
+            raise ValueError("vector_score_weight must be between 0 and 1")
+        text_rank_weight = 1 - self.vector_score_weight  # weight for text rank
+
+        # Combine the scores into a hybrid score
+        hybrid_score = (self.vector_score_weight * vector_score) + (text_rank_weight * text_rank)
+
+        # Build the base statement, including the hybrid score
+        stmt = select(*(columns or self._get_columns()), hybrid_score.label("hybrid_score"))
+
+        # Add the full-text search condition
+        # stmt = stmt.where(ts_vector.op("@@")(ts_query))
+
+        # Apply filters if provided
+        if filters is not None:
+            stmt = stmt.where(self.table.c.filters.contains(filters))
+
+        # Only rank the nearest rows from the vector index and the best matches from the full-text index,
+        # instead of scoring every row
+        if self.schema_version >= 2:
+            num_candidates = self.hybrid_candidates or limit * 10
+            vector_candidates = select(self.table.c.id).order_by(vector_distance).limit(num_candidates)
+            keyword_candidates = (
+                select(self.table.c.id)
+                .where(ts_vector.op("@@")(ts_query))
+                .order_by(text_rank.desc())
+                .limit(num_candidates)
+            )
+            if filters is not None:
+                vector_candidates = vector_candidates.where(self.table.c.filters.contains(filters))
+                keyword_candidates = keyword_candidates.where(self.table.c.filters.contains(filters))
+            candidates = union(vector_candidates, keyword_candidates).subquery()
+            stmt = stmt.where(self.table.c.id.in_(select(candidates.c.id)))
+
+        # Order the results by the hybrid score in descending order
+        stmt = stmt.order_by(desc("hybrid_score"))
+
+        # Limit the number of results
+        return stmt.limit(limit)
+
+    def _build_search_results(self, results: Sequence[Any]) -> List[Document]:
+        """Converts the rows returned by a search to Document objects"""
+        search_results: List[Document] = []
+        for result in results:
+            search_results.append(
+                Document(
+                    id=result.id,
+                    name=result.name,
+                    meta_data=result.meta_data,
+                    content=result.content,
+                    embedder=self.embedder,
+                    embedding=result.embedding,
+                    usage=result.usage,
+                )
+            )
+        return search_results
+
+    @staticmethod
+    def _build_lean_search_results(results: Sequence[Any]) -> List[SearchResult]:
+        """Converts the rows returned by a search of the result columns to SearchResult tuples"""
+        return [
+            SearchResult(content=result.content, name=result.name, meta_data=result.meta_data, id=result.id)
+            for result in results
+        ]
+
+    def _get_search_statement(
+        self,
+        query: str,
+        query_embedding: Optional[List[float]],
+        limit: int,
+        filters: Optional[Dict[str, Any]] = None,
+        columns: Optional[List[Any]] = None,
+    ) -> Optional[Select]:
+        """Returns the statement of the configured search type. Vector and hybrid searches need the query embedding."""
+        if self.search_type == SearchType.keyword:
+            return self._get_keyword_search_statement(query, limit=limit, filters=filters, columns=columns)
+        if query_embedding is None:
+            return None
+        if self.search_type == SearchType.vector:
+            return self._get_vector_search_statement(query_embedding, limit=limit, filters=filters, columns=columns)
+        elif self.search_type == SearchType.hybrid:
+            return self._get_hybrid_search_statement(
+                query, query_embedding, limit=limit, filters=filters, columns=columns
+            )
+        logger.error(f"Invalid search type '{self.search_type}'.")
+        return None
+
+    def search_results(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+    ) -> List[SearchResult]:
+        """
+        Perform a search based on the configured search type, returning the results without their embeddings.
+
+        Args:
+            query (str): The search query.
+            limit (int): Maximum number of results to return.
+            filters (Optional[Dict[str, Any]]): Filters to apply to the search.
+            probes (Optional[int]): Overrides the ivfflat.probes of the vector index for this search.
+            ef_search (Optional[int]): Overrides the hnsw.ef_search of the vector index for this search.
+
+        Returns:
+            List[SearchResult]: List of matching results.
+        """
+        try:
+            query_embedding: Optional[List[float]] = None
+            if self.search_type != SearchType.keyword:
+                query_embedding = self.embedder.get_embedding(query)
+                if query_embedding is None:
+                    logger.error(f"Error getting embedding for Query: {query}")
+                    return []
+
+            stmt = self._get_search_statement(
+                query, query_embedding, limit=limit, filters=filters, columns=self._get_result_columns()
+            )
+            if stmt is None:
+                return []
+
+            # Log the query for debugging
+            logger.debug(f"{self.search_type.value.capitalize()} search query: {stmt}")
+
+            with self.Session() as sess, sess.begin():
+                index_settings = self._get_index_settings(probes=probes, ef_search=ef_search)
+                if index_settings is not None and self.search_type != SearchType.keyword:
+                    sess.execute(text(index_settings))
+                results = sess.execute(stmt).fetchall()
+            return self._build_lean_search_results(results)
+        except Exception as e:
+            logger.error(f"Error during {self.search_type.value} search: {e}")
+            return []
+
+    def vector_search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+    ) -> List[Document]:
         """
         Perform a vector similarity search.
 
@@ -427,6 +828,8 @@ class PgVector(VectorDb):
             query (str): The search query.
             limit (int): Maximum number of results to return.
             filters (Optional[Dict[str, Any]]): Filters to apply to the search.
+            probes (Optional[int]): Overrides the ivfflat.probes of the vector index for this search.
+            ef_search (Optional[int]): Overrides the hnsw.ef_search of the vector index for this search.
 
         Returns:
             List[Document]: List of matching documents.
@@ -438,48 +841,19 @@ class PgVector(VectorDb):
                 logger.error(f"Error getting embedding for Query: {query}")
                 return []
 
-            # Define the columns to select
-            columns = [
-                self.table.c.id,
-                self.table.c.name,
-                self.table.c.meta_data,
-                self.table.c.content,
-                self.table.c.embedding,
-                self.table.c.usage,
-            ]
-
-            # Build the base statement
-            stmt = select(*columns)
-
-            # Apply filters if provided
-            if filters is not None:
-                stmt = stmt.where(self.table.c.filters.contains(filters))
-
-            # Order the results based on the distance metric
-            if self.distance == Distance.l2:
-                stmt = stmt.order_by(self.table.c.embedding.l2_distance(query_embedding))
-            elif self.distance == Distance.cosine:
-                stmt = stmt.order_by(self.table.c.embedding.cosine_distance(query_embedding))
-            elif self.distance == Distance.max_inner_product:
-                stmt = stmt.order_by(self.table.c.embedding.max_inner_product(query_embedding))
-            else:
-                logger.error(f"Unknown distance metric: {self.distance}")
+            stmt = self._get_vector_search_statement(query_embedding, limit=limit, filters=filters)
+            if stmt is None:
                 return []
 
-            # Limit the number of results
-            stmt = stmt.limit(limit)
-
             # Log the query for debugging
             logger.debug(f"Vector search query: {stmt}")
 
             # Execute the query
             try:
                 with self.Session() as sess, sess.begin():
-                    if self.vector_index is not None:
-                        if isinstance(self.vector_index, Ivfflat):
-                            sess.execute(text(f"SET LOCAL ivfflat.probes = {self.vector_index.probes}"))
-                        elif isinstance(self.vector_index, HNSW):
-                            sess.execute(text(f"SET LOCAL hnsw.ef_search = {self.vector_index.ef_search}"))
+                    index_settings = self._get_index_settings(probes=probes, ef_search=ef_search)
+                    if index_settings is not None:
+                        sess.execute(text(index_settings))
                     results = sess.execute(stmt).fetchall()
             except Exception as e:
                 logger.error(f"Error performing semantic search: {e}")
@@ -488,21 +862,7 @@ class PgVector(VectorDb):
                 return []
 
             # Process the results and convert to Document objects
-            search_results: List[Document] = []
-            for result in results:
-                search_results.append(
-                    Document(
-                        id=result.id,
-                        name=result.name,
-                        meta_data=result.meta_data,
-                        content=result.content,
-                        embedder=self.embedder,
-                        embedding=result.embedding,
-                        usage=result.usage,
-                    )
-                )
-
-            return search_results
+            return self._build_search_results(results)
         except Exception as e:
             logger.error(f"Error during vector search: {e}")
             return []
@@ -535,37 +895,7 @@ class PgVector(VectorDb):
             List[Document]: List of matching documents.
         """
         try:
-            # Define the columns to select
-            columns = [
-                self.table.c.id,
-                self.table.c.name,
-                self.table.c.meta_data,
-                self.table.c.content,
-                self.table.c.embedding,
-                self.table.c.usage,
-            ]
-
-            # Build the base statement
-            stmt = select(*columns)
-
-            # Build the text search vector
-            ts_vector = func.to_tsvector(self.content_language, self.table.c.content)
-            # Create the ts_query using websearch_to_tsquery with parameter binding
-            processed_query = self.enable_prefix_matching(query) if self.prefix_match else query
-            ts_query = func.websearch_to_tsquery(self.content_language, bindparam("query", value=processed_query))
-            # Compute the text rank
-            text_rank = func.ts_rank_cd(ts_vector, ts_query)
-
-            # Apply filters if provided
-            if filters is not None:
-                # Use the contains() method for JSONB columns to check if the filters column contains the specified filters
-                stmt = stmt.where(self.table.c.filters.contains(filters))
-
-            # Order by the relevance rank
-            stmt = stmt.order_by(text_rank.desc())
-
-            # Limit the number of results
-            stmt = stmt.limit(limit)
+            stmt = self._get_keyword_search_statement(query, limit=limit, filters=filters)
 
             # Log the query for debugging
             logger.debug(f"Keyword search query: {stmt}")
@@ -581,21 +911,7 @@ class PgVector(VectorDb):
                 return []
 
             # Process the results and convert to Document objects
-            search_results: List[Document] = []
-            for result in results:
-                search_results.append(
-                    Document(
-                        id=result.id,
-                        name=result.name,
-                        meta_data=result.meta_data,
-                        content=result.content,
-                        embedder=self.embedder,
-                        embedding=result.embedding,
-                        usage=result.usage,
-                    )
-                )
-
-            return search_results
+            return self._build_search_results(results)
         except Exception as e:
             logger.error(f"Error during keyword search: {e}")
             return []
@@ -605,6 +921,8 @@ class PgVector(VectorDb):
         query: str,
         limit: int = 5,
         filters: Optional[Dict[str, Any]] = None,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
     ) -> List[Document]:
         """
         Perform a hybrid search combining vector similarity and full-text search.
@@ -613,6 +931,8 @@ class PgVector(VectorDb):
             query (str): The search query.
             limit (int): Maximum number of results to return.
             filters (Optional[Dict[str, Any]]): Filters to apply to the search.
+            probes (Optional[int]): Overrides the ivfflat.probes of the vector index for this search.
+            ef_search (Optional[int]): Overrides the hnsw.ef_search of the vector index for this search.
 
         Returns:
             List[Document]: List of matching documents.
@@ -624,105 +944,248 @@ class PgVector(VectorDb):
                 logger.error(f"Error getting embedding for Query: {query}")
                 return []
 
-            # Define the columns to select
-            columns = [
-                self.table.c.id,
-                self.table.c.name,
-                self.table.c.meta_data,
-                self.table.c.content,
-                self.table.c.embedding,
-                self.table.c.usage,
-            ]
-
-            # Build the text search vector
-            ts_vector = func.to_tsvector(self.content_language, self.table.c.content)
-            # Create the ts_query using websearch_to_tsquery with parameter binding
-            processed_query = self.enable_prefix_matching(query) if self.prefix_match else query
-            ts_query = func.websearch_to_tsquery(self.content_language, bindparam("query", value=processed_query))
-            # Compute the text rank
-            text_rank = func.ts_rank_cd(ts_vector, ts_query)
-
-            # Compute the vector similarity score
-            if self.distance == Distance.l2:
-                # For L2 distance, smaller distances are better
-                vector_distance = self.table.c.embedding.l2_distance(query_embedding)
-                # Invert and normalize the distance to get a similarity score between 0 and 1
-                vector_score = 1 / (1 + vector_distance)
-            elif self.distance == Distance.cosine:
-                # For cosine distance, smaller distances are better
-                vector_distance = self.table.c.embedding.cosine_distance(query_embedding)
-                vector_score = 1 / (1 + vector_distance)
-            elif self.distance == Distance.max_inner_product:
-                # For inner product, higher values are better
-                # Assume embeddings are normalized, so inner product ranges from -1 to 1
-                raw_vector_score = self.table.c.embedding.max_inner_product(query_embedding)
-                # Normalize to range [0, 1]
-                vector_score = (raw_vector_score + 1) / 2
-            else:
-                logger.error(f"Unknown distance metric: {self.distance}")
+            stmt = self._get_hybrid_search_statement(query, query_embedding, limit=limit, filters=filters)
+            if stmt is None:
                 return []
 
-            # Apply weights to control the influence of each score
-            # Validate the vector_weight parameter
-            if not 0 <= self.vector_score_weight <= 1:
-                raise ValueError("vector_score_weight must be between 0 and 1")
-            text_rank_weight = 1 - self.vector_score_weight  # weight for text rank
-
-            # Combine the scores into a hybrid score
-            hybrid_score = (self.vector_score_weight * vector_score) + (text_rank_weight * text_rank)
-
-            # Build the base statement, including the hybrid score
-            stmt = select(*columns, hybrid_score.label("hybrid_score"))
-
-            # Add the full-text search condition
-            # stmt = stmt.where(ts_vector.op("@@")(ts_query))
-
-            # Apply filters if provided
-            if filters is not None:
-                stmt = stmt.where(self.table.c.filters.contains(filters))
-
-            # Order the results by the hybrid score in descending order
-            stmt = stmt.order_by(desc("hybrid_score"))
-
-            # Limit the number of results
-            stmt = stmt.limit(limit)
-
             # Log the query for debugging
             logger.debug(f"Hybrid search query: {stmt}")
 
             # Execute the query
             try:
                 with self.Session() as sess, sess.begin():
-                    if self.vector_index is not None:
-                        if isinstance(self.vector_index, Ivfflat):
-                            sess.execute(text(f"SET LOCAL ivfflat.probes = {self.vector_index.probes}"))
-                        elif isinstance(self.vector_index, HNSW):
-                            sess.execute(text(f"SET LOCAL hnsw.ef_search = {self.vector_index.ef_search}"))
+                    index_settings = self._get_index_settings(probes=probes, ef_search=ef_search)
+                    if index_settings is not None:
+                        sess.execute(text(index_settings))
                     results = sess.execute(stmt).fetchall()
             except Exception as e:
                 logger.error(f"Error performing hybrid search: {e}")
                 return []
 
             # Process the results and convert to Document objects
-            search_results: List[Document] = []
-            for result in results:
-                search_results.append(
-                    Document(
-                        id=result.id,
-                        name=result.name,
-                        meta_data=result.meta_data,
-                        content=result.content,
-                        embedder=self.embedder,
-                        embedding=result.embedding,
-                        usage=result.usage,
-                    )
-                )
-
-            return search_results
+            return self._build_search_results(results)
         except Exception as e:
             logger.error(f"Error during hybrid search: {e}")
             return []
 
+    @property
+    def async_engine(self) -> Optional[Any]:
+        """Async engine sharing the url of the db engine, or None if its driver does not support asyncio"""
+        if self._async_engine is None and self._async_engine_supported:
+            self._async_engine = create_async_engine_for(self.db_engine)
+            if self._async_engine is None:
+                logger.debug("Async engine not available, searching in a thread")
+                self._async_engine_supported = False
+        return self._async_engine
+
+    async def async_search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+    ) -> List[Document]:
+        """
+        Perform a search based on the configured search type, using the async engine.
+
+        Args:
+            query (str): The search query.
+            limit (int): Maximum number of results to return.
+            filters (Optional[Dict[str, Any]]): Filters to apply to the search.
+            probes (Optional[int]): Overrides the ivfflat.probes of the vector index for this search.
+            ef_search (Optional[int]): Overrides the hnsw.ef_search of the vector index for this search.
+
+        Returns:
+            List[Document]: List of matching documents.
+        """
+        async_engine = self.async_engine
+        if async_engine is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None,
+                partial(self.search, query=query, limit=limit, filters=filters, probes=probes, ef_search=ef_search),
+            )
+
+        try:
+            results = await self._async_execute_search(
+                async_engine, query, limit=limit, filters=filters, probes=probes, ef_search=ef_search
+            )
+            # Process the results and convert to Document objects
+            return self._build_search_results(results)
+        except Exception as e:
+            logger.error(f"Error during async search: {e}")
+            return []
+
+    async def async_search_results(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[Dict[str, Any]] = None,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+    ) -> List[SearchResult]:
+        """
+        Perform a search based on the configured search type using the async engine, returning the results
+        without their embeddings.
+
+        Args:
+            query (str): The search query.
+            limit (int): Maximum number of results to return.
+            filters (Optional[Dict[str, Any]]): Filters to apply to the search.
+            probes (Optional[int]): Overrides the ivfflat.probes of the vector index for this search.
+            ef_search (Optional[int]): Overrides the hnsw.ef_search of the vector index for this search.
+
+        Returns:
+            List[SearchResult]: List of matching results.
+        """
+        async_engine = self.async_engine
+        if async_engine is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None,
+                partial(
+                    self.search_results, query=query, limit=limit, filters=filters, probes=probes, ef_search=ef_search
+                ),
+            )
+
+        try:
+            results = await self._async_execute_search(
+                async_engine,
+                query,
+                limit=limit,
+                filters=filters,
+                probes=probes,
+                ef_search=ef_search,
+                columns=self._get_result_columns(),
+            )
+            return self._build_lean_search_results(results)
+        except Exception as e:
+            logger.error(f"Error during async search: {e}")
+            return []
+
+    async def _async_execute_search(
+        self,
+        async_engine: Any,
+        query: str,
+        limit: int,
+        filters: Optional[Dict[str, Any]] = None,
+        probes: Optional[int] = None,
+        ef_search: Optional[int] = None,
+        columns: Optional[List[Any]] = None,
+    ) -> Sequence[Any]:
+        """Runs a search of the configured search type on the async engine and returns the rows"""
+        query_embedding: Optional[List[float]] = None
+        if self.search_type != SearchType.keyword:
+            # Embedders are synchronous, so the query is embedded in a thread
+            loop = asyncio.get_running_loop()
+            query_embedding = await loop.run_in_executor(None, self.embedder.get_embedding, query)
+            if query_embedding is None:
+                logger.error(f"Error getting embedding for Query: {query}")
+                return []
+
+        stmt = self._get_search_statement(query, query_embedding, limit=limit, filters=filters, columns=columns)
+        if stmt is None:
+            return []
+
+        # Log the query for debugging
+        logger.debug(f"Async {self.search_type.value} search query: {stmt}")
+
+        async with async_engine.begin() as conn:
+            index_settings = self._get_index_settings(probes=probes, ef_search=ef_search)
+            if index_settings is not None and self.search_type != SearchType.keyword:
+                await conn.execute(text(index_settings))
+            return (await conn.execute(stmt)).fetchall()
+
+    def tune_search_params(
+        self,
+        queries: List[str],
+        limit: int = 5,
+        recall_target: float = 0.95,
+        candidates: Optional[List[int]] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        apply: bool = True,
+    ) -> Dict[str, Any]:
+        """
+        Find the smallest ivfflat.probes or hnsw.ef_search whose vector search recall meets a target.
+
+        Each sample query is searched exactly, with index scans disabled, and then with the vector index for each
+        candidate value, smallest first. Recall is the fraction of the exact top `limit` results returned by the index.
+        Searches of an Agent use the chosen value when `apply` is True, and can override it per call on `search()`.
+
+        Args:
+            queries (List[str]): Sample queries, representative of the searches to tune for.
+            limit (int): Number of results of the searches to tune for.
+            recall_target (float): Minimum mean recall, between 0 and 1.
+            candidates (Optional[List[int]]): Values to try. Defaults to powers of 2 up to the number of lists
+                for ivfflat, and from `limit` to 1000 for hnsw.
+            filters (Optional[Dict[str, Any]]): Filters to apply to the searches.
+            apply (bool): Set the chosen value on the vector index of this PgVector.
+
+        Returns:
+            Dict[str, Any]: The tuned parameter, the chosen value, and the mean recall and latency of each candidate.
+        """
+        if not 0 < recall_target <= 1:
+            raise ValueError("recall_target must be between 0 and 1")
+
+        if isinstance(self.vector_index, Ivfflat):
+            param = "probes"
+            candidates = candidates or [
+                n for n in (1, 2, 4, 8, 16, 32, 64, 128, 256, 512) if n <= self.vector_index.lists
+            ]
+        elif isinstance(self.vector_index, HNSW):
+            param = "ef_search"
+            candidates = candidates or [n for n in (10, 20, 40, 80, 160, 320, 640, 1000) if n >= limit]
+        else:
+            raise ValueError(f"Cannot tune vector index: {self.vector_index}")
+        candidates = sorted(set(candidates))
+
+        query_embeddings = [self.embedder.get_embedding(query) for query in queries]
+        statements = [
+            self._get_vector_search_statement(embedding, limit=limit, filters=filters, columns=[self.table.c.id])
+            for embedding in query_embeddings
+            if embedding is not None
+        ]
+        if len(statements) == 0:
+            raise ValueError("No sample queries to tune with")
+
+        with self.Session() as sess:
+            # Exact results, using a sequential scan
+            exact_ids: List[Set[str]] = []
+            for stmt in statements:
+                with sess.begin():
+                    sess.execute(text("SET LOCAL enable_indexscan = off"))
+                    exact_ids.append({row.id for row in sess.execute(stmt)})
+
+            results: List[Dict[str, Any]] = []
+            for value in candidates:
+                index_settings = self._get_index_settings(**{param: value})
+                recalls: List[float] = []
+                start = time.perf_counter()
+                for stmt, expected in zip(statements, exact_ids):
+                    with sess.begin():
+                        sess.execute(text(index_settings))  # type: ignore
+                        found = {row.id for row in sess.execute(stmt)}
+                    recalls.append(len(found & expected) / len(expected) if len(expected) > 0 else 1.0)
+                latency_ms = (time.perf_counter() - start) * 1000 / len(statements)
+                recall = sum(recalls) / len(recalls)
+                results.append({param: value, "recall": recall, "latency_ms": latency_ms})
+                logger.debug(f"{param}={value}: recall {recall:.3f}, latency {latency_ms:.2f}ms")
+                if recall >= recall_target:
+                    break
+
+        chosen = results[-1]
+        if chosen["recall"] < recall_target:
+            logger.warning(
+                f"No {param} in {candidates} meets recall {recall_target}, using {chosen[param]} "
+                f"with recall {chosen['recall']:.3f}"
+            )
+        if apply:
+            # Copy the index settings, so PgVectors sharing them are not changed
+            self.vector_index = self.vector_index.model_copy(update={param: chosen[param]})
+            logger.info(f"Tuned {param} to {chosen[param]} with recall {chosen['recall']:.3f}")
+        return {"param": param, "value": chosen[param], "recall": chosen["recall"], "results": results}
+
     def drop(self) -> None:
         """
         Drop the table from the database.
@@ -884,13 +1347,9 @@ class PgVector(VectorDb):
             else:
                 num_lists = max(int(sqrt(total_records)), 1)
 
-        # Set ivfflat.probes
-        sess.execute(text("SET ivfflat.probes = :probes;"), {"probes": self.vector_index.probes})
-
         logger.debug(
             f"Creating Ivfflat index '{self.vector_index.name}' on table '{table_fullname}' with "
-            f"lists: {num_lists}, probes: {self.vector_index.probes}, "
-            f"and distance metric: {index_distance}"
+            f"lists: {num_lists} and distance metric: {index_distance}"
         )
 
         # Create index
@@ -934,6 +1393,13 @@ class PgVector(VectorDb):
         Args:
             force_recreate (bool): If True, existing index will be dropped and recreated.
         """
+        if self.schema_version >= 2:
+            # The stored content_tsv column is indexed when the table is created or upgraded
+            logger.debug(
+                f"Skipping GIN index creation, content_tsv is indexed in schema version {self.schema_version}."
+            )
+            return
+
         gin_index_name = f"{self.table_name}_content_gin_index"
 
         gin_index_exists = self._index_exists(gin_index_name)
@@ -968,8 +1434,6 @@ class PgVector(VectorDb):
         Returns:
             bool: True if deletion was successful, False otherwise.
         """
-        from sqlalchemy import delete
-
         try:
             with self.Session() as sess:
                 sess.execute(delete(self.table))
@@ -981,6 +1445,25 @@ class PgVector(VectorDb):
             sess.rollback()
             return False
 
+    def delete_by_name(self, name: str) -> bool:
+        """
+        Delete all records with the given name from the table.
+
+        Args:
+            name (str): The name of the documents to delete.
+
+        Returns:
+            bool: True if deletion was successful, False otherwise.
+        """
+        try:
+            with self.Session() as sess, sess.begin():
+                result = sess.execute(delete(self.table).where(self.table.c.name == name))
+                logger.debug(f"Deleted {result.rowcount} records named '{name}' from table '{self.table.fullname}'.")
+                return True
+        except Exception as e:
+            logger.error(f"Error deleting records named '{name}' from table '{self.table.fullname}': {e}")
+            return False
+
     def __deepcopy__(self, memo):
         """
         Create a deep copy of the PgVector instance, handling unpickleable attributes.
@@ -1002,8 +1485,8 @@ class PgVector(VectorDb):
         for k, v in self.__dict__.items():
             if k in {"metadata", "table"}:
                 continue
-            # Reuse db_engine and Session without copying
-            elif k in {"db_engine", "Session", "embedder"}:
+            # Reuse db_engine, async engine and Session without copying
+            elif k in {"db_engine", "_async_engine", "Session", "embedder"}:
                 setattr(copied_obj, k, v)
             else:
                 setattr(copied_obj, k, deepcopy(v, memo))
@@ -1,4 +1,4 @@
-from typing import Optional, List, Union, Dict, Any
+from typing import Optional, List, Union, Dict, Any, Set
 from hashlib import md5
 
 try:
@@ -7,7 +7,7 @@ try:
     from sqlalchemy.inspection import inspect
     from sqlalchemy.orm import Session, sessionmaker
     from sqlalchemy.schema import MetaData, Table, Column
-    from sqlalchemy.sql.expression import text, func, select
+    from sqlalchemy.sql.expression import text, func, select, bindparam, any_
     from sqlalchemy.types import DateTime, String
 except ImportError:
     raise ImportError("`sqlalchemy` not installed")
@@ -19,7 +19,7 @@ except ImportError:
 
 from phi.document import Document
 from phi.embedder import Embedder
-from phi.vectordb.base import VectorDb
+from phi.vectordb.base import VectorDb, embed_batches, get_content_hash
 from phi.vectordb.distance import Distance
 from phi.vectordb.pgvector.index import Ivfflat, HNSW
 from phi.utils.log import logger
@@ -124,6 +124,24 @@ class PgVector2(VectorDb):
                 result = sess.execute(stmt).first()
                 return result is not None
 
+    def existing_content_hashes(self, documents: List[Document]) -> Set[str]:
+        """
+        Get the content hashes of the documents which already exist, using a single query
+
+        Args:
+            documents (List[Document]): Documents to validate
+        """
+        content_hashes = list({get_content_hash(document) for document in documents})
+        if len(content_hashes) == 0:
+            return set()
+        with self.Session() as sess:
+            with sess.begin():
+                stmt = select(self.table.c.content_hash).where(
+                    self.table.c.content_hash
+                    == any_(bindparam("content_hashes", content_hashes, type_=postgresql.ARRAY(String)))
+                )
+                return {row[0] for row in sess.execute(stmt)}
+
     def name_exists(self, name: str) -> bool:
         """
         Validate if a row with this name exists or not
@@ -152,35 +170,28 @@ class PgVector2(VectorDb):
 
     def insert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None, batch_size: int = 10) -> None:
         with self.Session() as sess:
-            counter = 0
-            for document in documents:
-                document.embed(embedder=self.embedder)
-                cleaned_content = document.content.replace("\x00", "\ufffd")
-                content_hash = md5(cleaned_content.encode()).hexdigest()
-                _id = document.id or content_hash
-                stmt = postgresql.insert(self.table).values(
-                    id=_id,
-                    name=document.name,
-                    meta_data=document.meta_data,
-                    content=cleaned_content,
-                    embedding=document.embedding,
-                    usage=document.usage,
-                    content_hash=content_hash,
-                )
-                sess.execute(stmt)
-                counter += 1
-                logger.debug(f"Inserted document: {document.name} ({document.meta_data})")
+            # Each batch is embedded in the background while the previous batch is written
+            for batch_future in embed_batches(documents, self.embedder, batch_size):
+                batch_docs = batch_future.result()
+                for document in batch_docs:
+                    cleaned_content = document.content.replace("\x00", "\ufffd")
+                    content_hash = md5(cleaned_content.encode()).hexdigest()
+                    _id = document.id or content_hash
+                    stmt = postgresql.insert(self.table).values(
+                        id=_id,
+                        name=document.name,
+                        meta_data=document.meta_data,
+                        content=cleaned_content,
+                        embedding=document.embedding,
+                        usage=document.usage,
+                        content_hash=content_hash,
+                    )
+                    sess.execute(stmt)
+                    logger.debug(f"Inserted document: {document.name} ({document.meta_data})")
 
                 # Commit every `batch_size` documents
-                if counter >= batch_size:
-                    sess.commit()
-                    logger.info(f"Committed {counter} documents")
-                    counter = 0
-
-            # Commit any remaining documents
-            if counter > 0:
                 sess.commit()
-                logger.info(f"Committed {counter} documents")
+                logger.info(f"Committed {len(batch_docs)} documents")
 
     def upsert_available(self) -> bool:
         return True
@@ -195,48 +206,41 @@ class PgVector2(VectorDb):
             batch_size (int): Batch size for upserting documents
         """
         with self.Session() as sess:
-            counter = 0
-            for document in documents:
-                document.embed(embedder=self.embedder)
-                cleaned_content = document.content.replace("\x00", "\ufffd")
-                content_hash = md5(cleaned_content.encode()).hexdigest()
-                _id = document.id or content_hash
-                stmt = postgresql.insert(self.table).values(
-                    id=_id,
-                    name=document.name,
-                    meta_data=document.meta_data,
-                    content=cleaned_content,
-                    embedding=document.embedding,
-                    usage=document.usage,
-                    content_hash=content_hash,
-                )
-                # Update row when id matches but 'content_hash' is different
-                stmt = stmt.on_conflict_do_update(
-                    index_elements=["id"],
-                    set_=dict(
-                        name=stmt.excluded.name,
-                        meta_data=stmt.excluded.meta_data,
-                        content=stmt.excluded.content,
-                        embedding=stmt.excluded.embedding,
-                        usage=stmt.excluded.usage,
-                        content_hash=stmt.excluded.content_hash,
-                        updated_at=text("now()"),
-                    ),
-                )
-                sess.execute(stmt)
-                counter += 1
-                logger.debug(f"Upserted document: {document.id} | {document.name} | {document.meta_data}")
+            # Each batch is embedded in the background while the previous batch is written
+            for batch_future in embed_batches(documents, self.embedder, batch_size):
+                batch_docs = batch_future.result()
+                for document in batch_docs:
+                    cleaned_content = document.content.replace("\x00", "\ufffd")
+                    content_hash = md5(cleaned_content.encode()).hexdigest()
+                    _id = document.id or content_hash
+                    stmt = postgresql.insert(self.table).values(
+                        id=_id,
+                        name=document.name,
+                        meta_data=document.meta_data,
+                        content=cleaned_content,
+                        embedding=document.embedding,
+                        usage=document.usage,
+                        content_hash=content_hash,
+                    )
+                    # Update row when id matches but 'content_hash' is different
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=["id"],
+                        set_=dict(
+                            name=stmt.excluded.name,
+                            meta_data=stmt.excluded.meta_data,
+                            content=stmt.excluded.content,
+                            embedding=stmt.excluded.embedding,
+                            usage=stmt.excluded.usage,
+                            content_hash=stmt.excluded.content_hash,
+                            updated_at=text("now()"),
+                        ),
+                    )
+                    sess.execute(stmt)
+                    logger.debug(f"Upserted document: {document.id} | {document.name} | {document.meta_data}")
 
                 # Commit every `batch_size` documents
-                if counter >= batch_size:
-                    sess.commit()
-                    logger.info(f"Committed {counter} documents")
-                    counter = 0
-
-            # Commit any remaining documents
-            if counter > 0:
                 sess.commit()
-                logger.info(f"Committed {counter} documents")
+                logger.info(f"Committed {len(batch_docs)} documents")
 
     def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
         query_embedding = self.embedder.get_embedding(query)
@@ -390,6 +394,15 @@ class PgVector2(VectorDb):
                 sess.execute(stmt)
                 return True
 
+    def delete_by_name(self, name: str) -> bool:
+        from sqlalchemy import delete
+
+        with self.Session() as sess:
+            with sess.begin():
+                stmt = delete(self.table).where(self.table.c.name == name)
+                sess.execute(stmt)
+                return True
+
     def __deepcopy__(self, memo):
         """
         Create a deep copy of the PgVector instance, handling unpickleable attributes.
@@ -179,6 +179,23 @@ class PineconeDB(VectorDb):
         response = self.index.fetch(ids=[document.id])
         return len(response.vectors) > 0
 
+    def filter_new_documents(self, documents: List[Document]) -> List[Document]:
+        """Get the documents which do not exist in the index, fetching ids in batches.
+
+        Args:
+            documents (List[Document]): The documents to check.
+
+        Returns:
+            List[Document]: The documents which do not exist in the index.
+
+        """
+        doc_ids = list({document.id for document in documents if document.id is not None})
+        existing_ids = set()
+        for i in range(0, len(doc_ids), 1000):
+            response = self.index.fetch(ids=doc_ids[i : i + 1000])
+            existing_ids.update(response.vectors.keys())
+        return [document for document in documents if document.id is None or document.id not in existing_ids]
+
     def name_exists(self, name: str) -> bool:
         """Check if an index with the given name exists.
 
@@ -215,8 +232,8 @@ class PineconeDB(VectorDb):
         """
 
         vectors = []
+        Document.embed_documents(documents, embedder=self.embedder)
         for document in documents:
-            document.embed(embedder=self.embedder)
             document.meta_data["text"] = document.content
             data_to_upsert = {
                 "id": document.id,
@@ -1,19 +1,22 @@
+import asyncio
 from hashlib import md5
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set
+from uuid import UUID
 
 try:
     from qdrant_client import QdrantClient  # noqa: F401
     from qdrant_client.http import models
 except ImportError:
     raise ImportError(
-        "The `qdrant-client` package is not installed. " "Please install it via `pip install qdrant-client`."
+        "The `qdrant-client` package is not installed. Please install it via `pip install qdrant-client`."
     )
 
 from phi.document import Document
 from phi.embedder import Embedder
 from phi.embedder.openai import OpenAIEmbedder
-from phi.vectordb.base import VectorDb
+from phi.vectordb.base import VectorDb, embed_batches, get_content_hash
 from phi.vectordb.distance import Distance
+from phi.vectordb.search import SearchResult
 from phi.utils.log import logger
 
 
@@ -48,6 +51,8 @@ class Qdrant(VectorDb):
 
         # Qdrant client instance
         self._client: Optional[QdrantClient] = None
+        # Async Qdrant client instance, used by async_search
+        self._async_client: Optional[Any] = None
 
         # Qdrant client arguments
         self.location: Optional[str] = location
@@ -85,6 +90,33 @@ class Qdrant(VectorDb):
             )
         return self._client
 
+    @property
+    def async_client(self) -> Optional[Any]:
+        """Async client for the same server, or None for local collections which are only open in the sync client"""
+        if self._async_client is None:
+            if self.location == ":memory:" or self.path is not None:
+                return None
+            try:
+                from qdrant_client import AsyncQdrantClient
+            except ImportError:
+                return None
+
+            logger.debug("Creating Async Qdrant Client")
+            self._async_client = AsyncQdrantClient(
+                location=self.location,
+                url=self.url,
+                port=self.port,
+                grpc_port=self.grpc_port,
+                prefer_grpc=self.prefer_grpc,
+                https=self.https,
+                api_key=self.api_key,
+                prefix=self.prefix,
+                timeout=self.timeout,
+                host=self.host,
+                **self.kwargs,
+            )
+        return self._async_client
+
     def create(self) -> None:
         # Collection distance
         _distance = models.Distance.COSINE
@@ -117,6 +149,28 @@ class Qdrant(VectorDb):
             return len(collection_points) > 0
         return False
 
+    def existing_content_hashes(self, documents: List[Document]) -> Set[str]:
+        """
+        Get the content hashes of the documents which already exist, retrieving points in batches
+
+        Args:
+            documents (List[Document]): Documents to validate
+        """
+        existing_hashes: Set[str] = set()
+        if not self.client:
+            return existing_hashes
+        doc_ids = list({get_content_hash(document) for document in documents})
+        for i in range(0, len(doc_ids), 1000):
+            collection_points = self.client.retrieve(
+                collection_name=self.collection,
+                ids=doc_ids[i : i + 1000],  # type: ignore
+                with_payload=False,
+                with_vectors=False,
+            )
+            # Qdrant returns the md5 hashes formatted as UUIDs
+            existing_hashes.update(UUID(str(point.id)).hex for point in collection_points)
+        return existing_hashes
+
     def name_exists(self, name: str) -> bool:
         """
         Validates if a document with the given name exists in the collection.
@@ -148,27 +202,28 @@ class Qdrant(VectorDb):
             batch_size (int): Batch size for inserting documents
         """
         logger.debug(f"Inserting {len(documents)} documents")
-        points = []
-        for document in documents:
-            document.embed(embedder=self.embedder)
-            cleaned_content = document.content.replace("\x00", "\ufffd")
-            doc_id = md5(cleaned_content.encode()).hexdigest()
-            points.append(
-                models.PointStruct(
-                    id=doc_id,
-                    vector=document.embedding,
-                    payload={
-                        "name": document.name,
-                        "meta_data": document.meta_data,
-                        "content": cleaned_content,
-                        "usage": document.usage,
-                    },
+        # Each batch is embedded in the background while the previous batch is written
+        for batch_future in embed_batches(documents, self.embedder, batch_size):
+            points = []
+            for document in batch_future.result():
+                cleaned_content = document.content.replace("\x00", "\ufffd")
+                doc_id = md5(cleaned_content.encode()).hexdigest()
+                points.append(
+                    models.PointStruct(
+                        id=doc_id,
+                        vector=document.embedding,
+                        payload={
+                            "name": document.name,
+                            "meta_data": document.meta_data,
+                            "content": cleaned_content,
+                            "usage": document.usage,
+                        },
+                    )
                 )
-            )
-            logger.debug(f"Inserted document: {document.name} ({document.meta_data})")
-        if len(points) > 0:
-            self.client.upsert(collection_name=self.collection, wait=False, points=points)
-        logger.debug(f"Upsert {len(points)} documents")
+                logger.debug(f"Inserted document: {document.name} ({document.meta_data})")
+            if len(points) > 0:
+                self.client.upsert(collection_name=self.collection, wait=False, points=points)
+            logger.debug(f"Upsert {len(points)} documents")
 
     def upsert(self, documents: List[Document], filters: Optional[Dict[str, Any]] = None) -> None:
         """
@@ -202,8 +257,96 @@ class Qdrant(VectorDb):
             with_payload=True,
             limit=limit,
         )
+        return self._build_search_results(results)
+
+    def search_results(
+        self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[SearchResult]:
+        """
+        Search for documents in the database, without returning their vectors.
+
+        Args:
+            query (str): Query to search for
+            limit (int): Number of search results to return
+            filters (Optional[Dict[str, Any]]): Filters to apply while searching
+        """
+        query_embedding = self.embedder.get_embedding(query)
+        if query_embedding is None:
+            logger.error(f"Error getting embedding for Query: {query}")
+            return []
+
+        results = self.client.search(
+            collection_name=self.collection,
+            query_vector=query_embedding,
+            with_vectors=False,
+            with_payload=["name", "meta_data", "content"],
+            limit=limit,
+        )
+        return self._build_lean_search_results(results)
+
+    async def async_search(
+        self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[Document]:
+        """
+        Search for documents in the database using the async client.
+
+        Args:
+            query (str): Query to search for
+            limit (int): Number of search results to return
+            filters (Optional[Dict[str, Any]]): Filters to apply while searching
+        """
+        async_client = self.async_client
+        if async_client is None:
+            return await super().async_search(query=query, limit=limit, filters=filters)
+
+        # Embedders are synchronous, so the query is embedded in a thread
+        loop = asyncio.get_running_loop()
+        query_embedding = await loop.run_in_executor(None, self.embedder.get_embedding, query)
+        if query_embedding is None:
+            logger.error(f"Error getting embedding for Query: {query}")
+            return []
+
+        results = await async_client.search(
+            collection_name=self.collection,
+            query_vector=query_embedding,
+            with_vectors=True,
+            with_payload=True,
+            limit=limit,
+        )
+        return self._build_search_results(results)
+
+    async def async_search_results(
+        self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None
+    ) -> List[SearchResult]:
+        """
+        Search for documents in the database using the async client, without returning their vectors.
+
+        Args:
+            query (str): Query to search for
+            limit (int): Number of search results to return
+            filters (Optional[Dict[str, Any]]): Filters to apply while searching
+        """
+        async_client = self.async_client
+        if async_client is None:
+            return await super().async_search_results(query=query, limit=limit, filters=filters)
 
-        # Build search results
+        # Embedders are synchronous, so the query is embedded in a thread
+        loop = asyncio.get_running_loop()
+        query_embedding = await loop.run_in_executor(None, self.embedder.get_embedding, query)
+        if query_embedding is None:
+            logger.error(f"Error getting embedding for Query: {query}")
+            return []
+
+        results = await async_client.search(
+            collection_name=self.collection,
+            query_vector=query_embedding,
+            with_vectors=False,
+            with_payload=["name", "meta_data", "content"],
+            limit=limit,
+        )
+        return self._build_lean_search_results(results)
+
+    def _build_search_results(self, results: List[models.ScoredPoint]) -> List[Document]:
         search_results: List[Document] = []
         for result in results:
             if result.payload is None:
@@ -221,6 +364,19 @@ class Qdrant(VectorDb):
 
         return search_results
 
+    @staticmethod
+    def _build_lean_search_results(results: List[models.ScoredPoint]) -> List[SearchResult]:
+        return [
+            SearchResult(
+                content=result.payload["content"],
+                name=result.payload.get("name"),
+                meta_data=result.payload.get("meta_data"),
+                id=str(result.id),
+            )
+            for result in results
+            if result.payload is not None
+        ]
+
     def drop(self) -> None:
         if self.exists():
             logger.debug(f"Deleting collection: {self.collection}")
@@ -245,3 +401,23 @@ class Qdrant(VectorDb):
 
     def delete(self) -> bool:
         return False
+
+    def delete_by_name(self, name: str) -> bool:
+        """
+        Deletes all points with the given document name.
+
+        Args:
+            name (str): The name of the documents to delete.
+
+        Returns:
+            bool: True if the points were deleted, False otherwise.
+        """
+        if self.client:
+            self.client.delete(
+                collection_name=self.collection,
+                points_selector=models.FilterSelector(
+                    filter=models.Filter(must=[models.FieldCondition(key="name", match=models.MatchValue(value=name))])
+                ),
+            )
+            return True
+        return False
@@ -1,7 +1,36 @@
 from enum import Enum
+from typing import Any, Dict, NamedTuple, Optional
+
+from phi.document import Document
 
 
 class SearchType(str, Enum):
     vector = "vector"
     keyword = "keyword"
     hybrid = "hybrid"
+
+
+class SearchResult(NamedTuple):
+    """A document returned by a search, without its embedding.
+
+    Vector dbs build search results from the columns an Agent adds to its context, so the embedding is not
+    transferred from the database and no Document is validated for each result.
+    """
+
+    content: str
+    name: Optional[str] = None
+    meta_data: Optional[Dict[str, Any]] = None
+    id: Optional[str] = None
+
+    @classmethod
+    def from_document(cls, document: Document) -> "SearchResult":
+        return cls(content=document.content, name=document.name, meta_data=document.meta_data, id=document.id)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a dictionary representation of the result, the same as Document.to_dict()"""
+        result: Dict[str, Any] = {"content": self.content}
+        if self.name is not None:
+            result["name"] = self.name
+        if self.meta_data is not None:
+            result["meta_data"] = self.meta_data
+        return result
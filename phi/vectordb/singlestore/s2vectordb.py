@@ -1,5 +1,5 @@
 import json
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set
 from hashlib import md5
 
 try:
@@ -16,7 +16,7 @@ except ImportError:
 from phi.document import Document
 from phi.embedder import Embedder
 from phi.embedder.openai import OpenAIEmbedder
-from phi.vectordb.base import VectorDb
+from phi.vectordb.base import VectorDb, embed_batches, get_content_hash
 from phi.vectordb.distance import Distance
 
 # from phi.vectordb.singlestore.index import Ivfflat, HNSWFlat
@@ -141,6 +141,23 @@ class S2VectorDb(VectorDb):
             result = sess.execute(stmt).first()
             return result is not None
 
+    def existing_content_hashes(self, documents: List[Document]) -> Set[str]:
+        """
+        Get the content hashes of the documents which already exist, querying in batches
+
+        Args:
+            documents (List[Document]): Documents to validate
+        """
+        content_hashes = list({get_content_hash(document) for document in documents})
+        existing_hashes: Set[str] = set()
+        with self.Session.begin() as sess:
+            for i in range(0, len(content_hashes), 1000):
+                stmt = select(self.table.c.content_hash).where(
+                    self.table.c.content_hash.in_(content_hashes[i : i + 1000])
+                )
+                existing_hashes.update(row[0] for row in sess.execute(stmt))
+        return existing_hashes
+
     def name_exists(self, name: str) -> bool:
         """
         Validate if a row with this name exists or not
@@ -176,30 +193,31 @@ class S2VectorDb(VectorDb):
         """
         with self.Session.begin() as sess:
             counter = 0
-            for document in documents:
-                document.embed(embedder=self.embedder)
-                cleaned_content = document.content.replace("\x00", "\ufffd")
-                content_hash = md5(cleaned_content.encode()).hexdigest()
-                _id = document.id or content_hash
-
-                meta_data_json = json.dumps(document.meta_data)
-                usage_json = json.dumps(document.usage)
-
-                # Convert embedding to a JSON array string
-                embedding_json = json.dumps(document.embedding)
-
-                stmt = mysql.insert(self.table).values(
-                    id=_id,
-                    name=document.name,
-                    meta_data=meta_data_json,
-                    content=cleaned_content,
-                    embedding=embedding_json,  # Properly formatted embedding as a JSON array string
-                    usage=usage_json,
-                    content_hash=content_hash,
-                )
-                sess.execute(stmt)
-                counter += 1
-                logger.debug(f"Inserted document: {document.name} ({document.meta_data})")
+            # Each batch is embedded in the background while the previous batch is written
+            for batch_future in embed_batches(documents, self.embedder, batch_size):
+                for document in batch_future.result():
+                    cleaned_content = document.content.replace("\x00", "\ufffd")
+                    content_hash = md5(cleaned_content.encode()).hexdigest()
+                    _id = document.id or content_hash
+
+                    meta_data_json = json.dumps(document.meta_data)
+                    usage_json = json.dumps(document.usage)
+
+                    # Convert embedding to a JSON array string
+                    embedding_json = json.dumps(document.embedding)
+
+                    stmt = mysql.insert(self.table).values(
+                        id=_id,
+                        name=document.name,
+                        meta_data=meta_data_json,
+                        content=cleaned_content,
+                        embedding=embedding_json,  # Properly formatted embedding as a JSON array string
+                        usage=usage_json,
+                        content_hash=content_hash,
+                    )
+                    sess.execute(stmt)
+                    counter += 1
+                    logger.debug(f"Inserted document: {document.name} ({document.meta_data})")
 
             sess.commit()
             logger.debug(f"Committed {counter} documents")
@@ -215,41 +233,42 @@ class S2VectorDb(VectorDb):
         """
         with self.Session.begin() as sess:
             counter = 0
-            for document in documents:
-                document.embed(embedder=self.embedder)
-                cleaned_content = document.content.replace("\x00", "\ufffd")
-                content_hash = md5(cleaned_content.encode()).hexdigest()
-                _id = document.id or content_hash
-
-                meta_data_json = json.dumps(document.meta_data)
-                usage_json = json.dumps(document.usage)
-
-                # Convert embedding to a JSON array string
-                embedding_json = json.dumps(document.embedding)
-
-                stmt = (
-                    mysql.insert(self.table)
-                    .values(
-                        id=_id,
-                        name=document.name,
-                        meta_data=meta_data_json,
-                        content=cleaned_content,
-                        embedding=embedding_json,
-                        usage=usage_json,
-                        content_hash=content_hash,
-                    )
-                    .on_duplicate_key_update(
-                        name=document.name,
-                        meta_data=meta_data_json,
-                        content=cleaned_content,
-                        embedding=embedding_json,
-                        usage=usage_json,
-                        content_hash=content_hash,
+            # Each batch is embedded in the background while the previous batch is written
+            for batch_future in embed_batches(documents, self.embedder, batch_size):
+                for document in batch_future.result():
+                    cleaned_content = document.content.replace("\x00", "\ufffd")
+                    content_hash = md5(cleaned_content.encode()).hexdigest()
+                    _id = document.id or content_hash
+
+                    meta_data_json = json.dumps(document.meta_data)
+                    usage_json = json.dumps(document.usage)
+
+                    # Convert embedding to a JSON array string
+                    embedding_json = json.dumps(document.embedding)
+
+                    stmt = (
+                        mysql.insert(self.table)
+                        .values(
+                            id=_id,
+                            name=document.name,
+                            meta_data=meta_data_json,
+                            content=cleaned_content,
+                            embedding=embedding_json,
+                            usage=usage_json,
+                            content_hash=content_hash,
+                        )
+                        .on_duplicate_key_update(
+                            name=document.name,
+                            meta_data=meta_data_json,
+                            content=cleaned_content,
+                            embedding=embedding_json,
+                            usage=usage_json,
+                            content_hash=content_hash,
+                        )
                     )
-                )
-                sess.execute(stmt)
-                counter += 1
-                logger.debug(f"Upserted document: {document.name} ({document.meta_data})")
+                    sess.execute(stmt)
+                    counter += 1
+                    logger.debug(f"Upserted document: {document.name} ({document.meta_data})")
 
             sess.commit()
             logger.debug(f"Committed {counter} documents")
@@ -382,3 +401,20 @@ class S2VectorDb(VectorDb):
             stmt = delete(self.table)
             sess.execute(stmt)
             return True
+
+    def delete_by_name(self, name: str) -> bool:
+        """
+        Delete all rows with the given name.
+
+        Args:
+            name (str): Name of the documents to delete
+
+        Returns:
+            bool: True if the rows were deleted, False otherwise.
+        """
+        from sqlalchemy import delete
+
+        with self.Session.begin() as sess:
+            stmt = delete(self.table).where(self.table.c.name == name)
+            sess.execute(stmt)
+            return True
@@ -1,5 +1,5 @@
 import json
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Set
 from hashlib import md5
 
 try:
@@ -17,7 +17,7 @@ except ImportError:
 from phi.document import Document
 from phi.embedder import Embedder
 from phi.embedder.openai import OpenAIEmbedder
-from phi.vectordb.base import VectorDb
+from phi.vectordb.base import VectorDb, get_content_hash
 from phi.vectordb.distance import Distance
 from phi.utils.log import logger
 
@@ -113,6 +113,23 @@ class S2VectorDb(VectorDb):
             result = sess.execute(stmt).first()
             return result is not None
 
+    def existing_content_hashes(self, documents: List[Document]) -> Set[str]:
+        """
+        Get the content hashes of the documents which already exist, querying in batches
+
+        Args:
+            documents (List[Document]): Documents to validate
+        """
+        content_hashes = list({get_content_hash(document) for document in documents})
+        existing_hashes: Set[str] = set()
+        with self.Session.begin() as sess:
+            for i in range(0, len(content_hashes), 1000):
+                stmt = select(self.table.c.content_hash).where(
+                    self.table.c.content_hash.in_(content_hashes[i : i + 1000])
+                )
+                existing_hashes.update(row[0] for row in sess.execute(stmt))
+        return existing_hashes
+
     def name_exists(self, name: str) -> bool:
         """
         Validate if a row with this name exists or not
@@ -146,10 +163,11 @@ class S2VectorDb(VectorDb):
             filters (Optional[Dict[str, Any]]): Optional filters for the insert.
             batch_size (int): Number of documents to insert in each batch.
         """
+        # Embed the documents in batches
+        Document.embed_documents(documents, embedder=self.embedder)
         with self.Session.begin() as sess:
             counter = 0
             for document in documents:
-                document.embed(embedder=self.embedder)
                 cleaned_content = document.content.replace("\x00", "\ufffd")
                 content_hash = md5(cleaned_content.encode()).hexdigest()
                 _id = document.id or content_hash
@@ -188,10 +206,11 @@ class S2VectorDb(VectorDb):
             filters (Optional[Dict[str, Any]]): Optional filters for upserting documents
             batch_size (int): Batch size for upserting documents
         """
+        # Embed the documents in batches
+        Document.embed_documents(documents, embedder=self.embedder)
         with self.Session.begin() as sess:
             counter = 0
             for document in documents:
-                document.embed(embedder=self.embedder)
                 cleaned_content = document.content.replace("\x00", "\ufffd")
                 content_hash = md5(cleaned_content.encode()).hexdigest()
                 _id = document.id or content_hash
@@ -347,3 +366,18 @@ class S2VectorDb(VectorDb):
             stmt = self.table.delete()
             sess.execute(stmt)
             return True
+
+    def delete_by_name(self, name: str) -> bool:
+        """
+        Delete all rows with the given name.
+
+        Args:
+            name (str): Name of the documents to delete
+
+        Returns:
+            bool: True if the rows were deleted, False otherwise.
+        """
+        with self.Session.begin() as sess:
+            stmt = self.table.delete().where(self.table.c.name == name)
+            sess.execute(stmt)
+            return True